@@ -0,0 +1,73 @@
+"""Benchmark the MeetingModel parse/validate and response serialization paths.
+
+Compares the old dict round-trips (json.loads + model_validate, model_dump +
+json.dumps) with direct JSON-mode validation and serialization on meetings
+with large action registers:
+    python benchmarks/bench_parse_validate.py
+"""
+
+import json
+import sys
+import timeit
+from pathlib import Path
+
+# Add parent directory to path so we can import from the main modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from json_codec import model_json, transform_response_body
+from models import ActionItem, MeetingMeta, MeetingModel, Person, Section, type_adapter
+
+
+def build_meeting(sections: int, actions_per_section: int) -> MeetingModel:
+    return MeetingModel(
+        meta=MeetingMeta(
+            project="Benchmark Project",
+            job_min_no="JOB-001",
+            description="Progress Meeting",
+            date="15/11/2024",
+            time="10:00",
+            location="Site Office",
+        ),
+        attendees=[Person(name=f"Person {i}", initials=f"P{i}", company="Contractor Ltd") for i in range(20)],
+        sections=[
+            Section(
+                code=str(s),
+                title=f"Section {s}",
+                notes="Discussion of drainage drawings and programme. " * 20,
+                actions=[
+                    ActionItem(action=f"Issue revised drawing {s}-{a} for review", owner=f"Person {a % 20}", due_date="21/06/2025")
+                    for a in range(actions_per_section)
+                ],
+            )
+            for s in range(sections)
+        ],
+    )
+
+
+def main():
+    adapter = type_adapter(MeetingModel)
+    for sections, actions in [(6, 10), (20, 100), (50, 400)]:
+        meeting = build_meeting(sections, actions)
+        raw = meeting.model_dump_json()
+        number = max(1, 2000 // (sections * actions))
+
+        parse_old = timeit.timeit(lambda: MeetingModel.model_validate(json.loads(raw)), number=number) / number
+        parse_new = timeit.timeit(lambda: adapter.validate_json(raw), number=number) / number
+
+        def respond_old():
+            return json.dumps({"request_id": "r", "minutes": meeting.model_dump(), "docx_base64": "UEsDBA=="}).encode()
+
+        def respond_new():
+            return transform_response_body(request_id="r", minutes_json=model_json(meeting), docx_base64="UEsDBA==")
+
+        assert json.loads(respond_old()) == json.loads(respond_new())
+        dump_old = timeit.timeit(respond_old, number=number) / number
+        dump_new = timeit.timeit(respond_new, number=number) / number
+
+        print(f"{sections} sections x {actions} actions ({len(raw) / 1024:.0f} KiB JSON)")
+        print(f"  parse+validate: dict path {parse_old * 1000:8.2f} ms, JSON mode {parse_new * 1000:8.2f} ms ({parse_old / parse_new:.1f}x)")
+        print(f"  serialize:      dict path {dump_old * 1000:8.2f} ms, direct    {dump_new * 1000:8.2f} ms ({dump_old / dump_new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark peak traced memory of each pipeline stage, default vs LOW_MEMORY.
+
+The LLM client is mocked (first answer is broken JSON, so the repair call is
+included); sizes are transcript characters:
+    python benchmarks/bench_pipeline_memory.py
+"""
+
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path so we can import from the main modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("OPENAI_MODEL", "benchmark")
+
+import llm_extractor
+from models import MeetingMeta
+from renderer import render_docx
+from template_registry import get_template
+from transcript_loader import load_transcript_with_speakers
+
+META = MeetingMeta(
+    project="Benchmark Project",
+    job_min_no="JOB-001",
+    description="Progress Meeting",
+    date="15/11/2024",
+    time="10:00",
+    location="Site Office",
+)
+LINE = "Alice Smith: The concrete pour on level three is scheduled for next week.\n"
+
+
+def fake_create(**kwargs):
+    response = MagicMock()
+    if "Broken JSON" in kwargs["input"]:
+        response.output_text = json.dumps({"meta": META.model_dump(), "attendees": [], "apologies": [], "sections": []})
+    else:
+        response.output_text = '{"meta": '
+    return response
+
+
+def peak(func) -> int:
+    func()
+    gc.collect()
+    tracemalloc.start()
+    func()
+    result = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result
+
+
+def main():
+    template = get_template("progress_minutes_v1")
+    for chars in [20_000, 80_000, 150_000]:
+        data = (LINE * (chars // len(LINE))).encode("utf-8")
+        for low_memory in (False, True):
+            with patch.object(llm_extractor.settings, "low_memory", low_memory), patch("llm_extractor.client") as client:
+                client.responses.create.side_effect = fake_create
+                transcript = load_transcript_with_speakers(data, "transcript.txt")
+                meeting = llm_extractor.extract_meeting_model(transcript.text, META, template)
+                load = peak(lambda: load_transcript_with_speakers(data, "transcript.txt"))
+                extract = peak(lambda: llm_extractor.extract_meeting_model(transcript.text, META, template))
+                render = peak(lambda: render_docx(template, meeting))
+            mode = "low_memory" if low_memory else "default"
+            print(
+                f"{chars:>8} chars {mode:>10}: load {load / 1e6:6.2f} MB, "
+                f"extract {extract / 1e6:6.2f} MB ({extract / len(data):.1f}x), render {render / 1e6:6.2f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark transcript parse throughput for each supported upload format.
+
+Builds the same synthetic meeting (speaker turns) in every format and reports
+MB/s of input parsed, plus the upload size saved by .gz and .zip:
+    python benchmarks/bench_transcript_formats.py [turns]
+"""
+
+import gzip
+import io
+import json
+import sys
+import time
+import zipfile
+from pathlib import Path
+
+# Add parent directory to path so we can import from the main modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from docx import Document
+
+from transcript_loader import load_transcript
+
+SPEAKERS = ["Alice Smith", "Bob Jones", "Charlie Brown", "Dana White"]
+LINE = "The drainage drawings for plot {n} are due next week and the programme shows a two day slip."
+
+
+def _timestamp(seconds: float, sep: str) -> str:
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{int(hours):02d}:{int(minutes):02d}:{int(secs):02d}{sep}{int((secs % 1) * 1000):03d}"
+
+
+def build_inputs(turns: int) -> dict[str, bytes]:
+    rows = [(SPEAKERS[n % len(SPEAKERS)], LINE.format(n=n), n * 6.0) for n in range(turns)]
+
+    txt = "\n".join(f"{speaker}: {text}" for speaker, text, _ in rows).encode()
+    vtt = ("WEBVTT\n\n" + "\n\n".join(
+        f"{n + 1}\n{_timestamp(start, '.')} --> {_timestamp(start + 5, '.')}\n<v {speaker}>{text}</v>"
+        for n, (speaker, text, start) in enumerate(rows)
+    )).encode()
+    srt = "\n\n".join(
+        f"{n + 1}\n{_timestamp(start, ',')} --> {_timestamp(start + 5, ',')}\n{speaker}: {text}"
+        for n, (speaker, text, start) in enumerate(rows)
+    ).encode()
+    teams_json = json.dumps(
+        {"entries": [{"speakerDisplayName": speaker, "text": text, "startOffset": start} for speaker, text, start in rows]}
+    ).encode()
+
+    document = Document()
+    for speaker, text, _ in rows:
+        document.add_paragraph(f"{speaker}: {text}")
+    docx_buffer = io.BytesIO()
+    document.save(docx_buffer)
+
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("meeting.vtt", vtt)
+
+    return {
+        "meeting.txt": txt,
+        "meeting.vtt": vtt,
+        "meeting.srt": srt,
+        "meeting.json": teams_json,
+        "meeting.docx": docx_buffer.getvalue(),
+        "meeting.vtt.gz": gzip.compress(vtt),
+        "meeting.zip": zip_buffer.getvalue(),
+    }
+
+
+def main():
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    inputs = build_inputs(turns)
+    vtt_size = len(inputs["meeting.vtt"])
+    print(f"{turns} speaker turns")
+    for filename, data in inputs.items():
+        repeats = 5
+        start = time.perf_counter()
+        for _ in range(repeats):
+            text = load_transcript(data, filename)
+        elapsed = (time.perf_counter() - start) / repeats
+        note = f"  ({len(data) / vtt_size:.0%} of .vtt size)" if filename.endswith((".gz", ".zip")) else ""
+        print(
+            f"  {filename:16} {len(data) / 1024:8.0f} KiB -> {len(text) / 1024:6.0f} KiB text  "
+            f"{elapsed * 1000:8.1f} ms  {len(data) / elapsed / 1e6:7.1f} MB/s{note}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Load test: one process_transcript container under a burst of concurrent inputs.
+
+Drives the real async pipeline (parse, prompt, validation, render) with
+asyncio.gather, the way a Modal container with @modal.concurrent runs its
+inputs on one event loop, with the LLM replaced by a fixed-latency stub. A
+semaphore caps the inputs in flight. For each cap it reports what was
+measured: peak inputs in flight, wall time, per-meeting latency and peak RSS:
+    python benchmarks/load_concurrent_inputs.py --meetings 48 --llm-latency 2.0
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import resource
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add parent directory to path so we can import from the main modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("OPENAI_MODEL", "benchmark")
+
+from models import MeetingMeta
+from pipeline import run_pipeline_async
+from template_registry import get_template
+
+META = MeetingMeta(
+    project="Load Test",
+    job_min_no="JOB-001",
+    description="Progress Meeting",
+    date="15/11/2024",
+    time="10:00",
+    location="Site Office",
+)
+TRANSCRIPT = ("Alice Smith: The concrete pour on level three is scheduled for next week.\n" * 400).encode("utf-8")
+ANSWER = json.dumps(
+    {
+        "meta": META.model_dump(),
+        "attendees": [{"name": "Alice Smith", "initials": "AS", "company": "Contractor Ltd"}],
+        "apologies": [],
+        "sections": [{"code": str(code), "title": f"Section {code}", "notes": "Discussed."} for code in range(1, 7)],
+    }
+)
+RSS_SAMPLE_SECONDS = 0.05
+
+
+def current_rss() -> int:
+    """Resident set size in bytes: /proc where available, else the process peak so far."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+async def run_burst(concurrency: int, meetings: int, latency: float) -> dict:
+    """Run meetings with at most `concurrency` in flight; return the measured peak, wall time, latencies and RSS."""
+
+    async def fake_create(**kwargs):
+        await asyncio.sleep(latency)
+        return SimpleNamespace(output_text=ANSWER, usage=None)
+
+    template = get_template("progress_minutes_v1")
+    slots = asyncio.Semaphore(concurrency)
+    in_flight = peak_in_flight = 0
+    peak_rss = current_rss()
+    done = asyncio.Event()
+
+    async def one() -> float:
+        nonlocal in_flight, peak_in_flight
+        async with slots:
+            in_flight += 1
+            peak_in_flight = max(peak_in_flight, in_flight)
+            start = time.perf_counter()
+            try:
+                await run_pipeline_async(TRANSCRIPT, "transcript.txt", META, template)
+            finally:
+                in_flight -= 1
+            return time.perf_counter() - start
+
+    async def sample_rss() -> None:
+        nonlocal peak_rss
+        while not done.is_set():
+            peak_rss = max(peak_rss, current_rss())
+            await asyncio.sleep(RSS_SAMPLE_SECONDS)
+
+    # Every meeting renders for real: the render cache would hide the CPU share of the work
+    with patch("llm_extractor.async_client") as client, patch("render_pool.get_render_cache", return_value=None):
+        client.responses.create = fake_create
+        sampler = asyncio.ensure_future(sample_rss())
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(one() for _ in range(meetings)))
+        wall = time.perf_counter() - start
+        done.set()
+        await sampler
+    return {"peak_in_flight": peak_in_flight, "wall": wall, "latencies": sorted(latencies), "peak_rss": peak_rss}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--meetings", type=int, default=48, help="meetings arriving in one burst")
+    parser.add_argument("--llm-latency", type=float, default=2.0, help="seconds per stubbed LLM call")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 12, 16])
+    args = parser.parse_args()
+
+    asyncio.run(run_burst(1, 1, 0.0))  # warm imports, templates and the fallback DOCX
+    print(f"{args.meetings} meetings, {args.llm_latency:.1f}s LLM latency")
+    print(f"{'max inputs':>10} {'peak in flight':>14} {'wall':>8} {'p50':>7} {'p95':>7} {'peak RSS':>9}")
+    for concurrency in args.concurrency:
+        result = asyncio.run(run_burst(concurrency, args.meetings, args.llm_latency))
+        latencies = result["latencies"]
+        p95 = latencies[max(0, math.ceil(0.95 * len(latencies)) - 1)]
+        print(
+            f"{concurrency:>10} {result['peak_in_flight']:>14} {result['wall']:>7.2f}s "
+            f"{statistics.median(latencies):>6.2f}s {p95:>6.2f}s {result['peak_rss'] / 1e6:>6.0f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
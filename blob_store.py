@@ -0,0 +1,141 @@
+import hashlib
+import uuid
+from pathlib import Path
+from typing import Any, BinaryIO, Protocol
+
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+
+from config import settings
+
+# Room for the metadata fields and part headers of a multipart form around the file
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadRef(BaseModel):
+    """Reference to a staged upload; this is all the worker receives."""
+
+    key: str
+    filename: str
+    size: int
+    sha256: str
+
+
+class BlobStore(Protocol):
+    """Minimal blob storage used to hand uploads from the web tier to workers."""
+
+    def open_writer(self, key: str) -> BinaryIO: ...
+
+    def read(self, key: str) -> bytes: ...
+
+    def open_reader(self, key: str) -> BinaryIO: ...
+
+    def delete(self, key: str) -> None: ...
+
+
+class LocalBlobStore:
+    """BlobStore backed by a directory, e.g. the shared Modal volume mounted at /data."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if self.root.resolve() not in path.parents:
+            raise ValueError(f"Invalid blob key: {key}")
+        return path
+
+    def open_writer(self, key: str) -> BinaryIO:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path.open("wb")
+
+    def read(self, key: str) -> bytes:
+        return self._path(key).read_bytes()
+
+    def open_reader(self, key: str) -> BinaryIO:
+        return self._path(key).open("rb")
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+
+async def save_upload(
+    upload: UploadFile,
+    store: BlobStore,
+    *,
+    max_bytes: int | None = None,
+    chunk_size: int | None = None,
+) -> UploadRef:
+    """
+    Copy an UploadFile into the store chunk by chunk.
+
+    Starlette has already spooled the upload (to a temporary file once it
+    outgrows memory), so the request body limit is UploadLimitMiddleware's
+    job; this copy holds one chunk in memory at a time and computes the
+    SHA-256 on the way through. Files larger than max_bytes are rejected with
+    413 and the partial blob is removed.
+    """
+    max_bytes = settings.max_upload_bytes if max_bytes is None else max_bytes
+    chunk_size = chunk_size or settings.upload_chunk_bytes
+    filename = upload.filename or "upload.txt"
+    key = f"{uuid.uuid4().hex}/{Path(filename).name}"
+
+    digest = hashlib.sha256()
+    size = 0
+    writer = await run_in_threadpool(store.open_writer, key)
+    try:
+        while chunk := await upload.read(chunk_size):
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(status_code=413, detail="Uploaded file too large")
+            digest.update(chunk)
+            await run_in_threadpool(writer.write, chunk)
+    except BaseException:
+        writer.close()
+        await run_in_threadpool(store.delete, key)
+        raise
+    writer.close()
+
+    return UploadRef(key=key, filename=filename, size=size, sha256=digest.hexdigest())
+
+
+class UploadLimitMiddleware:
+    """
+    Reject request bodies over settings.max_upload_bytes before they are parsed.
+
+    A Content-Length over the limit gets a 413 without a byte of the body
+    being read; a body sent without one (chunked) fails with 413 as soon as
+    the bytes received pass the limit. The limit allows for the multipart
+    form around the file.
+    """
+
+    def __init__(self, app: Any, *, max_bytes: int | None = None):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        limit = (settings.max_upload_bytes if self.max_bytes is None else self.max_bytes) + MULTIPART_OVERHEAD_BYTES
+        length = dict(scope["headers"]).get(b"content-length")
+        if length is not None and length.isdigit() and int(length) > limit:
+            response = JSONResponse({"detail": "Uploaded file too large"}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> dict:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise HTTPException(status_code=413, detail="Uploaded file too large")
+            return message
+
+        await self.app(scope, limited_receive, send)
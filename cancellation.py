@@ -0,0 +1,44 @@
+import asyncio
+import logging
+from contextlib import suppress
+from typing import Awaitable, TypeVar
+
+from starlette.requests import Request
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# nginx's "client closed request"; never seen by the client, but shows up in access logs
+CLIENT_CLOSED_REQUEST = 499
+DISCONNECT_POLL_SECONDS = 0.5
+
+
+class ClientDisconnected(Exception):
+    """The HTTP client went away before the response was ready; the work was cancelled."""
+
+
+async def cancel_on_disconnect(request: Request, awaitable: Awaitable[T]) -> T:
+    """
+    Await awaitable, cancelling it if the client disconnects first.
+
+    Cancellation propagates into the work (LLM calls on the async client abort
+    their HTTP requests; spawned Modal calls are cancelled by their owners),
+    then ClientDisconnected is raised for the handler to turn into a 499.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                logger.info("Client disconnected; cancelling request", extra={"path": request.url.path})
+                task.cancel()
+                # Let the work run its cancellation cleanup before answering
+                with suppress(asyncio.CancelledError):
+                    await task
+                raise ClientDisconnected()
+    finally:
+        if not task.done():
+            task.cancel()
@@ -0,0 +1,144 @@
+import logging
+import os
+import re
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Callable
+
+from json_codec import model_json
+from models import LoadedTranscript, MeetingModel
+from usage import UsageReport
+
+logger = logging.getLogger(__name__)
+
+# Stage outputs in pipeline order; a job resumes after the last one present
+TRANSCRIPT = "transcript.json"
+MEETING = "meeting.json"
+USAGE = "usage.json"
+DOCX = "minutes.docx"
+
+_JOB_KEY = re.compile(r"[0-9A-Za-z_-]{1,128}")
+
+
+class JobCheckpoints:
+    """
+    Stage outputs of one process_transcript job, kept under directory/<job_key>/.
+
+    A retried job (same key) skips every stage whose output is already here:
+    the parsed transcript, the validated MeetingModel with the usage that
+    produced it, and the rendered DOCX. Files are written atomically, then
+    commit (e.g. Volume.commit) makes them visible to other containers.
+    """
+
+    def __init__(self, directory: str | Path, job_key: str, *, commit: Callable[[], None] | None = None):
+        if not _JOB_KEY.fullmatch(job_key):
+            raise ValueError(f"Invalid job key: {job_key}")
+        self.job_key = job_key
+        self.path = Path(directory) / job_key
+        self._commit = commit
+
+    def load_transcript(self) -> LoadedTranscript | None:
+        data = self._read(TRANSCRIPT)
+        if data is None:
+            return None
+        self._resumed("transcript")
+        return LoadedTranscript.model_validate_json(data)
+
+    def save_transcript(self, transcript: LoadedTranscript) -> None:
+        self._write({TRANSCRIPT: model_json(transcript)})
+
+    def load_meeting(self) -> tuple[MeetingModel, UsageReport] | None:
+        meeting, usage = self._read(MEETING), self._read(USAGE)
+        if meeting is None or usage is None:
+            return None
+        self._resumed("meeting")
+        return MeetingModel.model_validate_json(meeting), UsageReport.model_validate_json(usage)
+
+    def save_meeting(self, meeting: MeetingModel, usage: UsageReport) -> None:
+        # Usage first: the meeting file marks the stage complete
+        self._write({USAGE: model_json(usage), MEETING: model_json(meeting)})
+
+    def load_docx(self) -> bytes | None:
+        data = self._read(DOCX)
+        if data is not None:
+            self._resumed("docx")
+        return data
+
+    def save_docx(self, docx_bytes: bytes) -> None:
+        self._write({DOCX: docx_bytes})
+
+    def clear(self) -> None:
+        """Drop the job's checkpoints once its result has been returned."""
+        shutil.rmtree(self.path, ignore_errors=True)
+        self._sync()
+
+    def _read(self, name: str) -> bytes | None:
+        try:
+            data = (self.path / name).read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as exc:
+            logger.warning("Checkpoint read failed", exc_info=exc, extra={"job_key": self.job_key, "stage": name})
+            return None
+        return data
+
+    def _resumed(self, stage: str) -> None:
+        logger.info("Resuming from checkpoint", extra={"job_key": self.job_key, "stage": stage})
+
+    def _write(self, files: dict[str, bytes]) -> None:
+        # A failed write only costs the resume, never the job
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            for name, data in files.items():
+                tmp_path = self.path / f".{name}.{uuid.uuid4().hex}.tmp"
+                try:
+                    tmp_path.write_bytes(data)
+                    os.replace(tmp_path, self.path / name)
+                finally:
+                    tmp_path.unlink(missing_ok=True)
+        except OSError as exc:
+            logger.warning("Checkpoint write failed", exc_info=exc, extra={"job_key": self.job_key})
+            return
+        self._sync()
+
+    def _sync(self) -> None:
+        if self._commit is None:
+            return
+        try:
+            self._commit()
+        except Exception as exc:
+            logger.warning("Checkpoint commit failed", exc_info=exc, extra={"job_key": self.job_key})
+
+
+def sweep_expired(directory: str | Path, ttl_seconds: float) -> int:
+    """
+    Remove entries of directory not modified for ttl_seconds; return how many.
+
+    Used for checkpoints of jobs that never finished and for uploads they left behind.
+    """
+    root = Path(directory)
+    if not root.is_dir():
+        return 0
+    cutoff = time.time() - ttl_seconds
+    removed = 0
+    for entry in root.iterdir():
+        try:
+            if _last_modified(entry) >= cutoff:
+                continue
+            if entry.is_dir():
+                shutil.rmtree(entry)
+            else:
+                entry.unlink()
+        except OSError as exc:
+            logger.warning("Sweep failed", exc_info=exc, extra={"path": str(entry)})
+            continue
+        removed += 1
+    return removed
+
+
+def _last_modified(entry: Path) -> float:
+    if not entry.is_dir():
+        return entry.stat().st_mtime
+    return max([entry.stat().st_mtime, *(child.stat().st_mtime for child in entry.rglob("*"))])
@@ -0,0 +1,218 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Protocol, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Claims left behind by a crashed container stop blocking new requests after this long
+DEFAULT_CLAIM_TTL_SECONDS = 15 * 60
+# How often followers poll a cross-container claim that has no call id yet
+PENDING_POLL_SECONDS = 0.25
+PENDING_PREFIX = "pending:"
+# Marker a cross-container follower leaves so the leader does not cancel work it is waiting on
+FOLLOWER_SUFFIX = ":followed"
+
+
+def request_key(*, content_sha256: str, filename: str, template_id: str, meta: dict[str, Any]) -> str:
+    """
+    Canonical hash of everything that determines a process_transcript result.
+
+    The filename is included because its extension selects the transcript parser.
+    """
+    payload = json.dumps(
+        {
+            "content_sha256": content_sha256,
+            "filename": filename,
+            "template_id": template_id,
+            "meta": meta,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """
+    In-process request coalescing.
+
+    The first caller for a key runs the work; callers that arrive while it is
+    in flight await the same task and get the same result (or exception).
+    The work is cancelled once every caller waiting on it has gone away.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._waiters: dict[str, int] = {}
+
+    def inflight(self, key: str) -> bool:
+        return key in self._inflight
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            logger.info("Coalescing duplicate request", extra={"request_key": key})
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            # One caller going away must not cancel the work for the others
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[key] == 1 and not task.done():
+                logger.info("Last waiter gone; cancelling request", extra={"request_key": key})
+                task.cancel()
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+
+
+class InflightStore(Protocol):
+    """Shared key -> value map used to coalesce requests across containers."""
+
+    async def claim(self, key: str, value: str, ttl: float) -> str:
+        """Store value if key is free or expired; return the value now held for key."""
+        ...
+
+    async def get(self, key: str) -> str | None: ...
+
+    async def set(self, key: str, value: str, ttl: float) -> None: ...
+
+    async def release(self, key: str, value: str) -> None:
+        """Remove key if it still holds value."""
+        ...
+
+
+def _entry(value: str, ttl: float) -> dict[str, Any]:
+    return {"value": value, "expires_at": time.time() + ttl}
+
+
+def _live_value(entry: dict[str, Any] | None) -> str | None:
+    if not entry or entry["expires_at"] < time.time():
+        return None
+    return entry["value"]
+
+
+class LocalInflightStore:
+    """In-memory InflightStore; stands in for the shared store in tests and local runs."""
+
+    def __init__(self) -> None:
+        self._entries: dict[str, dict[str, Any]] = {}
+
+    async def claim(self, key: str, value: str, ttl: float) -> str:
+        current = _live_value(self._entries.get(key))
+        if current is not None:
+            return current
+        self._entries[key] = _entry(value, ttl)
+        return value
+
+    async def get(self, key: str) -> str | None:
+        return _live_value(self._entries.get(key))
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        self._entries[key] = _entry(value, ttl)
+
+    async def release(self, key: str, value: str) -> None:
+        if _live_value(self._entries.get(key)) == value:
+            self._entries.pop(key, None)
+
+
+class ModalDictInflightStore:
+    """InflightStore backed by a modal.Dict shared by all containers of the app."""
+
+    def __init__(self, modal_dict: Any):
+        self._dict = modal_dict
+
+    async def claim(self, key: str, value: str, ttl: float) -> str:
+        if await self._dict.put.aio(key, _entry(value, ttl), skip_if_exists=True):
+            return value
+        current = _live_value(await self._dict.get.aio(key))
+        if current is not None:
+            return current
+        # Previous claim expired: take it over
+        await self._dict.put.aio(key, _entry(value, ttl))
+        return value
+
+    async def get(self, key: str) -> str | None:
+        return _live_value(await self._dict.get.aio(key))
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        await self._dict.put.aio(key, _entry(value, ttl))
+
+    async def release(self, key: str, value: str) -> None:
+        if _live_value(await self._dict.get.aio(key)) == value:
+            await self._dict.pop.aio(key)
+
+
+class DistributedSingleFlight:
+    """
+    Cross-container request coalescing.
+
+    The leader claims the key, spawns the call and publishes its call id;
+    followers in any container wait on that call id instead of spawning their own.
+    If the leader is cancelled before the call finishes and no follower has
+    joined, the call is cancelled too.
+    """
+
+    def __init__(self, store: InflightStore, *, ttl: float = DEFAULT_CLAIM_TTL_SECONDS):
+        self.store = store
+        self.ttl = ttl
+
+    async def run(
+        self,
+        key: str,
+        spawn: Callable[[], Awaitable[str]],
+        wait: Callable[[str], Awaitable[T]],
+        cancel: Callable[[str], Awaitable[None]] | None = None,
+    ) -> tuple[T, bool]:
+        """
+        Run or join the call for key.
+
+        spawn starts the work and returns its call id; wait(call_id) returns its
+        result; cancel(call_id), if given, stops it. Returns (result, coalesced)
+        where coalesced is True for followers.
+        """
+        token = f"{PENDING_PREFIX}{uuid.uuid4().hex}"
+        while (owner := await self.store.claim(key, token, self.ttl)) != token:
+            call_id = await self._await_call_id(key, owner)
+            if call_id is not None:
+                logger.info("Joining in-flight call", extra={"request_key": key, "call_id": call_id})
+                await self.store.set(f"{key}{FOLLOWER_SUFFIX}", call_id, self.ttl)
+                return await wait(call_id), True
+            # Leader released or expired before spawning; try to claim again
+
+        try:
+            call_id = await spawn()
+        except BaseException:
+            await self.store.release(key, token)
+            raise
+        await self.store.set(key, call_id, self.ttl)
+        try:
+            return await wait(call_id), False
+        except asyncio.CancelledError:
+            if cancel is not None and await self.store.get(f"{key}{FOLLOWER_SUFFIX}") != call_id:
+                logger.info("Cancelling abandoned call", extra={"request_key": key, "call_id": call_id})
+                await cancel(call_id)
+            raise
+        finally:
+            await self.store.release(key, call_id)
+            await self.store.release(f"{key}{FOLLOWER_SUFFIX}", call_id)
+
+    async def _await_call_id(self, key: str, value: str | None) -> str | None:
+        deadline = time.monotonic() + self.ttl
+        while value is not None and value.startswith(PENDING_PREFIX):
+            if time.monotonic() > deadline:
+                return None
+            await asyncio.sleep(PENDING_POLL_SECONDS)
+            value = await self.store.get(key)
+        return value
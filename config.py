@@ -16,6 +16,20 @@ class Settings(BaseSettings):
         validation_alias=AliasChoices("OPENAI_MODEL", "AZURE_OPENAI_MODEL")
     )
 
+    # Small, fast deployment for easy fields (attendees, apologies, contract dates).
+    # Unset means every call uses openai_model.
+    openai_fast_model: str | None = Field(
+        default=None,
+        validation_alias=AliasChoices("OPENAI_FAST_MODEL", "AZURE_OPENAI_FAST_MODEL"),
+    )
+
+    # Deployment that receives hedged duplicates of slow calls (see hedging.py).
+    # Unset means the hedge goes to the same deployment as the original call.
+    openai_hedge_model: str | None = Field(
+        default=None,
+        validation_alias=AliasChoices("OPENAI_HEDGE_MODEL", "AZURE_OPENAI_HEDGE_MODEL"),
+    )
+
     openai_base_url: str | None = Field(
         default=None,
         validation_alias=AliasChoices(
@@ -27,6 +41,95 @@ class Settings(BaseSettings):
 
     openai_temperature: str | None = Field(default=None)
 
+    # "single" or "parallel" (see llm_extractor.EXTRACTION_MODES)
+    extraction_mode: str = Field(default="single")
+    parallel_max_workers: int = Field(default=6)
+
+    # Parallel mode: transcripts of at least retrieval_min_chars give each section
+    # group only its BM25-ranked passages (see retrieval.py); 0 disables retrieval.
+    retrieval_min_chars: int = Field(default=40000)
+    retrieval_section_token_budget: int = Field(default=4000)
+
+    # Sections missing from the LLM output, or with an over-long unknown title, are
+    # asked for again in one narrow call (see section_validation.py)
+    section_reask: bool = Field(default=True)
+
+    # File-backed template registry; unset means <repo>/templates.
+    # Spec files are re-scanned every template_reload_seconds (0 disables hot reload).
+    templates_dir: str | None = Field(default=None)
+    template_reload_seconds: float = Field(default=5.0)
+
+    # Uploads staged on the volume; larger bodies get a 413 before they are read
+    # (see blob_store.UploadLimitMiddleware and save_upload)
+    upload_dir: str = Field(default="/data/uploads")
+    max_upload_bytes: int = Field(default=50 * 1024 * 1024)
+    upload_chunk_bytes: int = Field(default=1024 * 1024)
+    # Render DOCX in a warm process pool (see render_pool.py); 0 renders inline.
+    # render_max_pending caps queued + running jobs (0 means 2 * render_workers).
+    render_workers: int = Field(default=0)
+    render_max_pending: int = Field(default=0)
+    render_timeout_seconds: float = Field(default=60.0)
+    render_queue_timeout_seconds: float = Field(default=30.0)
+
+    # Shrink rendered DOCX (see docx_optimizer.py): drop unused styles, lists and custom XML,
+    # dedupe media and re-zip at docx_compress_level (1-9); False keeps docxtpl's output as is.
+    docx_optimize: bool = Field(default=True)
+    docx_compress_level: int = Field(default=9)
+
+    # Send each template's compiled JSON schema as the Responses API text.format, so the output
+    # is constrained to its models and section codes (see template_registry.TemplateArtifacts).
+    # Off keeps JSON-by-prompt, for deployments without json_schema support.
+    openai_structured_output: bool = Field(default=False)
+
+    # Rendered DOCX cache (see render_cache.py); 0 disables it.
+    # render_cache_dir adds an on-disk tier, e.g. on the shared volume.
+    render_cache_bytes: int = Field(default=64 * 1024 * 1024)
+    render_cache_dir: str | None = Field(default=None)
+
+    # Token budgets checked before each LLM call (see usage.py); 0 means unlimited.
+    # The day budget is per process unless the ledger is shared (UsageLedger.share, done on Modal).
+    # token_budget_action: "reject" (429) or "downgrade" (fast model, smaller output cap, low effort if set)
+    token_budget_per_request: int = Field(default=0)
+    token_budget_per_day: int = Field(default=0)
+    token_budget_action: str = Field(default="reject")
+
+    # Deployment -> [input, output] USD per million tokens, for /estimate (JSON in the environment).
+    # Estimates for a deployment without a price have no cost.
+    model_prices: dict[str, tuple[float, float]] = Field(default_factory=dict)
+
+    # Admission scheduler in front of process_transcript (see scheduler.py).
+    # Jobs up to scheduler_interactive_max_tokens (estimated) use the interactive lane;
+    # batch jobs never take the last scheduler_interactive_reserved slots.
+    # scheduler_tenant_weights maps project -> weight (JSON in the environment).
+    scheduler_max_inflight: int = Field(default=32)
+    scheduler_interactive_reserved: int = Field(default=8)
+    scheduler_interactive_max_tokens: int = Field(default=10000)
+    scheduler_tenant_weights: dict[str, float] = Field(default_factory=dict)
+
+    # Per-stage checkpoints of process_transcript (see checkpoints.py); unset disables them.
+    # Checkpoints of jobs that never finished, and their uploads, are swept after checkpoint_ttl_seconds.
+    checkpoint_dir: str | None = Field(default=None)
+    checkpoint_ttl_seconds: float = Field(default=24 * 60 * 60)
+
+    # Minutes and DOCX of successful transforms, kept for project export (see results_store.py);
+    # unset keeps nothing.
+    results_dir: str | None = Field(default=None)
+
+    # SQLite full-text index over stored results (see search_index.py); needs results_dir,
+    # unset disables search.
+    search_index_path: str | None = Field(default=None)
+
+    # Hedged LLM calls on the async client (see hedging.py); hedge_percentile 0 disables them.
+    # A call slower than this percentile of the last hedge_window latencies for its deployment
+    # and size gets a duplicate; hedges stay under hedge_max_rate of recent calls.
+    hedge_percentile: float = Field(default=0.0)
+    hedge_min_samples: int = Field(default=20)
+    hedge_window: int = Field(default=200)
+    hedge_max_rate: float = Field(default=0.05)
+
+    # Trade a little CPU for a lower peak: fewer transcript copies per prompt and leaner repairs
+    low_memory: bool = Field(default=False)
+
     @property
     def openai_temperature_float(self) -> float | None:
         """Get temperature as float, handling empty strings"""
@@ -0,0 +1,229 @@
+import functools
+import hashlib
+import io
+import posixpath
+import zipfile
+from typing import NamedTuple
+
+from lxml import etree
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+RELATIONSHIPS = "http://schemas.openxmlformats.org/package/2006/relationships"
+CONTENT_TYPES = "http://schemas.openxmlformats.org/package/2006/content-types"
+
+CONTENT_TYPES_PART = "[Content_Types].xml"
+NUMBERING_PART = "word/numbering.xml"
+# stylesWithEffects.xml is Word 2010's copy of styles.xml and is pruned the same way
+STYLE_PARTS = ("word/styles.xml", "word/stylesWithEffects.xml")
+MEDIA_DIR = "word/media/"
+CUSTOM_XML_DIR = "customXml/"
+
+# Elements whose w:val names a style, wherever they appear outside the style parts
+STYLE_REFERENCES = frozenset(
+    f"{{{W}}}{name}"
+    for name in ("pStyle", "rStyle", "tblStyle", "numStyleLink", "styleLink", "clickAndTypeStyle", "defaultTableStyle")
+)
+# Elements of a style that name another style it needs
+STYLE_CHAIN = tuple(f"{{{W}}}{name}" for name in ("basedOn", "next", "link"))
+# Pruned style parts kept per process; a template's style parts are the same in every render
+STYLE_CACHE_SIZE = 32
+
+
+class DocxSavings(NamedTuple):
+    bytes_before: int
+    bytes_after: int
+    styles_removed: int
+    numbering_removed: int
+    custom_xml_removed: int
+    media_deduplicated: int
+
+    @property
+    def saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+
+def optimize_docx(docx_bytes: bytes, *, compresslevel: int = 9) -> tuple[bytes, DocxSavings]:
+    """
+    Shrink a rendered DOCX without changing what Word shows.
+
+    Drops custom XML parts (unless content controls are bound to them),
+    repoints relationships at the first copy of identical media and removes
+    unreferenced media, removes styles nothing uses (keeping defaults and the
+    basedOn/next/link chains of used ones) and list definitions nothing
+    uses, then re-zips at compresslevel with [Content_Types].xml first.
+    """
+    with zipfile.ZipFile(io.BytesIO(docx_bytes)) as source:
+        infos = source.infolist()
+        parts = {info.filename: source.read(info) for info in infos}
+    trees: dict[str, etree._Element] = {}
+
+    custom_xml_removed = _drop_custom_xml(parts, trees)
+    media_deduplicated = _dedupe_media(parts, trees)
+    styles_removed = _prune_styles(parts, trees)
+    numbering_removed = _prune_numbering(parts, trees)
+    for name, root in trees.items():
+        parts[name] = etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as target:
+        for info in sorted(infos, key=lambda info: info.filename != CONTENT_TYPES_PART):
+            if info.filename not in parts:
+                continue
+            member = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+            member.compress_type = zipfile.ZIP_DEFLATED
+            target.writestr(member, parts[info.filename], compresslevel=compresslevel)
+    optimized = buffer.getvalue()
+
+    return optimized, DocxSavings(
+        bytes_before=len(docx_bytes),
+        bytes_after=len(optimized),
+        styles_removed=styles_removed,
+        numbering_removed=numbering_removed,
+        custom_xml_removed=custom_xml_removed,
+        media_deduplicated=media_deduplicated,
+    )
+
+
+def _tree(parts: dict[str, bytes], trees: dict[str, etree._Element], name: str) -> etree._Element:
+    """Parsed part, parsed once and written back by optimize_docx."""
+    if name not in trees:
+        trees[name] = etree.fromstring(parts[name])
+    return trees[name]
+
+
+def _word_xml_parts(parts: dict[str, bytes], *, exclude: tuple[str, ...] = ()) -> list[str]:
+    return [name for name in parts if name.startswith("word/") and name.endswith(".xml") and name not in exclude]
+
+
+def _rels_parts(parts: dict[str, bytes]) -> list[str]:
+    return [name for name in parts if name.endswith(".rels")]
+
+
+def _rel_source_dir(rels_name: str) -> str:
+    """word/_rels/document.xml.rels -> word; _rels/.rels -> the package root."""
+    return posixpath.dirname(posixpath.dirname(rels_name))
+
+
+def _relationships(parts: dict[str, bytes], trees: dict[str, etree._Element]):
+    """(rels part, Relationship element, absolute target part) for every internal relationship."""
+    for rels_name in _rels_parts(parts):
+        base = _rel_source_dir(rels_name)
+        for rel in _tree(parts, trees, rels_name).iter(f"{{{RELATIONSHIPS}}}Relationship"):
+            if rel.get("TargetMode") == "External":
+                continue
+            target = rel.get("Target", "")
+            path = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join(base, target))
+            yield rels_name, rel, path
+
+
+def _remove_parts(parts: dict[str, bytes], trees: dict[str, etree._Element], names: set[str]) -> None:
+    """Delete parts, the relationships that point at them and their content-type overrides."""
+    for name in names:
+        parts.pop(name, None)
+        trees.pop(name, None)
+    for _, rel, target in list(_relationships(parts, trees)):
+        if target in names:
+            rel.getparent().remove(rel)
+    types = _tree(parts, trees, CONTENT_TYPES_PART)
+    for override in types.findall(f"{{{CONTENT_TYPES}}}Override"):
+        if override.get("PartName", "").lstrip("/") in names:
+            types.remove(override)
+
+
+def _drop_custom_xml(parts: dict[str, bytes], trees: dict[str, etree._Element]) -> int:
+    custom = {name for name in parts if name.startswith(CUSTOM_XML_DIR)}
+    if not custom:
+        return 0
+    # Content controls bound to a custom XML store item read their values from it
+    if any(b"dataBinding" in parts[name] for name in _word_xml_parts(parts)):
+        return 0
+    _remove_parts(parts, trees, custom)
+    return len(custom)
+
+
+def _dedupe_media(parts: dict[str, bytes], trees: dict[str, etree._Element]) -> int:
+    first: dict[str, str] = {}
+    duplicates: dict[str, str] = {}
+    for name in parts:
+        if name.startswith(MEDIA_DIR):
+            digest = hashlib.sha256(parts[name]).hexdigest()
+            duplicates[name] = first.setdefault(digest, name)
+    referenced = set()
+    for rels_name, rel, target in _relationships(parts, trees):
+        kept = duplicates.get(target, target)
+        if kept != target:
+            rel.set("Target", posixpath.relpath(kept, _rel_source_dir(rels_name) or "."))
+        referenced.add(kept)
+    # Duplicates now have no relationships left, and unreferenced media is dead weight
+    removed = {name for name in duplicates if name not in referenced}
+    if removed:
+        _remove_parts(parts, trees, removed)
+    return len(removed)
+
+
+def _style_references(parts: dict[str, bytes], trees: dict[str, etree._Element]) -> set[str]:
+    used = set()
+    for name in _word_xml_parts(parts, exclude=STYLE_PARTS):
+        for element in _tree(parts, trees, name).iter(*STYLE_REFERENCES):
+            used.add(element.get(f"{{{W}}}val"))
+    return used
+
+
+def _prune_styles(parts: dict[str, bytes], trees: dict[str, etree._Element]) -> int:
+    used = frozenset(_style_references(parts, trees))
+    removed = 0
+    for name in STYLE_PARTS:
+        if name in parts:
+            parts[name], count = _pruned_style_part(parts[name], used)
+            removed += count
+    return removed
+
+
+@functools.lru_cache(maxsize=STYLE_CACHE_SIZE)
+def _pruned_style_part(data: bytes, used: frozenset[str]) -> tuple[bytes, int]:
+    """The style part without styles outside used, the defaults and their chains: (part, styles removed)."""
+    root = etree.fromstring(data)
+    styles = {style.get(f"{{{W}}}styleId"): style for style in root.findall(f"{{{W}}}style")}
+    keep = set(used)
+    keep.update(style_id for style_id, style in styles.items() if style.get(f"{{{W}}}default") in ("1", "true", "on"))
+    pending = list(keep)
+    while pending:
+        style = styles.get(pending.pop())
+        if style is None:
+            continue
+        for link in style.iterchildren(*STYLE_CHAIN):
+            style_id = link.get(f"{{{W}}}val")
+            if style_id not in keep:
+                keep.add(style_id)
+                pending.append(style_id)
+    removed = 0
+    for style_id, style in styles.items():
+        if style_id not in keep:
+            root.remove(style)
+            removed += 1
+    return etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True), removed
+
+
+def _prune_numbering(parts: dict[str, bytes], trees: dict[str, etree._Element]) -> int:
+    if NUMBERING_PART not in parts:
+        return 0
+    # Runs after _prune_styles: list styles that were removed no longer keep their lists
+    used = {
+        element.get(f"{{{W}}}val")
+        for name in _word_xml_parts(parts, exclude=(NUMBERING_PART,))
+        for element in _tree(parts, trees, name).iter(f"{{{W}}}numId")
+    }
+    root = _tree(parts, trees, NUMBERING_PART)
+    removed = 0
+    abstract_used = set()
+    for num in root.findall(f"{{{W}}}num"):
+        if num.get(f"{{{W}}}numId") in used:
+            abstract_used.add(num.find(f"{{{W}}}abstractNumId").get(f"{{{W}}}val"))
+        else:
+            root.remove(num)
+            removed += 1
+    for abstract in root.findall(f"{{{W}}}abstractNum"):
+        if abstract.get(f"{{{W}}}abstractNumId") not in abstract_used:
+            root.remove(abstract)
+            removed += 1
+    return removed
@@ -0,0 +1,149 @@
+import statistics
+import threading
+from collections import deque
+
+from pydantic import BaseModel
+
+from config import settings
+from hedging import size_bucket
+from llm_extractor import MAX_TRANSCRIPT_CHARS, plan_calls, resolve_mode
+from models import MeetingMeta, TemplateSpec
+from tokens import estimate_tokens
+from transcript_loader import load_transcript_with_speakers
+from usage import UNCAPPED_OUTPUT_TOKENS, ledger
+
+# Timings of the last LATENCY_WINDOW transforms in this process feed the latency prediction,
+# which needs at least MIN_LATENCY_SAMPLES of them
+LATENCY_WINDOW = 200
+MIN_LATENCY_SAMPLES = 5
+
+
+class CallEstimate(BaseModel):
+    model: str
+    prompt_tokens: int
+    max_output_tokens: int | None = None
+
+
+class TranscriptEstimate(BaseModel):
+    """What a transform of a transcript would involve, worked out without calling the LLM."""
+
+    template_id: str
+    mode: str
+    characters: int
+    tokens: int
+    speakers: int
+    truncated: bool
+    characters_dropped: int
+    # Parallel mode on a long transcript: section calls get BM25 excerpts, not the whole transcript
+    retrieval: bool
+    calls: list[CallEstimate]
+    input_tokens: int
+    output_tokens: int
+    cost_usd: float | None
+    latency_seconds: float | None
+    latency_samples: int
+
+
+class JobTimings:
+    """Wall-clock seconds of recent transforms by transcript size, for predicting the next one."""
+
+    def __init__(self, window: int):
+        self._samples: deque[tuple[int, float]] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, transcript_tokens: int, seconds: float) -> None:
+        with self._lock:
+            self._samples.append((transcript_tokens, seconds))
+
+    def predict(self, transcript_tokens: int, *, min_samples: int = MIN_LATENCY_SAMPLES) -> tuple[float | None, int]:
+        """
+        (predicted seconds, samples used), or (None, samples held) while there
+        are too few.
+
+        The median of transforms in the same size bucket when there are enough
+        of them; otherwise a least-squares line through every recent timing.
+        """
+        with self._lock:
+            samples = list(self._samples)
+        bucket = size_bucket(transcript_tokens)
+        same = [seconds for tokens, seconds in samples if size_bucket(tokens) == bucket]
+        if len(same) >= min_samples:
+            return statistics.median(same), len(same)
+        if len(samples) < min_samples or len({tokens for tokens, _ in samples}) < 2:
+            return None, len(samples)
+        slope, intercept = statistics.linear_regression(
+            [tokens for tokens, _ in samples], [seconds for _, seconds in samples]
+        )
+        return max(0.0, intercept + slope * transcript_tokens), len(samples)
+
+
+job_timings = JobTimings(LATENCY_WINDOW)
+
+
+def estimate_transcript(
+    file_content: bytes,
+    filename: str,
+    meta: MeetingMeta,
+    template: TemplateSpec,
+    *,
+    mode: str | None = None,
+) -> TranscriptEstimate:
+    """
+    Parse the transcript and assemble the extraction prompts, then estimate
+    tokens, cost and latency. Nothing is sent to the LLM.
+
+    Output tokens are the mean output per call of the same deployment today
+    when this process has made such calls, otherwise the call's output cap
+    (an upper bound).
+    """
+    transcript = load_transcript_with_speakers(file_content, filename)
+    del file_content
+    mode = resolve_mode(mode)
+    characters = len(transcript.text)
+    planned = plan_calls(transcript.text, meta, template, mode=mode, speakers=transcript.speakers)
+    speakers = len(transcript.speakers.speakers)
+    del transcript
+
+    calls = [
+        CallEstimate(model=options.model, prompt_tokens=tokens, max_output_tokens=options.max_output_tokens)
+        for tokens, options in planned
+    ]
+    output_tokens = [_expected_output_tokens(call) for call in calls]
+    tokens = estimate_tokens(characters)
+    latency, samples = job_timings.predict(tokens)
+    return TranscriptEstimate(
+        template_id=template.id,
+        mode=mode,
+        characters=characters,
+        tokens=tokens,
+        speakers=speakers,
+        truncated=characters > MAX_TRANSCRIPT_CHARS,
+        characters_dropped=max(0, characters - MAX_TRANSCRIPT_CHARS),
+        retrieval=mode == "parallel"
+        and bool(settings.retrieval_min_chars)
+        and min(characters, MAX_TRANSCRIPT_CHARS) >= settings.retrieval_min_chars,
+        calls=calls,
+        input_tokens=sum(call.prompt_tokens for call in calls),
+        output_tokens=sum(output_tokens),
+        cost_usd=_cost(calls, output_tokens),
+        latency_seconds=None if latency is None else round(latency, 1),
+        latency_samples=samples,
+    )
+
+
+def _expected_output_tokens(call: CallEstimate) -> int:
+    observed = [row for row in ledger.summary() if row["model"] == call.model]
+    calls = sum(row["calls"] for row in observed)
+    if calls:
+        return round(sum(row["output_tokens"] for row in observed) / calls)
+    return call.max_output_tokens or UNCAPPED_OUTPUT_TOKENS
+
+
+def _cost(calls: list[CallEstimate], output_tokens: list[int]) -> float | None:
+    total = 0.0
+    for call, output in zip(calls, output_tokens):
+        price = settings.model_prices.get(call.model)
+        if price is None:
+            return None
+        total += (call.prompt_tokens * price[0] + output * price[1]) / 1_000_000
+    return round(total, 4)
@@ -0,0 +1,124 @@
+import logging
+import math
+import threading
+from collections import deque
+from typing import Any
+
+from config import settings
+from model_routing import CallOptions
+
+logger = logging.getLogger(__name__)
+
+_policy: "HedgePolicy | None" = None
+_policy_lock = threading.Lock()
+
+
+def size_bucket(prompt_tokens: int) -> int:
+    """Power-of-two size class: calls within a factor of two of each other share latency stats."""
+    return max(prompt_tokens, 1).bit_length()
+
+
+class LatencyTracker:
+    """The last `window` latencies of successful calls, per deployment and prompt size bucket."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self._samples: dict[tuple[str, int], deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model: str, prompt_tokens: int, seconds: float) -> None:
+        key = (model, size_bucket(prompt_tokens))
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, model: str, prompt_tokens: int, pct: float, *, min_samples: int) -> float | None:
+        """Nearest-rank percentile of the bucket, or None until it holds min_samples latencies."""
+        with self._lock:
+            samples = sorted(self._samples.get((model, size_bucket(prompt_tokens)), ()))
+        if not samples or len(samples) < min_samples:
+            return None
+        return samples[max(0, math.ceil(pct / 100 * len(samples)) - 1)]
+
+
+class HedgePolicy:
+    """
+    When to send a duplicate of a slow LLM call, and to which deployment.
+
+    A call that has not answered by the given percentile of recent latencies
+    for its deployment and size bucket gets a hedge, sent to hedge_model when
+    set. Among the last `window` calls, hedges may not exceed max_rate of
+    the primaries; this bounds the extra token spend.
+    """
+
+    def __init__(
+        self,
+        *,
+        percentile: float,
+        min_samples: int,
+        window: int,
+        max_rate: float,
+        hedge_model: str | None = None,
+    ):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.max_rate = max_rate
+        self.hedge_model = hedge_model
+        self.latencies = LatencyTracker(window)
+        # True for a hedge, False for a primary call
+        self._recent: deque[bool] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.percentile > 0 and self.max_rate > 0
+
+    def hedge_delay(self, options: CallOptions, prompt_tokens: int) -> float | None:
+        """Register a primary call; return how long to wait before hedging it, or None for never."""
+        with self._lock:
+            self.calls += 1
+            self._recent.append(False)
+        if not self.enabled:
+            return None
+        return self.latencies.percentile(options.model, prompt_tokens, self.percentile, min_samples=self.min_samples)
+
+    def admit_hedge(self) -> bool:
+        """Take a hedge from the rate cap; False when the recent hedge rate is already at it."""
+        with self._lock:
+            hedges = sum(self._recent)
+            primaries = len(self._recent) - hedges
+            if hedges + 1 > self.max_rate * primaries:
+                return False
+            self._recent.append(True)
+            self.hedges += 1
+        return True
+
+    def hedge_options(self, options: CallOptions) -> CallOptions:
+        if not self.hedge_model:
+            return options
+        return options.model_copy(update={"model": self.hedge_model})
+
+    def record_win(self) -> None:
+        with self._lock:
+            self.hedge_wins += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"calls": self.calls, "hedges": self.hedges, "hedge_wins": self.hedge_wins}
+
+
+def get_hedge_policy() -> HedgePolicy:
+    """The process-wide policy, created on first use from settings (hedge_percentile 0 disables hedging)."""
+    global _policy
+    with _policy_lock:
+        if _policy is None:
+            _policy = HedgePolicy(
+                percentile=settings.hedge_percentile,
+                min_samples=settings.hedge_min_samples,
+                window=settings.hedge_window,
+                max_rate=settings.hedge_max_rate,
+                hedge_model=settings.openai_hedge_model,
+            )
+    return _policy
@@ -0,0 +1,63 @@
+import json
+from typing import Any
+
+from pydantic import BaseModel
+
+try:  # orjson is optional; fall back to the stdlib encoder
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize plain JSON data to bytes with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def model_json(model: BaseModel) -> bytes:
+    """Serialize a pydantic model straight to JSON bytes, without an intermediate dict."""
+    return model.__pydantic_serializer__.to_json(model)
+
+
+def transform_response_body(
+    *, request_id: str, minutes_json: str | bytes, docx_base64: str, usage_json: str | bytes | None = None
+) -> bytes:
+    """
+    Assemble the /transform JSON body from already-serialized parts.
+
+    minutes_json (and usage_json, when given) are spliced in verbatim, so the
+    models are never turned back into dicts and re-encoded. Base64 text needs
+    no JSON escaping.
+    """
+    parts = [b'{"request_id":', dumps(request_id), b',"minutes":', _utf8(minutes_json)]
+    if usage_json is not None:
+        parts += [b',"usage":', _utf8(usage_json)]
+    parts += [b',"docx_base64":"', docx_base64.encode("ascii"), b'"}']
+    return b"".join(parts)
+
+
+def multi_transform_response_body(
+    *,
+    request_id: str,
+    minutes_json: str | bytes,
+    usage_json: str | bytes,
+    documents: list[tuple[str, str | bytes, str]],
+) -> bytes:
+    """
+    Assemble the /transform/multi JSON body: the extracted minutes and usage,
+    then one {template_id, minutes, docx_base64} per (template id, minutes
+    JSON, DOCX base64) in documents, spliced in as for transform_response_body.
+    """
+    parts = [b'{"request_id":', dumps(request_id), b',"minutes":', _utf8(minutes_json)]
+    parts += [b',"usage":', _utf8(usage_json), b',"documents":[']
+    for index, (template_id, document_json, docx_base64) in enumerate(documents):
+        parts += [b"," if index else b"", b'{"template_id":', dumps(template_id), b',"minutes":', _utf8(document_json)]
+        parts += [b',"docx_base64":"', docx_base64.encode("ascii"), b'"}']
+    parts.append(b"]}")
+    return b"".join(parts)
+
+
+def _utf8(value: str | bytes) -> bytes:
+    return value.encode("utf-8") if isinstance(value, str) else value
@@ -1,93 +1,688 @@
+import asyncio
 import json
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from functools import partial
 from textwrap import dedent
-from typing import Any
+from typing import Any, Callable, NoReturn, TypeVar
 
 from fastapi import HTTPException
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
 from config import settings
-from models import MeetingMeta, MeetingModel, TemplateExtractionSpec, TemplateSpec
+from hedging import get_hedge_policy
+from model_routing import CallOptions, escalation_options, section_group_task, select_call_options
+from models import (
+    MeetingExtraction,
+    MeetingMeta,
+    MeetingModel,
+    PeopleExtraction,
+    Person,
+    Section,
+    SectionsExtraction,
+    SpeakerIndex,
+    TemplateExtractionSpec,
+    TemplateSectionSpec,
+    TemplateSpec,
+    type_adapter,
+)
+from retrieval import BM25Index, relevant_excerpt
+from section_validation import SectionCheck, check_sections, splice_sections
+from tokens import estimate_tokens
+from usage import BudgetExceeded, budgeted_call
 
 logger = logging.getLogger(__name__)
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
 # Maximum transcript length in characters before truncation
 # Increased to handle large meeting transcripts (13k+ words = ~90k chars)
 # Note: Azure Responses API can handle much larger inputs, but we keep a reasonable limit
 # for cost and processing time. For transcripts exceeding this, chunking should be implemented.
 MAX_TRANSCRIPT_CHARS = 150000
 
-# Module-level OpenAI client configured for Azure
+# "single": one call produces the whole MeetingModel.
+# "parallel": concurrent narrower calls for people and each section group, merged afterwards.
+EXTRACTION_MODES = ("single", "parallel")
+
+TRANSCRIPT_HEADER = "=== TRANSCRIPT ==="
+
+# Module-level OpenAI clients configured for Azure; async_client serves the async API
 client = OpenAI(
     api_key=settings.openai_api_key,
     base_url=settings.resolved_base_url or None,
 )
+async_client = AsyncOpenAI(
+    api_key=settings.openai_api_key,
+    base_url=settings.resolved_base_url or None,
+)
+
+
+def extract_meeting_model(
+    text: str,
+    meta: MeetingMeta,
+    template: TemplateSpec,
+    *,
+    mode: str | None = None,
+    speakers: SpeakerIndex | None = None,
+) -> MeetingModel:
+    """
+    Extract a MeetingModel from transcript text.
+
+    mode selects the extraction strategy ("single" or "parallel") and defaults to
+    settings.extraction_mode. "single" asks one LLM call for the whole model;
+    "parallel" issues concurrent narrower calls (people + section groups) and
+    merges the partial results.
+
+    speakers (from transcript_loader.load_transcript_with_speakers) pre-fill the
+    attendees; the LLM is then only asked for their companies and for people
+    who attended without speaking.
+    """
+    text, was_truncated, mode, speakers = _start_extraction(text, template, mode, speakers)
+    if mode == "parallel":
+        return _extract_parallel(text, meta, template, was_truncated=was_truncated, speakers=speakers)
+
+    prompt, options = _single_request(text, meta, template, was_truncated, speakers)
+    try:
+        extracted = _request_model(prompt, MeetingExtraction, options)
+    except HTTPException:
+        raise
+    except Exception as exc:
+        _raise_extraction_failed(exc, template, prompt)
+    del prompt
+    check = check_sections(extracted.sections, template.extraction)
+    reasked = _reask_sections(text, meta, template, was_truncated, check)
+    return _single_result(meta, extracted, speakers, splice_sections(template.extraction, check, reasked))
+
+
+async def extract_meeting_model_async(
+    text: str,
+    meta: MeetingMeta,
+    template: TemplateSpec,
+    *,
+    mode: str | None = None,
+    speakers: SpeakerIndex | None = None,
+) -> MeetingModel:
+    """
+    extract_meeting_model on AsyncOpenAI, for use inside an event loop.
+
+    Same prompts, routing, repair and validation; LLM calls are awaited instead
+    of blocking, so one process can have many extractions in flight.
+    """
+    text, was_truncated, mode, speakers = _start_extraction(text, template, mode, speakers)
+    if mode == "parallel":
+        return await _extract_parallel_async(text, meta, template, was_truncated=was_truncated, speakers=speakers)
+
+    prompt, options = _single_request(text, meta, template, was_truncated, speakers)
+    try:
+        extracted = await _request_model_async(prompt, MeetingExtraction, options)
+    except HTTPException:
+        raise
+    except Exception as exc:
+        _raise_extraction_failed(exc, template, prompt)
+    del prompt
+    check = check_sections(extracted.sections, template.extraction)
+    reasked = await _reask_sections_async(text, meta, template, was_truncated, check)
+    return _single_result(meta, extracted, speakers, splice_sections(template.extraction, check, reasked))
+
+
+def resolve_mode(mode: str | None) -> str:
+    """mode, or settings.extraction_mode when unset, validated against EXTRACTION_MODES."""
+    mode = (mode or settings.extraction_mode or "single").lower()
+    if mode not in EXTRACTION_MODES:
+        raise ValueError(f"Unknown extraction mode: {mode}")
+    return mode
+
+
+def plan_calls(
+    text: str,
+    meta: MeetingMeta,
+    template: TemplateSpec,
+    *,
+    mode: str | None = None,
+    speakers: SpeakerIndex | None = None,
+) -> list[tuple[int, CallOptions]]:
+    """
+    The calls extraction would send first for this transcript, as (estimated
+    prompt tokens, options), without sending any.
+
+    Prompts are assembled exactly as for the real calls (including retrieval
+    excerpts) and dropped once counted. Re-asks and JSON repairs depend on
+    the answers and are not included.
+    """
+    mode = resolve_mode(mode)
+    if speakers is not None and not speakers.speakers:
+        speakers = None
+    was_truncated = len(text) > MAX_TRANSCRIPT_CHARS
+    text = text[:MAX_TRANSCRIPT_CHARS]
+    if mode == "parallel":
+        jobs = _parallel_jobs(text, meta, template, was_truncated=was_truncated, speakers=speakers)
+        return [(estimate_tokens(build()), options) for _, build, options in jobs]
+    prompt, options = _single_request(text, meta, template, was_truncated, speakers)
+    return [(estimate_tokens(prompt), options)]
+
+
+def _start_extraction(
+    text: str, template: TemplateSpec, mode: str | None, speakers: SpeakerIndex | None
+) -> tuple[str, bool, str, SpeakerIndex | None]:
+    """Resolve the mode, drop an empty speaker index and truncate: (text, was_truncated, mode, speakers)."""
+    mode = resolve_mode(mode)
+    if speakers is not None and not speakers.speakers:
+        speakers = None
 
+    text, was_truncated = _prepare_transcript(text, template)
 
-def extract_meeting_model(text: str, meta: MeetingMeta, template: TemplateSpec) -> MeetingModel:
+    logger.info(
+        "Extracting meeting model",
+        extra={"template_id": template.id, "transcript_length": len(text), "mode": mode},
+    )
+    return text, was_truncated, mode, speakers
+
+
+def _single_request(
+    text: str, meta: MeetingMeta, template: TemplateSpec, was_truncated: bool, speakers: SpeakerIndex | None
+) -> tuple[str, CallOptions]:
+    prompt = build_prompt(
+        text=text,
+        meta=meta,
+        extraction=template.extraction,
+        was_truncated=was_truncated,
+        parts=template.artifacts.prompt_parts if template.artifacts else None,
+        speakers=speakers,
+    )
+    return prompt, _call_options(template, "full", transcript_chars=len(text))
+
+
+def _single_result(
+    meta: MeetingMeta, extracted: MeetingExtraction, speakers: SpeakerIndex | None, sections: list[Section]
+) -> MeetingModel:
+    return MeetingModel(
+        meta=meta,
+        attendees=merge_speaker_attendees(speakers, extracted.speaker_companies, extracted.attendees),
+        apologies=extracted.apologies,
+        sections=sections,
+    )
+
+
+def _raise_extraction_failed(exc: Exception, template: TemplateSpec, prompt: str) -> NoReturn:
+    logger.error(
+        "LLM extraction failed",
+        exc_info=exc,
+        extra={"template_id": template.id, "prompt_preview": prompt[:200]},
+    )
+    raise HTTPException(status_code=502, detail="LLM extraction failed") from exc
+
+
+def _prepare_transcript(text: str, template: TemplateSpec) -> tuple[str, bool]:
+    """Apply MAX_TRANSCRIPT_CHARS truncation, returning (text, was_truncated)."""
     original_length = len(text)
     # TODO: implement proper chunked map-reduce summarisation for very long transcripts
-    if len(text) > MAX_TRANSCRIPT_CHARS:
-        logger.warning(
-            "Transcript truncated for length",
-            extra={
-                "template_id": template.id,
-                "original_length": original_length,
-                "truncated_length": MAX_TRANSCRIPT_CHARS,
-            },
+    if original_length <= MAX_TRANSCRIPT_CHARS:
+        return text, False
+
+    logger.warning(
+        "Transcript truncated for length",
+        extra={
+            "template_id": template.id,
+            "original_length": original_length,
+            "truncated_length": MAX_TRANSCRIPT_CHARS,
+        },
+    )
+    return text[:MAX_TRANSCRIPT_CHARS], True
+
+
+def _response_kwargs(prompt: str, options: CallOptions) -> dict[str, Any]:
+    # Build kwargs, conditionally including temperature for Azure compatibility
+    # Azure deployments may reject temperature parameter, so only pass when explicitly set
+    kwargs = options.request_kwargs()
+    kwargs["input"] = prompt
+    if settings.openai_temperature_float is not None:
+        kwargs["temperature"] = settings.openai_temperature_float
+    return kwargs
+
+
+def _create_response(prompt: str, options: CallOptions | None = None, *, kind: str = "extract") -> Any:
+    """Send one Responses API call after the budget check and record its token usage."""
+    with budgeted_call(prompt, options or CallOptions(model=settings.openai_model), kind=kind) as call:
+        started = time.monotonic()
+        response = client.responses.create(**_response_kwargs(prompt, call.options))
+        call.record(response)
+    # Sync calls are never hedged (a blocking request cannot be cancelled) but feed the latency stats
+    get_hedge_policy().latencies.record(call.options.model, estimate_tokens(prompt), time.monotonic() - started)
+    return response
+
+
+async def _create_response_async(prompt: str, options: CallOptions | None = None, *, kind: str = "extract") -> Any:
+    """
+    _create_response on the async client, hedged when it runs slow.
+
+    Once the call has taken longer than the hedge policy's latency percentile
+    for its size, a duplicate goes to the hedge deployment; the first answer
+    wins and the other request is cancelled.
+    """
+    options = options or CallOptions(model=settings.openai_model)
+    policy = get_hedge_policy()
+    delay = policy.hedge_delay(options, estimate_tokens(prompt))
+    started = time.monotonic()
+    primary = asyncio.ensure_future(_send_async(prompt, options, kind=kind))
+    if delay is None:
+        return await primary
+
+    tasks = {primary}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done or not policy.admit_hedge():
+            return await primary
+        logger.info(
+            "Hedging slow LLM call",
+            extra={"model": options.model, "kind": kind, "after_seconds": round(delay, 3)},
         )
-        text = text[:MAX_TRANSCRIPT_CHARS]
-        truncation_note = True
-    else:
-        truncation_note = False
+        hedge = asyncio.ensure_future(_send_async(prompt, policy.hedge_options(options), kind="hedge"))
+        tasks.add(hedge)
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is hedge:
+                        policy.record_win()
+                        # The primary it beat took at least this long; without this censored sample
+                        # the tracker sees only the winners, drifts low and hedges ever more
+                        _record_latency(options, prompt, started)
+                    return task.result()
+        # Both failed: report the original call's error
+        return primary.result()
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
 
-    logger.info(
-        "Extracting meeting model",
-        extra={"template_id": template.id, "transcript_length": len(text)},
+
+async def _send_async(prompt: str, options: CallOptions, *, kind: str) -> Any:
+    with budgeted_call(prompt, options, kind=kind) as call:
+        started = time.monotonic()
+        response = await async_client.responses.create(**_response_kwargs(prompt, call.options))
+        call.record(response)
+    _record_latency(call.options, prompt, started)
+    return response
+
+
+def _record_latency(options: CallOptions, prompt: str, started: float) -> None:
+    get_hedge_policy().latencies.record(options.model, estimate_tokens(prompt), time.monotonic() - started)
+
+
+def _request_model(prompt: str, model_type: type[ModelT], options: CallOptions | None = None) -> ModelT:
+    """
+    Send prompt to the LLM and validate the raw JSON string straight into model_type.
+
+    Parsing and validation happen in one pass in pydantic-core (no intermediate
+    dict). Only a JSON syntax error triggers the repair call; schema errors
+    propagate as ValidationError.
+    """
+    adapter = type_adapter(model_type)
+    raw_json = _extract_text_payload(_create_response(prompt, options))
+    parsed = _validate_or_none(adapter, raw_json)
+    if parsed is not None:
+        return parsed
+    return _validate_repaired(adapter, _repair_json(raw_json, prompt, options))
+
+
+async def _request_model_async(prompt: str, model_type: type[ModelT], options: CallOptions | None = None) -> ModelT:
+    """_request_model on the async client."""
+    adapter = type_adapter(model_type)
+    raw_json = _extract_text_payload(await _create_response_async(prompt, options))
+    parsed = _validate_or_none(adapter, raw_json)
+    if parsed is not None:
+        return parsed
+    return _validate_repaired(adapter, await _repair_json_async(raw_json, prompt, options))
+
+
+def _validate_or_none(adapter: TypeAdapter, raw_json: str) -> Any:
+    """Validate raw_json; None means it is not valid JSON and needs the repair call."""
+    try:
+        return adapter.validate_json(raw_json)
+    except ValidationError as exc:
+        if not _is_json_syntax_error(exc):
+            raise
+        logger.warning("Initial JSON parse failed, attempting repair")
+        return None
+
+
+def _validate_repaired(adapter: TypeAdapter, repaired: str) -> Any:
+    try:
+        return adapter.validate_json(repaired)
+    except ValidationError as exc:
+        if not _is_json_syntax_error(exc):
+            raise
+        logger.error("JSON repair failed", exc_info=exc)
+        raise HTTPException(
+            status_code=502, detail="LLM extraction failed: invalid JSON after repair"
+        ) from exc
+
+
+def _is_json_syntax_error(exc: ValidationError) -> bool:
+    return any(error["type"] == "json_invalid" for error in exc.errors())
+
+
+def _extract_parallel(
+    text: str,
+    meta: MeetingMeta,
+    template: TemplateSpec,
+    *,
+    was_truncated: bool,
+    speakers: SpeakerIndex | None = None,
+) -> MeetingModel:
+    """
+    Run the people call and one call per section group concurrently, then merge.
+
+    Each call only has to generate its own slice of the output, so wall-clock
+    time is bounded by the slowest slice rather than the sum of all of them.
+    """
+    jobs = _parallel_jobs(text, meta, template, was_truncated=was_truncated, speakers=speakers)
+    max_workers = max(1, min(settings.parallel_max_workers, len(jobs)))
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="extract") as pool:
+            futures = [
+                # Each job runs in a copy of this context so its calls count towards this request's usage
+                pool.submit(copy_context().run, _request_with_escalation, build, model_type, options, template)
+                for model_type, build, options in jobs
+            ]
+            results = [future.result() for future in futures]
+    except HTTPException:
+        raise
+    except Exception as exc:
+        _raise_parallel_failed(exc, template, len(jobs))
+    check = _parallel_check(template.extraction, results)
+    reasked = _reask_sections(text, meta, template, was_truncated, check)
+    return _parallel_result(meta, results, speakers, splice_sections(template.extraction, check, reasked))
+
+
+async def _extract_parallel_async(
+    text: str,
+    meta: MeetingMeta,
+    template: TemplateSpec,
+    *,
+    was_truncated: bool,
+    speakers: SpeakerIndex | None = None,
+) -> MeetingModel:
+    """_extract_parallel on the async client, with at most parallel_max_workers calls in flight."""
+    # Building the BM25 index for long transcripts is CPU work: keep it off the event loop
+    jobs = await asyncio.to_thread(
+        _parallel_jobs, text, meta, template, was_truncated=was_truncated, speakers=speakers
     )
-    prompt = build_prompt(text=text, meta=meta, extraction=template.extraction, was_truncated=truncation_note)
+    limit = asyncio.Semaphore(max(1, min(settings.parallel_max_workers, len(jobs))))
+
+    async def run(model_type: type[BaseModel], build: Callable[[], str], options: CallOptions) -> BaseModel:
+        async with limit:
+            return await _request_with_escalation_async(build, model_type, options, template)
 
     try:
-        # Build kwargs, conditionally including temperature for Azure compatibility
-        # Azure deployments may reject temperature parameter, so only pass when explicitly set
-        kwargs = {
-            "model": settings.openai_model,
-            "input": prompt,
-        }
-        if settings.openai_temperature_float is not None:
-            kwargs["temperature"] = settings.openai_temperature_float
-
-        response = client.responses.create(**kwargs)
-
-        raw_json = _extract_text_payload(response)
-        try:
-            data = json.loads(raw_json)
-        except json.JSONDecodeError:
-            logger.warning("Initial JSON parse failed, attempting repair")
-            repaired = _repair_json(raw_json, prompt)
-            try:
-                data = json.loads(repaired)
-            except json.JSONDecodeError as exc:
-                logger.error("JSON repair failed", exc_info=exc)
-                raise HTTPException(
-                    status_code=502, detail="LLM extraction failed: invalid JSON after repair"
-                ) from exc
-
-        meeting = MeetingModel.model_validate(data)
-        meeting.meta = meta
-        return meeting
+        results = await asyncio.gather(*(run(model_type, build, options) for model_type, build, options in jobs))
     except HTTPException:
         raise
     except Exception as exc:
-        logger.error(
-            "LLM extraction failed",
+        _raise_parallel_failed(exc, template, len(jobs))
+    check = _parallel_check(template.extraction, results)
+    reasked = await _reask_sections_async(text, meta, template, was_truncated, check)
+    return _parallel_result(meta, results, speakers, splice_sections(template.extraction, check, reasked))
+
+
+def _parallel_jobs(
+    text: str,
+    meta: MeetingMeta,
+    template: TemplateSpec,
+    *,
+    was_truncated: bool,
+    speakers: SpeakerIndex | None,
+) -> list[tuple[type[BaseModel], Callable[[], str], CallOptions]]:
+    """The people job plus one job per section group: (result type, prompt builder, call options)."""
+    extraction = template.extraction
+    transcript_chars = len(text)
+    # Prompts are built by the worker that sends them, so only the prompts
+    # currently in flight (at most parallel_max_workers) hold a copy of the transcript.
+    jobs: list[tuple[type[BaseModel], Callable[[], str], CallOptions]] = [
+        (
+            PeopleExtraction,
+            partial(build_people_prompt, text=text, meta=meta, was_truncated=was_truncated, speakers=speakers),
+            _call_options(template, "people", transcript_chars=transcript_chars),
+        )
+    ]
+    index = None
+    if settings.retrieval_min_chars and transcript_chars >= settings.retrieval_min_chars:
+        index = BM25Index.from_text(text)
+    for group in section_groups(extraction):
+        task = section_group_task(group, wants_dates=extraction.wants_dates)
+        excerpt = (
+            relevant_excerpt(index, group, settings.retrieval_section_token_budget) if index is not None else None
+        )
+        jobs.append(
+            (
+                SectionsExtraction,
+                partial(
+                    build_sections_prompt,
+                    text=excerpt if excerpt else text,
+                    meta=meta,
+                    extraction=extraction,
+                    sections=group,
+                    was_truncated=was_truncated,
+                    excerpted=bool(excerpt),
+                ),
+                _call_options(template, task, transcript_chars=transcript_chars),
+            )
+        )
+    return jobs
+
+
+def _parallel_check(extraction: TemplateExtractionSpec, results: list[BaseModel]) -> SectionCheck:
+    """Check the sections of every group call together, in job order."""
+    sections = [section for r in results if isinstance(r, SectionsExtraction) for section in r.sections]
+    return check_sections(sections, extraction)
+
+
+def _parallel_result(
+    meta: MeetingMeta,
+    results: list[BaseModel],
+    speakers: SpeakerIndex | None,
+    sections: list[Section],
+) -> MeetingModel:
+    people = next((r for r in results if isinstance(r, PeopleExtraction)), PeopleExtraction())
+    return MeetingModel(
+        meta=meta,
+        attendees=merge_speaker_attendees(speakers, people.speaker_companies, people.attendees),
+        apologies=people.apologies,
+        sections=sections,
+    )
+
+
+def _raise_parallel_failed(exc: Exception, template: TemplateSpec, calls: int) -> NoReturn:
+    logger.error(
+        "Parallel LLM extraction failed",
+        exc_info=exc,
+        extra={"template_id": template.id, "calls": calls},
+    )
+    raise HTTPException(status_code=502, detail="LLM extraction failed") from exc
+
+
+def _request_with_escalation(
+    build: Callable[[], str], model_type: type[ModelT], options: CallOptions, template: TemplateSpec
+) -> ModelT:
+    """
+    Build the prompt, then request and validate one partial result.
+
+    If a fast-model result cannot be parsed or validated, the call is retried
+    once on the strong model (see model_routing.escalation_options).
+    """
+    prompt = build()
+    try:
+        return _request_model(prompt, model_type, options)
+    except (HTTPException, ValidationError) as exc:
+        escalated = _escalation(template, options, exc)
+        if escalated is None:
+            raise
+        return _request_model(prompt, model_type, escalated)
+
+
+async def _request_with_escalation_async(
+    build: Callable[[], str], model_type: type[ModelT], options: CallOptions, template: TemplateSpec
+) -> ModelT:
+    """_request_with_escalation on the async client."""
+    prompt = build()
+    try:
+        return await _request_model_async(prompt, model_type, options)
+    except (HTTPException, ValidationError) as exc:
+        escalated = _escalation(template, options, exc)
+        if escalated is None:
+            raise
+        return await _request_model_async(prompt, model_type, escalated)
+
+
+def _escalation(template: TemplateSpec, options: CallOptions, exc: Exception) -> CallOptions | None:
+    if isinstance(exc, BudgetExceeded):
+        return None
+    escalated = escalation_options(template.routing, options)
+    if escalated is not None:
+        logger.warning(
+            "Fast model result invalid, escalating to strong model",
+            extra={"template_id": template.id, "from_model": options.model, "to_model": escalated.model},
             exc_info=exc,
-            extra={"template_id": template.id, "prompt_preview": prompt[:200]},
         )
-        raise HTTPException(status_code=502, detail="LLM extraction failed") from exc
+    return escalated
 
 
-def build_prompt(*, text: str, meta: MeetingMeta, extraction: TemplateExtractionSpec, was_truncated: bool = False) -> str:
+def _reask_sections(
+    text: str, meta: MeetingMeta, template: TemplateSpec, was_truncated: bool, check: SectionCheck
+) -> list[Section]:
+    """
+    Ask again for only the faulty sections, over their most relevant passages
+    when the transcript is long enough for retrieval.
+
+    The answer is spliced in by splice_sections; if this call fails too the
+    sections stay empty rather than failing the whole extraction.
+    """
+    if not check.faulty or not settings.section_reask:
+        return []
+    build, options = _reask_job(text, meta, template, was_truncated, check.faulty)
+    try:
+        return _request_with_escalation(build, SectionsExtraction, options, template).sections
+    except Exception as exc:
+        _log_reask_failed(exc, template, check)
+        return []
+
+
+async def _reask_sections_async(
+    text: str, meta: MeetingMeta, template: TemplateSpec, was_truncated: bool, check: SectionCheck
+) -> list[Section]:
+    """_reask_sections on the async client."""
+    if not check.faulty or not settings.section_reask:
+        return []
+    build, options = await asyncio.to_thread(_reask_job, text, meta, template, was_truncated, check.faulty)
+    try:
+        return (await _request_with_escalation_async(build, SectionsExtraction, options, template)).sections
+    except Exception as exc:
+        _log_reask_failed(exc, template, check)
+        return []
+
+
+def _reask_job(
+    text: str, meta: MeetingMeta, template: TemplateSpec, was_truncated: bool, faulty: list[TemplateSectionSpec]
+) -> tuple[Callable[[], str], CallOptions]:
+    extraction = template.extraction
+    excerpt = ""
+    # The index holds a tokenized copy of the transcript: low-memory mode sends the text itself
+    if settings.retrieval_min_chars and len(text) >= settings.retrieval_min_chars and not settings.low_memory:
+        excerpt = relevant_excerpt(BM25Index.from_text(text), faulty, settings.retrieval_section_token_budget)
+    logger.info(
+        "Re-asking faulty sections",
+        extra={"template_id": template.id, "codes": [spec.code for spec in faulty], "excerpt_length": len(excerpt)},
+    )
+    build = partial(
+        build_sections_prompt,
+        text=excerpt if excerpt else text,
+        meta=meta,
+        extraction=extraction,
+        sections=faulty,
+        was_truncated=was_truncated,
+        excerpted=bool(excerpt),
+    )
+    # A correction goes to the strong deployment even for sections first routed to the fast one
+    return build, _call_options(template, "sections", transcript_chars=len(text))
+
+
+def _call_options(template: TemplateSpec, task: str, *, transcript_chars: int) -> CallOptions:
+    """select_call_options, plus the template's compiled output schema when structured output is on."""
+    options = select_call_options(template.routing, task=task, transcript_chars=transcript_chars)
+    if settings.openai_structured_output and template.artifacts is not None:
+        # "dates" calls return sections too
+        schema = template.artifacts.output_schemas["sections" if task == "dates" else task]
+        options = options.model_copy(update={"output_schema": schema})
+    return options
+
+
+def _log_reask_failed(exc: Exception, template: TemplateSpec, check: SectionCheck) -> None:
+    logger.warning(
+        "Section re-ask failed; leaving sections empty",
+        exc_info=exc,
+        extra={"template_id": template.id, "codes": [spec.code for spec in check.faulty]},
+    )
+
+
+def section_groups(extraction: TemplateExtractionSpec) -> list[list[TemplateSectionSpec]]:
+    """
+    Split the predefined sections into the groups used by parallel extraction.
+
+    extraction.section_groups lists section codes that should share one call;
+    any section not mentioned there gets a call of its own.
+    """
+    by_code = {section.code: section for section in extraction.predefined_sections}
+    groups: list[list[TemplateSectionSpec]] = []
+    grouped: set[str] = set()
+    for codes in extraction.section_groups:
+        group = [by_code[code] for code in codes if code in by_code and code not in grouped]
+        grouped.update(section.code for section in group)
+        if group:
+            groups.append(group)
+    groups.extend([section] for section in extraction.predefined_sections if section.code not in grouped)
+    return groups
+
+
+def merge_speaker_attendees(
+    speakers: SpeakerIndex | None,
+    companies: dict[str, str],
+    attendees: list[Person],
+) -> list[Person]:
+    """
+    Known speakers first (with any companies the LLM found), then attendees the
+    LLM listed who are not already known speakers.
+    """
+    if speakers is None:
+        return attendees
+    merged = speakers.as_attendees(companies)
+    known = {person.name.casefold() for person in merged}
+    merged.extend(person for person in attendees if person.name.casefold() not in known)
+    return merged
+
+
+class PromptParts(BaseModel):
+    """Request-independent blocks of the single-call prompt for one template."""
+
+    template_sections: str
+    tasks: str
+    tasks_truncated: str
+    output_schema: str
+
+
+def build_prompt(
+    *,
+    text: str,
+    meta: MeetingMeta,
+    extraction: TemplateExtractionSpec,
+    was_truncated: bool = False,
+    parts: PromptParts | None = None,
+    speakers: SpeakerIndex | None = None,
+) -> str:
     """
     Build a structured prompt for LLM extraction.
 
@@ -97,44 +692,40 @@ def build_prompt(*, text: str, meta: MeetingMeta, extraction: TemplateExtraction
     3. TASKS: numbered instructions for extraction
     4. OUTPUT SCHEMA: literal JSON example matching MeetingModel
     5. TRANSCRIPT: the actual meeting transcript text
+
+    parts are the precompiled template blocks (2-4); they are compiled on the
+    fly when the template registry has not provided them. When speakers are
+    known, a KNOWN SPEAKERS block follows the metadata.
     """
-    # USER-PROVIDED METADATA
-    metadata_section = dedent(
-        f"""
-        === USER-PROVIDED METADATA ===
-        These values must be copied EXACTLY into the output JSON meta field. Do not modify or reformat them.
+    parts = parts or compile_prompt_parts(extraction)
+    return _join_prompt(
+        [
+            _metadata_block(meta),
+            *([_known_speakers_block(speakers)] if speakers else []),
+            parts.template_sections,
+            parts.tasks_truncated if was_truncated else parts.tasks,
+            parts.output_schema,
+        ],
+        text,
+    )
 
-        project: {meta.project}
-        job_min_no: {meta.job_min_no}
-        description: {meta.description}
-        date: {meta.date}
-        time: {meta.time}
-        location: {meta.location}
-        """
-    ).strip()
 
-    # TEMPLATE SECTIONS
-    sections_list = "\n".join(
-        f"  {section.code}: {section.title}"
-        + (f" (aliases: {', '.join(section.aliases)})" if section.aliases else "")
-        for section in extraction.predefined_sections
+def compile_prompt_parts(extraction: TemplateExtractionSpec) -> PromptParts:
+    return PromptParts(
+        template_sections=_template_sections_block(extraction.predefined_sections),
+        tasks=_full_tasks_block(was_truncated=False),
+        tasks_truncated=_full_tasks_block(was_truncated=True),
+        output_schema=_full_output_schema_block(),
     )
-    template_sections = dedent(
-        f"""
-        === TEMPLATE SECTIONS ===
-        You must use exactly these section codes and titles in your output. Include all sections even if empty.
 
-        {sections_list}
-        """
-    ).strip()
 
-    # TASKS
+def _full_tasks_block(was_truncated: bool) -> str:
     truncation_warning = (
         "\n  Note: The transcript was truncated for length. Only the visible portion was available."
         if was_truncated
         else ""
     )
-    tasks = dedent(
+    return dedent(
         f"""
         === TASKS ===
         1. Extract attendees and apologies from the transcript. Use empty strings for missing initials or company.
@@ -147,8 +738,10 @@ def build_prompt(*, text: str, meta: MeetingMeta, extraction: TemplateExtraction
         """
     ).strip()
 
-    # OUTPUT SCHEMA with literal JSON example
-    output_schema = dedent(
+
+def _full_output_schema_block() -> str:
+    # Literal JSON example matching MeetingModel
+    return dedent(
         """
         === OUTPUT SCHEMA ===
         Your output MUST be a single JSON object matching this exact structure. Do not include any extra fields or top-level keys.
@@ -216,17 +809,181 @@ def build_prompt(*, text: str, meta: MeetingMeta, extraction: TemplateExtraction
         """
     ).strip()
 
-    # TRANSCRIPT
-    transcript_section = dedent(
+
+def build_people_prompt(
+    *,
+    text: str,
+    meta: MeetingMeta,
+    was_truncated: bool = False,
+    speakers: SpeakerIndex | None = None,
+) -> str:
+    """Build the narrow prompt used by parallel extraction for attendees and apologies."""
+    truncation_warning = (
+        "\n  Note: The transcript was truncated for length. Only the visible portion was available."
+        if was_truncated
+        else ""
+    )
+    tasks = dedent(
+        f"""
+        === TASKS ===
+        1. Extract attendees and apologies from the transcript. Use empty strings for missing initials or company.
+        2. Do not invent information. If unsure, use empty strings ("").{truncation_warning}
+        """
+    ).strip()
+    example: dict[str, Any] = {
+        "attendees": [{"name": "John Smith", "initials": "JS", "company": "Contractor Ltd"}],
+        "apologies": [{"name": "Mike Johnson", "initials": "MJ", "company": ""}],
+    }
+    if speakers:
+        example["speaker_companies"] = {"Jane Doe": "Consultant Co"}
+    output_schema = "\n".join(
+        [
+            "=== OUTPUT SCHEMA ===",
+            "Your output MUST be a single JSON object with exactly these top-level keys and nothing else.",
+            "",
+            "Example output (with dummy values):",
+            json.dumps(example, indent=2),
+        ]
+    )
+    blocks = [_metadata_block(meta)]
+    if speakers:
+        blocks.append(_known_speakers_block(speakers))
+    return _join_prompt([*blocks, tasks, output_schema], text)
+
+
+def build_sections_prompt(
+    *,
+    text: str,
+    meta: MeetingMeta,
+    extraction: TemplateExtractionSpec,
+    sections: list[TemplateSectionSpec],
+    was_truncated: bool = False,
+    excerpted: bool = False,
+) -> str:
+    """
+    Build the narrow prompt used by parallel extraction for a group of sections.
+
+    excerpted marks text as retrieved passages rather than the full transcript.
+    """
+    truncation_warning = (
+        "\n  Note: The transcript was truncated for length. Only the visible portion was available."
+        if was_truncated
+        else ""
+    )
+    if excerpted:
+        truncation_warning += (
+            "\n  Note: Only the transcript passages most relevant to these sections are shown, separated by [...]."
+        )
+    action_task = (
+        '2. For actions: if an owner or due_date is not mentioned, use an empty string (""). Do not guess.'
+        if extraction.wants_actions
+        else '2. Leave "actions" as an empty array.'
+    )
+    dates_task = (
+        '3. For contract dates: extract from sections with "contract" in the title, otherwise use null.'
+        if extraction.wants_dates
+        else '3. Set "dates" to null.'
+    )
+    tasks = dedent(
+        f"""
+        === TASKS ===
+        1. For each section above, extract notes and actions from the transcript. Ignore other topics.
+        {action_task}
+        {dates_task}
+        4. Use exactly the given section codes and titles - do not invent new sections.
+        5. Do not invent information. If unsure, use empty strings ("").{truncation_warning}
+        """
+    ).strip()
+    output_schema = dedent(
+        """
+        === OUTPUT SCHEMA ===
+        Your output MUST be a single JSON object with a single "sections" key. Include every section listed above.
+
+        Example output (with dummy values):
+        {
+          "sections": [
+            {
+              "code": "1",
+              "title": "Introductions",
+              "notes": "Team introductions completed",
+              "actions": [
+                {"action": "Send updated drawings", "owner": "John", "due_date": "21/06/2025"}
+              ],
+              "dates": null
+            }
+          ]
+        }
+
+        When "dates" is not null it is an object with contract_commencement, section1_completion,
+        section2_completion, section3_completion and practical_completion (all strings).
+        """
+    ).strip()
+    return _join_prompt([_metadata_block(meta), _template_sections_block(sections), tasks, output_schema], text)
+
+
+def _metadata_block(meta: MeetingMeta) -> str:
+    return dedent(
+        f"""
+        === USER-PROVIDED METADATA ===
+        These values must be copied EXACTLY into the output JSON meta field. Do not modify or reformat them.
+
+        project: {meta.project}
+        job_min_no: {meta.job_min_no}
+        description: {meta.description}
+        date: {meta.date}
+        time: {meta.time}
+        location: {meta.location}
+        """
+    ).strip()
+
+
+def _known_speakers_block(speakers: SpeakerIndex) -> str:
+    speaker_list = "\n".join(f"  - {speaker.name} ({speaker.initials})" for speaker in speakers.speakers)
+    return "\n".join(
+        [
+            "=== KNOWN SPEAKERS ===",
+            "These people spoke in the meeting and are already recorded as attendees:",
+            speaker_list,
+            "",
+            'Do NOT repeat them in "attendees"; only list people who were present but never spoke.',
+            'Add a top-level "speaker_companies" object mapping a known speaker\'s name to their company,',
+            "only where the transcript states it.",
+        ]
+    )
+
+
+def _template_sections_block(sections: list[TemplateSectionSpec]) -> str:
+    sections_list = "\n".join(
+        f"  {section.code}: {section.title}"
+        + (f" (aliases: {', '.join(section.aliases)})" if section.aliases else "")
+        for section in sections
+    )
+    return dedent(
+        f"""
+        === TEMPLATE SECTIONS ===
+        You must use exactly these section codes and titles in your output. Include all sections even if empty.
+
+        {sections_list}
+        """
+    ).strip()
+
+
+def _join_prompt(blocks: list[str], text: str) -> str:
+    """Join the instruction blocks and the transcript block into the final prompt."""
+    if settings.low_memory:
+        # A single allocation for the whole prompt: no dedent/strip copies of the transcript
+        return "".join(["\n\n".join(blocks), "\n\n", TRANSCRIPT_HEADER, "\n", text])
+    return "\n\n".join([*blocks, _transcript_block(text)])
+
+
+def _transcript_block(text: str) -> str:
+    return dedent(
         f"""
         === TRANSCRIPT ===
         {text}
         """
     ).strip()
 
-    # Combine all sections
-    return "\n\n".join([metadata_section, template_sections, tasks, output_schema, transcript_section])
-
 
 def _extract_text_payload(response: Any) -> str:
     """
@@ -260,31 +1017,55 @@ def _extract_text_payload(response: Any) -> str:
     raise ValueError("Could not extract text payload from Responses API response")
 
 
-def _repair_json(bad_json: str, prompt: str) -> str:
-    repair_prompt = dedent(
-        f"""
-        The following string was intended to be valid JSON but was not parsable.
-        Return only valid JSON that matches the requested schema. Do not include commentary.
-        Original request:
-        {prompt}
+def _repair_json(bad_json: str, prompt: str, options: CallOptions | None = None) -> str:
+    try:
+        response = _create_response(_repair_prompt(bad_json, prompt), options, kind="repair")
+        return _extract_text_payload(response)
+    except BudgetExceeded:
+        raise
+    except Exception as exc:
+        logger.error("JSON repair LLM call failed", exc_info=exc)
+        raise HTTPException(status_code=502, detail="LLM extraction failed: repair call failed") from exc
 
-        Broken JSON:
-        {bad_json}
-        """
-    )
 
+async def _repair_json_async(bad_json: str, prompt: str, options: CallOptions | None = None) -> str:
     try:
-        # Same reasoning as above: avoid explicit `temperature` for maximum
-        # compatibility with Azure Responses deployments.
-        kwargs = {
-            "model": settings.openai_model,
-            "input": repair_prompt,
-        }
-        if settings.openai_temperature_float is not None:
-            kwargs["temperature"] = settings.openai_temperature_float
-
-        response = client.responses.create(**kwargs)
+        response = await _create_response_async(_repair_prompt(bad_json, prompt), options, kind="repair")
         return _extract_text_payload(response)
+    except BudgetExceeded:
+        raise
     except Exception as exc:
         logger.error("JSON repair LLM call failed", exc_info=exc)
         raise HTTPException(status_code=502, detail="LLM extraction failed: repair call failed") from exc
+
+
+def _repair_prompt(bad_json: str, prompt: str) -> str:
+    if settings.low_memory:
+        # The schema and rules are all the repair needs: leave the transcript out
+        # instead of holding a second full copy of it (and paying for its tokens again).
+        header = prompt.find(f"\n\n{TRANSCRIPT_HEADER}")
+        instructions = prompt[:header] if header != -1 else prompt
+        repair_prompt = "".join(
+            [
+                "The following string was intended to be valid JSON but was not parsable.\n",
+                "Return only valid JSON that matches the requested schema. Do not include commentary.\n",
+                "Original request (transcript omitted):\n",
+                instructions,
+                "\n\nBroken JSON:\n",
+                bad_json,
+            ]
+        )
+    else:
+        repair_prompt = dedent(
+            f"""
+            The following string was intended to be valid JSON but was not parsable.
+            Return only valid JSON that matches the requested schema. Do not include commentary.
+            Original request:
+            {prompt}
+
+            Broken JSON:
+            {bad_json}
+            """
+        )
+    return repair_prompt
+
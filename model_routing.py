@@ -0,0 +1,88 @@
+from typing import Any
+
+from pydantic import BaseModel
+
+from config import settings
+from models import RoutingTier, TemplateRoutingSpec, TemplateSectionSpec
+
+
+# Extraction tasks that can be routed independently.
+# "full" is the single-call extraction of the whole MeetingModel.
+ROUTING_TASKS = ("full", "people", "dates", "sections")
+
+
+class CallOptions(BaseModel):
+    """Deployment and generation settings for one Responses API call."""
+
+    model: str
+    reasoning_effort: str | None = None
+    max_output_tokens: int | None = None
+    # JSON schema the output must follow (structured output); None leaves the format to the prompt
+    output_schema: dict[str, Any] | None = None
+
+    def request_kwargs(self) -> dict:
+        kwargs: dict = {"model": self.model}
+        if self.reasoning_effort:
+            kwargs["reasoning"] = {"effort": self.reasoning_effort}
+        if self.max_output_tokens:
+            kwargs["max_output_tokens"] = self.max_output_tokens
+        if self.output_schema is not None:
+            kwargs["text"] = {
+                "format": {
+                    "type": "json_schema",
+                    "name": self.output_schema.get("title", "output"),
+                    "schema": self.output_schema,
+                    "strict": False,
+                }
+            }
+        return kwargs
+
+
+def strong_model(routing: TemplateRoutingSpec) -> str:
+    return routing.strong_model or settings.openai_model
+
+
+def fast_model(routing: TemplateRoutingSpec) -> str:
+    return routing.fast_model or settings.openai_fast_model or strong_model(routing)
+
+
+def select_tier(routing: TemplateRoutingSpec, transcript_chars: int) -> RoutingTier:
+    for tier in routing.size_tiers:
+        if tier.max_chars is None or transcript_chars <= tier.max_chars:
+            return tier
+    return RoutingTier()
+
+
+def select_call_options(routing: TemplateRoutingSpec, *, task: str, transcript_chars: int) -> CallOptions:
+    """
+    Choose the deployment, reasoning effort and output cap for a task.
+
+    Easy tasks listed in routing.fast_tasks go to the fast deployment; the
+    transcript size picks the tier that sets effort and output cap.
+    """
+    if task not in ROUTING_TASKS:
+        raise ValueError(f"Unknown routing task: {task}")
+
+    tier = select_tier(routing, transcript_chars)
+    model = fast_model(routing) if task in routing.fast_tasks else strong_model(routing)
+    return CallOptions(
+        model=model,
+        reasoning_effort=tier.reasoning_effort,
+        max_output_tokens=tier.max_output_tokens,
+    )
+
+
+def escalation_options(routing: TemplateRoutingSpec, options: CallOptions) -> CallOptions | None:
+    """Return the strong-model options to retry with, or None if no escalation applies."""
+    strong = strong_model(routing)
+    if not routing.escalate_on_invalid or options.model == strong:
+        return None
+    return options.model_copy(update={"model": strong})
+
+
+def section_group_task(sections: list[TemplateSectionSpec], *, wants_dates: bool) -> str:
+    """A group made only of contract-dates sections is an easy "dates" task."""
+    # Same heuristic as renderer._extract_contract_dates
+    if wants_dates and sections and all("contract" in section.title.lower() for section in sections):
+        return "dates"
+    return "sections"
@@ -1,4 +1,7 @@
-from pydantic import BaseModel, Field
+from functools import lru_cache
+from typing import Any
+
+from pydantic import BaseModel, Field, PrivateAttr, TypeAdapter
 
 
 class MeetingMeta(BaseModel):
@@ -45,6 +48,52 @@ class MeetingModel(BaseModel):
     sections: list[Section] = Field(default_factory=list)
 
 
+class SpeakerStats(BaseModel):
+    name: str
+    initials: str = ""
+    turns: int = 0
+    talk_seconds: float = 0.0
+
+
+class SpeakerIndex(BaseModel):
+    """Distinct speakers found while loading a transcript, in order of first appearance."""
+
+    speakers: list[SpeakerStats] = Field(default_factory=list)
+
+    def as_attendees(self, companies: dict[str, str] | None = None) -> list[Person]:
+        companies = companies or {}
+        return [
+            Person(name=speaker.name, initials=speaker.initials, company=companies.get(speaker.name, ""))
+            for speaker in self.speakers
+        ]
+
+
+class LoadedTranscript(BaseModel):
+    text: str
+    speakers: SpeakerIndex = Field(default_factory=SpeakerIndex)
+
+
+class PeopleExtraction(BaseModel):
+    """Partial result of the people call in parallel extraction."""
+
+    attendees: list[Person] = Field(default_factory=list)
+    apologies: list[Person] = Field(default_factory=list)
+    # Companies for speakers pre-filled from the SpeakerIndex, keyed by speaker name
+    speaker_companies: dict[str, str] = Field(default_factory=dict)
+
+
+class MeetingExtraction(MeetingModel):
+    """Single-call LLM output: a MeetingModel plus companies for known speakers."""
+
+    speaker_companies: dict[str, str] = Field(default_factory=dict)
+
+
+class SectionsExtraction(BaseModel):
+    """Partial result of one section-group call in parallel extraction."""
+
+    sections: list[Section] = Field(default_factory=list)
+
+
 class TemplateSectionSpec(BaseModel):
     code: str
     title: str
@@ -55,6 +104,34 @@ class TemplateExtractionSpec(BaseModel):
     predefined_sections: list[TemplateSectionSpec]
     wants_actions: bool = True
     wants_dates: bool = False
+    # Section codes that share one LLM call in parallel extraction mode.
+    # Sections not listed here are extracted by a call of their own.
+    section_groups: list[list[str]] = Field(default_factory=list)
+
+
+class RoutingTier(BaseModel):
+    """Reasoning effort and output cap for transcripts up to max_chars long."""
+
+    max_chars: int | None = None  # None = no upper bound
+    reasoning_effort: str | None = None  # "minimal" | "low" | "medium" | "high"
+    max_output_tokens: int | None = None
+
+
+class TemplateRoutingSpec(BaseModel):
+    """
+    Per-template model cascade.
+
+    Tasks listed in fast_tasks ("people", "dates") go to the fast deployment;
+    everything else goes to the strong one. None means fall back to the
+    deployments configured in settings.
+    """
+
+    fast_model: str | None = None
+    strong_model: str | None = None
+    fast_tasks: list[str] = Field(default_factory=lambda: ["people", "dates"])
+    escalate_on_invalid: bool = True
+    # Checked in order; the first tier whose max_chars covers the transcript wins.
+    size_tiers: list[RoutingTier] = Field(default_factory=list)
 
 
 class TemplateBindingSpec(BaseModel):
@@ -63,7 +140,25 @@ class TemplateBindingSpec(BaseModel):
 
 class TemplateSpec(BaseModel):
     id: str
+    version: str = "1"
     label: str
     extraction: TemplateExtractionSpec
     binding: TemplateBindingSpec
     docx_path: str
+    routing: TemplateRoutingSpec = Field(default_factory=TemplateRoutingSpec)
+
+    # Precomputed by template_registry at load time (template_registry.TemplateArtifacts)
+    _artifacts: Any = PrivateAttr(default=None)
+
+    @property
+    def artifacts(self) -> Any:
+        return self._artifacts
+
+    def attach_artifacts(self, artifacts: Any) -> None:
+        self._artifacts = artifacts
+
+
+@lru_cache(maxsize=None)
+def type_adapter(tp: Any) -> TypeAdapter:
+    """Cached TypeAdapter so validators and serializers are built once per type."""
+    return TypeAdapter(tp)
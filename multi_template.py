@@ -0,0 +1,100 @@
+import asyncio
+
+from fastapi import HTTPException
+
+from models import MeetingModel, Section, TemplateExtractionSpec, TemplateSectionSpec, TemplateSpec
+from render_pool import render_async
+from section_validation import SectionIndex, check_sections, normalize_name
+
+
+def combine_templates(templates: list[TemplateSpec]) -> TemplateSpec:
+    """
+    One extraction template over the union of the templates' sections, so a
+    single extraction serves them all.
+
+    Templates are compatible when every section code they share names the same
+    section: the titles or aliases overlap. The union keeps the first
+    template's title and collects every other name as an alias, so sections
+    are recognised whichever template's wording the LLM uses. Routing and
+    section groups come from the templates in order; actions and dates are
+    extracted if any template wants them. Raises 400 for incompatible templates.
+    """
+    if len(templates) == 1:
+        return templates[0]
+    sections: dict[str, TemplateSectionSpec] = {}
+    owners: dict[str, str] = {}
+    for template in templates:
+        for spec in template.extraction.predefined_sections:
+            code = normalize_name(spec.code)
+            current = sections.get(code)
+            if current is None:
+                sections[code] = spec.model_copy(deep=True)
+                owners[code] = template.id
+                continue
+            names = {normalize_name(name) for name in (spec.title, *spec.aliases)}
+            if not names & {normalize_name(name) for name in (current.title, *current.aliases)}:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Templates {owners[code]} and {template.id} use section {spec.code} for different sections",
+                )
+            known = {normalize_name(name) for name in (current.title, *current.aliases)}
+            current.aliases += [name for name in (spec.title, *spec.aliases) if normalize_name(name) not in known]
+
+    grouped: set[str] = set()
+    groups = []
+    for template in templates:
+        for group in template.extraction.section_groups:
+            group = [code for code in group if normalize_name(code) not in grouped]
+            grouped.update(normalize_name(code) for code in group)
+            if group:
+                groups.append(group)
+
+    combined = templates[0].model_copy(
+        update={
+            "id": "+".join(template.id for template in templates),
+            "version": "+".join(template.version for template in templates),
+            "label": " + ".join(template.label for template in templates),
+            "extraction": TemplateExtractionSpec(
+                predefined_sections=list(sections.values()),
+                wants_actions=any(template.extraction.wants_actions for template in templates),
+                wants_dates=any(template.extraction.wants_dates for template in templates),
+                section_groups=groups,
+            ),
+        }
+    )
+    # The first template's precompiled prompt parts describe only its own sections
+    combined.attach_artifacts(None)
+    return combined
+
+
+def project_meeting(meeting: MeetingModel, template: TemplateSpec, combined: TemplateSpec) -> MeetingModel:
+    """
+    The meeting as template would have it: its sections in its order with its
+    codes and titles, without actions or dates it does not want. Extra
+    sections that match no template of the combination are kept, as a
+    single-template extraction keeps them.
+    """
+    extraction = template.extraction
+    check = check_sections(meeting.sections, extraction)
+    union = SectionIndex(combined.extraction)
+    sections = [
+        check.found.get(spec.code) or Section(code=spec.code, title=spec.title)
+        for spec in extraction.predefined_sections
+    ] + [section for section in check.extras if union.resolve(section) is None]
+    update = {}
+    if not extraction.wants_actions:
+        update["actions"] = []
+    if not extraction.wants_dates:
+        update["dates"] = None
+    if update:
+        sections = [section.model_copy(update=update) for section in sections]
+    return meeting.model_copy(update={"sections": sections})
+
+
+async def render_projections(
+    meeting: MeetingModel, templates: list[TemplateSpec], combined: TemplateSpec
+) -> list[tuple[TemplateSpec, MeetingModel, bytes]]:
+    """Project the meeting onto each template and render them concurrently: (template, minutes, DOCX) each."""
+    projected = [project_meeting(meeting, template, combined) for template in templates]
+    documents = await asyncio.gather(*(render_async(t, m) for t, m in zip(templates, projected)))
+    return list(zip(templates, projected, documents))
@@ -1,16 +1,30 @@
 import base64
 import io
 import logging
+import time
 import uuid
+from contextlib import asynccontextmanager
+from datetime import date
 
-from fastapi import FastAPI, File, Form, UploadFile
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
 
-from llm_extractor import extract_meeting_model
-from models import MeetingMeta, MeetingModel
-from renderer import render_docx
-from template_registry import get_template
-from transcript_loader import load_transcript
+from cancellation import CLIENT_CLOSED_REQUEST, ClientDisconnected, cancel_on_disconnect
+from estimate import TranscriptEstimate, estimate_transcript, job_timings
+from hedging import get_hedge_policy
+from json_codec import model_json, multi_transform_response_body, transform_response_body
+from llm_extractor import extract_meeting_model_async
+from models import MeetingMeta, MeetingModel, TemplateSpec
+from multi_template import combine_templates, render_projections
+from render_cache import get_render_cache
+from render_pool import render_async
+from results_store import export_zip, get_result_store, project_dir_name, store_result
+from search_index import OpenAction, SearchHit, get_search_index, index_result
+from template_registry import get_template, start_hot_reload
+from tokens import estimate_tokens
+from transcript_loader import load_transcript_with_speakers
+from usage import UsageReport, ledger, track_usage
 
 # Configure basic logging
 logging.basicConfig(
@@ -19,23 +33,67 @@ logging.basicConfig(
 )
 
 
-app = FastAPI(title="Meeting Transcript to DOCX")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_hot_reload()
+    yield
 
 
-class TransformResponse(JSONResponse):
+app = FastAPI(title="Meeting Transcript to DOCX", lifespan=lifespan)
+
+
+class TransformResponse(Response):
     media_type = "application/json"
 
-    def __init__(self, *, request_id: str, minutes: MeetingModel, docx_bytes: bytes):
-        content = {
-            "request_id": request_id,
-            "minutes": minutes.model_dump(),
-            "docx_base64": base64.b64encode(docx_bytes).decode("ascii"),
-        }
+    def __init__(self, *, request_id: str, minutes: MeetingModel, docx_bytes: bytes, usage: UsageReport):
+        content = transform_response_body(
+            request_id=request_id,
+            minutes_json=model_json(minutes),
+            docx_base64=base64.b64encode(docx_bytes).decode("ascii"),
+            usage_json=model_json(usage),
+        )
         super().__init__(content=content)
 
 
+async def _transform(
+    template: TemplateSpec, meta: MeetingMeta, file: UploadFile
+) -> tuple[MeetingModel, bytes, UsageReport]:
+    file_bytes = await file.read()
+    started = time.monotonic()
+    transcript = await run_in_threadpool(load_transcript_with_speakers, file_bytes, file.filename)
+    transcript_tokens = estimate_tokens(transcript.text)
+
+    with track_usage(project=meta.project, template_id=template.id) as usage:
+        meeting = await extract_meeting_model_async(transcript.text, meta, template, speakers=transcript.speakers)
+    docx_bytes = await render_async(template, meeting)
+    record = await run_in_threadpool(store_result, template, meeting, docx_bytes)
+    await run_in_threadpool(index_result, record, meeting)
+    job_timings.record(transcript_tokens, time.monotonic() - started)
+    return meeting, docx_bytes, usage.report()
+
+
+async def _transform_multi(
+    templates: list[TemplateSpec], meta: MeetingMeta, file: UploadFile
+) -> tuple[MeetingModel, list[tuple[TemplateSpec, MeetingModel, bytes]], UsageReport]:
+    combined = combine_templates(templates)
+    file_bytes = await file.read()
+    started = time.monotonic()
+    transcript = await run_in_threadpool(load_transcript_with_speakers, file_bytes, file.filename)
+    transcript_tokens = estimate_tokens(transcript.text)
+
+    with track_usage(project=meta.project, template_id=combined.id) as usage:
+        meeting = await extract_meeting_model_async(transcript.text, meta, combined, speakers=transcript.speakers)
+    documents = await render_projections(meeting, templates, combined)
+    for template, projected, docx_bytes in documents:
+        record = await run_in_threadpool(store_result, template, projected, docx_bytes)
+        await run_in_threadpool(index_result, record, projected)
+    job_timings.record(transcript_tokens, time.monotonic() - started)
+    return meeting, documents, usage.report()
+
+
 @app.post("/transform")
 async def transform(
+    request: Request,
     template_id: str = Form(...),
     project: str = Form(...),
     job_min_no: str = Form(...),
@@ -52,9 +110,6 @@ async def transform(
     request_id = str(uuid.uuid4())
     template = get_template(template_id)
 
-    file_bytes = await file.read()
-    text = load_transcript(file_bytes, file.filename)
-
     meta = MeetingMeta(
         project=project,
         job_min_no=job_min_no,
@@ -64,14 +119,17 @@ async def transform(
         location=location,
     )
 
-    meeting = extract_meeting_model(text, meta, template)
-    docx_bytes = render_docx(template, meeting)
+    try:
+        meeting, docx_bytes, usage = await cancel_on_disconnect(request, _transform(template, meta, file))
+    except ClientDisconnected:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
 
-    return TransformResponse(request_id=request_id, minutes=meeting, docx_bytes=docx_bytes)
+    return TransformResponse(request_id=request_id, minutes=meeting, docx_bytes=docx_bytes, usage=usage)
 
 
 @app.post("/transform/download")
 async def transform_download(
+    request: Request,
     template_id: str = Form(...),
     project: str = Form(...),
     job_min_no: str = Form(...),
@@ -87,9 +145,6 @@ async def transform_download(
     """
     template = get_template(template_id)
 
-    file_bytes = await file.read()
-    text = load_transcript(file_bytes, file.filename)
-
     meta = MeetingMeta(
         project=project,
         job_min_no=job_min_no,
@@ -99,8 +154,10 @@ async def transform_download(
         location=location,
     )
 
-    meeting = extract_meeting_model(text, meta, template)
-    docx_bytes = render_docx(template, meeting)
+    try:
+        meeting, docx_bytes, _ = await cancel_on_disconnect(request, _transform(template, meta, file))
+    except ClientDisconnected:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
 
     filename = f"meeting_minutes_{meeting.meta.date.replace('/', '-')}.docx"
     return StreamingResponse(
@@ -110,6 +167,125 @@ async def transform_download(
     )
 
 
+@app.post("/transform/multi")
+async def transform_multi(
+    request: Request,
+    template_ids: list[str] = Form(...),
+    project: str = Form(...),
+    job_min_no: str = Form(...),
+    description: str = Form("Progress Meeting"),
+    date: str = Form(...),
+    time: str = Form(...),
+    location: str = Form(...),
+    file: UploadFile = File(...),
+):
+    """
+    /transform for several templates (template_ids repeated): one LLM
+    extraction over the union of their sections, then one DOCX per template.
+    The templates must agree on every section code they share.
+    """
+    request_id = str(uuid.uuid4())
+    templates = [get_template(template_id) for template_id in dict.fromkeys(template_ids)]
+
+    meta = MeetingMeta(
+        project=project,
+        job_min_no=job_min_no,
+        description=description,
+        date=date,
+        time=time,
+        location=location,
+    )
+
+    try:
+        meeting, documents, usage = await cancel_on_disconnect(request, _transform_multi(templates, meta, file))
+    except ClientDisconnected:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
+
+    content = multi_transform_response_body(
+        request_id=request_id,
+        minutes_json=model_json(meeting),
+        usage_json=model_json(usage),
+        documents=[
+            (template.id, model_json(projected), base64.b64encode(docx_bytes).decode("ascii"))
+            for template, projected, docx_bytes in documents
+        ],
+    )
+    return Response(content=content, media_type="application/json")
+
+
+@app.post("/estimate")
+async def estimate(
+    template_id: str = Form(...),
+    project: str = Form(""),
+    job_min_no: str = Form(""),
+    description: str = Form("Progress Meeting"),
+    date: str = Form(""),
+    time: str = Form(""),
+    location: str = Form(""),
+    file: UploadFile = File(...),
+) -> TranscriptEstimate:
+    """
+    Preflight for /transform with the same form: transcript size, whether it
+    would be truncated, the LLM calls it would make, their cost and the
+    expected duration. The LLM is not called.
+    """
+    template = get_template(template_id)
+    meta = MeetingMeta(
+        project=project,
+        job_min_no=job_min_no,
+        description=description,
+        date=date,
+        time=time,
+        location=location,
+    )
+    file_bytes = await file.read()
+    return await run_in_threadpool(estimate_transcript, file_bytes, file.filename, meta, template)
+
+
+@app.get("/export")
+async def export_project(project: str, since: date | None = None, until: date | None = None):
+    """
+    Every stored result of a project (minutes JSON and DOCX), optionally
+    limited to those created between since and until, as one streamed ZIP.
+    """
+    store = get_result_store()
+    if store is None:
+        raise HTTPException(status_code=404, detail="Result storage is not enabled")
+    records = await run_in_threadpool(store.list, project, since=since, until=until)
+    if not records:
+        raise HTTPException(status_code=404, detail="No stored results for project")
+
+    return StreamingResponse(
+        content=export_zip(store, records),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename={project_dir_name(project)}.zip"},
+    )
+
+
+@app.get("/search")
+async def search_minutes(q: str, project: str | None = None, limit: int = 20) -> list[SearchHit]:
+    """Full-text search over stored minutes: section notes, actions, owners and attendees."""
+    index = get_search_index()
+    if index is None:
+        raise HTTPException(status_code=404, detail="Search is not enabled")
+    return await run_in_threadpool(index.search, q, project=project, limit=min(max(limit, 1), 100))
+
+
+@app.get("/actions/open")
+async def open_actions(owner: str | None = None, project: str | None = None) -> dict[str, list[OpenAction]]:
+    """Open actions (those in each project's latest minutes) grouped by owner."""
+    index = get_search_index()
+    if index is None:
+        raise HTTPException(status_code=404, detail="Search is not enabled")
+    return await run_in_threadpool(index.open_actions, owner=owner, project=project)
+
+
+@app.get("/usage")
+async def usage_summary(day: str | None = None) -> dict:
+    """Token usage in this process for a UTC day (default today), by project, template and deployment."""
+    return {"usage": ledger.summary(day), "cancellations": ledger.cancellations(day)}
+
+
 @app.get("/health")
 async def health() -> dict:
     """
@@ -125,4 +301,9 @@ async def health() -> dict:
     # Validate default template can be loaded
     _ = get_template("progress_minutes_v1")
 
-    return {"status": "ok"}
+    cache = get_render_cache()
+    return {
+        "status": "ok",
+        "render_cache": cache.stats() if cache is not None else None,
+        "hedging": get_hedge_policy().stats(),
+    }
@@ -0,0 +1,179 @@
+import asyncio
+import base64
+import logging
+from typing import Any, Awaitable, Callable
+
+from checkpoints import JobCheckpoints
+from json_codec import model_json
+from llm_extractor import extract_meeting_model_async
+from models import MeetingMeta, MeetingModel, TemplateSpec
+from multi_template import combine_templates, render_projections
+from render_cache import get_render_cache
+from render_pool import render_async
+from results_store import store_result
+from transcript_loader import load_transcript_with_speakers
+from usage import UsageReport, track_usage
+
+logger = logging.getLogger(__name__)
+
+
+async def run_pipeline_async(
+    file_content: bytes | Callable[[], Awaitable[bytes]],
+    filename: str,
+    meta: MeetingMeta,
+    template: TemplateSpec,
+    *,
+    checkpoints: JobCheckpoints | None = None,
+) -> dict[str, Any]:
+    """
+    Load, extract, render and encode one transcript; the body of process_transcript.
+
+    Each large intermediate (upload bytes, DOCX bytes) is dropped as soon as
+    the next stage has consumed it, so at most the transcript text, one prompt
+    and the output are alive at once.
+
+    Parsing and rendering run off the event loop and the LLM calls use the
+    async client, so cancelling the task (e.g. when Modal cancels the input
+    after the client disconnected) aborts the in-flight HTTP request and
+    skips the remaining calls and the render.
+
+    With checkpoints, each stage's output is saved as it completes and a
+    retried job starts after the last saved stage. file_content may then be
+    a coroutine function, only called when the transcript has to be parsed.
+    """
+    meeting, usage, transcript_chars = await _load_and_extract(file_content, filename, meta, template, checkpoints)
+    return _result(meeting, usage, await _render_checkpointed(template, meeting, checkpoints), transcript_chars)
+
+
+async def run_pipeline_multi_async(
+    file_content: bytes | Callable[[], Awaitable[bytes]],
+    filename: str,
+    meta: MeetingMeta,
+    templates: list[TemplateSpec],
+    *,
+    checkpoints: JobCheckpoints | None = None,
+) -> dict[str, Any]:
+    """
+    run_pipeline_async for several templates: one extraction over the union
+    of their sections, then one DOCX per template, rendered concurrently.
+
+    Transcript and minutes are checkpointed as for one template; the
+    renders are not, so a retry renders (and stores) every DOCX again.
+    """
+    combined = combine_templates(templates)
+    meeting, usage, transcript_chars = await _load_and_extract(file_content, filename, meta, combined, checkpoints)
+    logger.info(f"Rendering {len(templates)} DOCX...")
+    documents = await render_projections(meeting, templates, combined)
+    for template, projected, docx_bytes in documents:
+        await asyncio.to_thread(store_result, template, projected, docx_bytes)
+    return _multi_result(meeting, usage, documents, transcript_chars)
+
+
+async def _load_and_extract(
+    file_content: bytes | Callable[[], Awaitable[bytes]],
+    filename: str,
+    meta: MeetingMeta,
+    template: TemplateSpec,
+    checkpoints: JobCheckpoints | None,
+) -> tuple[MeetingModel, UsageReport, int]:
+    """The checkpointed parse and extraction stages: (meeting, usage, transcript characters)."""
+    transcript = await _checkpointed(checkpoints and checkpoints.load_transcript)
+    if transcript is None:
+        if callable(file_content):
+            file_content = await file_content()
+        logger.info(f"Loading transcript from {filename} ({len(file_content)} bytes)")
+        transcript = await asyncio.to_thread(load_transcript_with_speakers, file_content, filename)
+        del file_content
+        await _checkpointed(checkpoints and checkpoints.save_transcript, transcript)
+    _log_loaded(transcript.text, transcript.speakers.speakers)
+    transcript_chars = len(transcript.text)
+
+    saved = await _checkpointed(checkpoints and checkpoints.load_meeting)
+    if saved is None:
+        logger.info("Starting LLM extraction...")
+        with track_usage(project=meta.project, template_id=template.id) as tracker:
+            meeting = await extract_meeting_model_async(
+                transcript.text, meta, template, speakers=transcript.speakers
+            )
+        usage = tracker.report()
+        await _checkpointed(checkpoints and checkpoints.save_meeting, meeting, usage)
+    else:
+        meeting, usage = saved
+    del transcript
+    _log_extracted(meeting)
+    return meeting, usage, transcript_chars
+
+
+async def _render_checkpointed(
+    template: TemplateSpec, meeting: MeetingModel, checkpoints: JobCheckpoints | None
+) -> bytes:
+    docx_bytes = await _checkpointed(checkpoints and checkpoints.load_docx)
+    if docx_bytes is None:
+        logger.info("Rendering DOCX...")
+        docx_bytes = await render_async(template, meeting)
+        # Stored before the checkpoint: a retry that finds the DOCX checkpoint has nothing left to store
+        await asyncio.to_thread(store_result, template, meeting, docx_bytes)
+        await _checkpointed(checkpoints and checkpoints.save_docx, docx_bytes)
+    return docx_bytes
+
+
+async def _checkpointed(method: Callable[..., Any] | None, *args: Any) -> Any:
+    """Run a JobCheckpoints method off the event loop; no-op without checkpoints."""
+    if method is None:
+        return None
+    return await asyncio.to_thread(method, *args)
+
+
+def _log_loaded(text: str, speakers: list) -> None:
+    logger.info(f"Transcript loaded: {len(text)} characters, {len(speakers)} speakers")
+
+
+def _log_extracted(meeting: MeetingModel) -> None:
+    logger.info(f"LLM extraction completed. Attendees: {len(meeting.attendees)}, Sections: {len(meeting.sections)}")
+
+
+def _result(meeting: MeetingModel, usage: UsageReport, docx_bytes: bytes, transcript_chars: int) -> dict[str, Any]:
+    logger.info(f"DOCX rendered: {len(docx_bytes)} bytes")
+    cache = get_render_cache()
+    if cache is not None:
+        logger.info("Render cache stats", extra=cache.stats())
+
+    docx_base64 = base64.b64encode(docx_bytes).decode("ascii")
+    del docx_bytes
+    logger.info(f"Base64 conversion completed: {len(docx_base64)} characters")
+
+    # Minutes travel as JSON text so the web tier can splice them into the
+    # response without rebuilding and re-encoding a dict
+    return {
+        "minutes_json": model_json(meeting).decode("utf-8"),
+        "usage_json": model_json(usage).decode("utf-8"),
+        "meeting_date": meeting.meta.date,
+        # Lets the web tier time jobs by size for /estimate
+        "transcript_chars": transcript_chars,
+        "docx_base64": docx_base64,
+        "status": "success",
+    }
+
+
+def _multi_result(
+    meeting: MeetingModel,
+    usage: UsageReport,
+    documents: list[tuple[TemplateSpec, MeetingModel, bytes]],
+    transcript_chars: int,
+) -> dict[str, Any]:
+    """_result with one document (projected minutes and DOCX) per template."""
+    return {
+        "minutes_json": model_json(meeting).decode("utf-8"),
+        "usage_json": model_json(usage).decode("utf-8"),
+        "meeting_date": meeting.meta.date,
+        "documents": [
+            {
+                "template_id": template.id,
+                "minutes_json": model_json(projected).decode("utf-8"),
+                "docx_base64": base64.b64encode(docx_bytes).decode("ascii"),
+            }
+            for template, projected, docx_bytes in documents
+        ],
+        "transcript_chars": transcript_chars,
+        "status": "success",
+    }
@@ -0,0 +1,159 @@
+import hashlib
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from config import settings
+from json_codec import model_json
+from models import MeetingModel, TemplateSpec
+from template_registry import resolve_docx_path
+
+logger = logging.getLogger(__name__)
+
+_cache: "RenderCache | None" = None
+_cache_lock = threading.Lock()
+
+
+def render_key(template: TemplateSpec, meeting: MeetingModel) -> str:
+    """
+    Canonical hash of everything that determines the rendered DOCX.
+
+    The template file is identified by its content hash, so editing a .docx in
+    place invalidates its entries even when the spec version is unchanged. The
+    output settings are part of the key too, so the shared disk tier never
+    serves documents optimized under an earlier configuration.
+    """
+    digest = hashlib.sha256()
+    output = f"optimize={settings.docx_optimize};level={settings.docx_compress_level}"
+    for part in (template.id, template.version, _template_content_hash(template), output):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    digest.update(model_json(meeting))
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """
+    LRU of rendered DOCX bytes, bounded by total size, with an optional on-disk tier.
+
+    Entries evicted from memory stay in directory (when set), so a later hit
+    there is promoted back into memory instead of re-rendered. Documents
+    larger than max_bytes are only kept on disk.
+    """
+
+    def __init__(self, max_bytes: int, directory: str | Path | None = None):
+        self.max_bytes = max_bytes
+        self.directory = Path(directory) if directory else None
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+
+        data = self._read_disk(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._insert(key, data)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        with self._lock:
+            self._insert(key, data)
+        self._write_disk(key, data)
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / lookups if lookups else 0.0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hit_ratio, 4),
+            }
+
+    def _insert(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous)
+        self._entries[key] = data
+        self._size += len(data)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.docx"
+
+    def _read_disk(self, key: str) -> bytes | None:
+        if self.directory is None:
+            return None
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as exc:
+            logger.warning("Render cache read failed", exc_info=exc, extra={"render_key": key})
+            return None
+
+    def _write_disk(self, key: str, data: bytes) -> None:
+        if self.directory is None:
+            return
+        path = self._path(key)
+        if path.exists():
+            return
+        tmp_path = path.with_name(f".{key}.{uuid.uuid4().hex}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(data)
+            # Readers never see a partially written document
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            tmp_path.unlink(missing_ok=True)
+            logger.warning("Render cache write failed", exc_info=exc, extra={"render_key": key})
+
+
+def get_render_cache() -> RenderCache | None:
+    """The process-wide cache, created on first use; None when settings.render_cache_bytes is 0."""
+    global _cache
+    if settings.render_cache_bytes <= 0:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = RenderCache(settings.render_cache_bytes, settings.render_cache_dir)
+    return _cache
+
+
+def _template_content_hash(template: TemplateSpec) -> str:
+    artifacts = template.artifacts
+    if artifacts is not None and artifacts.docx_sha256 is not None:
+        return artifacts.docx_sha256
+    # No preloaded bytes (e.g. the fallback template is created on first render)
+    path = resolve_docx_path(template)
+    if not path.is_file():
+        return "missing"
+    return hashlib.sha256(path.read_bytes()).hexdigest()
@@ -0,0 +1,247 @@
+import asyncio
+import logging
+import multiprocessing
+import signal
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from fastapi import HTTPException
+
+from config import settings
+from json_codec import model_json
+from models import MeetingMeta, MeetingModel, TemplateSpec
+from render_cache import get_render_cache, render_key
+from renderer import render_docx
+
+logger = logging.getLogger(__name__)
+
+# Extra time the caller waits beyond the worker-side timeout before giving up on a job
+RESULT_GRACE_SECONDS = 5.0
+# Template DOCX files each worker keeps, by SHA-256; edited templates add entries
+WORKER_DOCX_CACHE_SIZE = 32
+
+# Worker side: template DOCX bytes by SHA-256
+_worker_docx: "OrderedDict[str, bytes]" = OrderedDict()
+
+_pool: "RenderPool | None" = None
+_pool_lock = threading.Lock()
+
+
+class RenderTimeout(Exception):
+    """Raised inside a worker when a render exceeds its time limit."""
+
+
+class RenderJobError(Exception):
+    """Picklable stand-in for an HTTPException raised inside a worker: args are (status_code, detail)."""
+
+
+class UnknownTemplateDocx(Exception):
+    """Raised inside a worker that has not seen the job's template DOCX; the job is resent with the bytes."""
+
+
+class RenderPool:
+    """
+    Warm process pool for render_docx.
+
+    Workers render each registered template once on start-up to warm
+    docxtpl/Jinja and keep its DOCX bytes by SHA-256. Jobs carry the template
+    spec, its DOCX hash and the MeetingModel JSON; the DOCX bytes themselves
+    are only sent to a worker that does not have them yet, so templates added
+    or edited after the pool started render as the parent process sees them.
+
+    At most max_pending jobs are queued or running; callers beyond that wait
+    up to queue_timeout for a slot and then get a 503. A job that runs past
+    timeout is interrupted in its worker and reported as a 504.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int,
+        max_pending: int | None = None,
+        timeout: float = 60.0,
+        queue_timeout: float = 30.0,
+    ):
+        self.max_workers = max_workers
+        self.max_pending = max_pending or 2 * max_workers
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor_lock = threading.Lock()
+        self._executor = self._new_executor()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # spawn: workers must not inherit the parent's threads (template watcher, HTTP clients)
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+
+    def warm(self) -> None:
+        """Start every worker now instead of on the first requests."""
+        futures = [self._executor.submit(_ping) for _ in range(self.max_workers)]
+        for future in futures:
+            future.result()
+
+    def render(self, template: TemplateSpec, meeting: MeetingModel) -> bytes:
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            logger.warning("Render pool saturated", extra={"max_pending": self.max_pending})
+            raise HTTPException(status_code=503, detail="Renderer busy, please retry")
+        try:
+            executor = self._executor
+            artifacts = template.artifacts
+            docx_sha256 = artifacts.docx_sha256 if artifacts is not None else None
+            job = (model_json(template), docx_sha256, model_json(meeting), self.timeout)
+            try:
+                try:
+                    future = executor.submit(_render_job, *job)
+                    return future.result(timeout=self.timeout + RESULT_GRACE_SECONDS)
+                except UnknownTemplateDocx:
+                    future = executor.submit(_render_job, *job, artifacts.docx_bytes)
+                    return future.result(timeout=self.timeout + RESULT_GRACE_SECONDS)
+            except (RenderTimeout, FutureTimeoutError) as exc:
+                future.cancel()
+                logger.error("DOCX render timed out", extra={"template_id": template.id, "timeout": self.timeout})
+                raise HTTPException(status_code=504, detail="DOCX rendering timed out") from exc
+            except RenderJobError as exc:
+                raise HTTPException(status_code=exc.args[0], detail=exc.args[1]) from exc
+            except BrokenProcessPool as exc:
+                logger.error("Render worker died; restarting pool", exc_info=exc, extra={"template_id": template.id})
+                self._restart(executor)
+                raise HTTPException(status_code=500, detail="DOCX rendering failed") from exc
+        finally:
+            self._slots.release()
+
+    async def render_async(self, template: TemplateSpec, meeting: MeetingModel) -> bytes:
+        """render() without blocking the event loop, including while waiting for a slot."""
+        return await asyncio.to_thread(self.render, template, meeting)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        with self._executor_lock:
+            if self._executor is broken:
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._new_executor()
+
+
+def get_render_pool() -> RenderPool | None:
+    """The process-wide pool, created on first use; None when settings.render_workers is 0."""
+    global _pool
+    if settings.render_workers <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = RenderPool(
+                max_workers=settings.render_workers,
+                max_pending=settings.render_max_pending or None,
+                timeout=settings.render_timeout_seconds,
+                queue_timeout=settings.render_queue_timeout_seconds,
+            )
+    return _pool
+
+
+def render(template: TemplateSpec, meeting: MeetingModel) -> bytes:
+    """Render through the render cache, then the pool when one is configured, otherwise inline."""
+    cache = get_render_cache()
+    key = render_key(template, meeting) if cache is not None else None
+    if cache is not None and (cached := cache.get(key)) is not None:
+        return cached
+
+    pool = get_render_pool()
+    docx_bytes = render_docx(template, meeting) if pool is None else pool.render(template, meeting)
+    if cache is not None:
+        cache.put(key, docx_bytes)
+    return docx_bytes
+
+
+async def render_async(template: TemplateSpec, meeting: MeetingModel) -> bytes:
+    """render() off the event loop: cache hits return immediately, misses render in the pool or a thread."""
+    cache = get_render_cache()
+    key = render_key(template, meeting) if cache is not None else None
+    if cache is not None and (cached := cache.get(key)) is not None:
+        return cached
+
+    pool = get_render_pool()
+    if pool is None:
+        docx_bytes = await asyncio.to_thread(render_docx, template, meeting)
+    else:
+        docx_bytes = await pool.render_async(template, meeting)
+    if cache is not None:
+        cache.put(key, docx_bytes)
+    return docx_bytes
+
+
+def _init_worker() -> None:
+    from template_registry import TEMPLATE_VERSIONS
+
+    warm_meeting = MeetingModel(
+        meta=MeetingMeta(project="", job_min_no="", description="", date="", time="", location="")
+    )
+    for template in TEMPLATE_VERSIONS.values():
+        artifacts = template.artifacts
+        if artifacts is not None and artifacts.docx_sha256 is not None:
+            _remember_docx(artifacts.docx_sha256, artifacts.docx_bytes)
+        try:
+            render_docx(template, warm_meeting)
+        except Exception as exc:
+            logger.warning("Template warm-up render failed", exc_info=exc, extra={"template_id": template.id})
+
+
+def _ping() -> None:
+    return None
+
+
+def _remember_docx(sha256: str, docx_bytes: bytes) -> None:
+    _worker_docx[sha256] = docx_bytes
+    _worker_docx.move_to_end(sha256)
+    while len(_worker_docx) > WORKER_DOCX_CACHE_SIZE:
+        _worker_docx.popitem(last=False)
+
+
+def _job_template(template_json: bytes, docx_sha256: str | None, docx_bytes: bytes | None) -> TemplateSpec:
+    """The parent's template with its DOCX bytes; raises UnknownTemplateDocx when they must be sent."""
+    from template_registry import TemplateArtifacts
+
+    template = TemplateSpec.model_validate_json(template_json)
+    if docx_sha256 is None:
+        return template  # no DOCX file: render_docx falls back to docx_path
+    if docx_bytes is not None:
+        _remember_docx(docx_sha256, docx_bytes)
+    elif docx_sha256 not in _worker_docx:
+        raise UnknownTemplateDocx(docx_sha256)
+    # Rendering only reads the DOCX bytes; the prompt artifacts stay in the parent
+    template.attach_artifacts(
+        TemplateArtifacts.model_construct(docx_bytes=_worker_docx[docx_sha256], docx_sha256=docx_sha256)
+    )
+    _worker_docx.move_to_end(docx_sha256)
+    return template
+
+
+def _render_job(
+    template_json: bytes,
+    docx_sha256: str | None,
+    meeting_json: bytes,
+    timeout: float,
+    docx_bytes: bytes | None = None,
+) -> bytes:
+    template = _job_template(template_json, docx_sha256, docx_bytes)
+
+    def on_timeout(signum, frame):
+        raise RenderTimeout(f"Render exceeded {timeout}s")
+
+    # Jobs run on the worker's main thread, so a real-time alarm can interrupt them
+    previous = signal.signal(signal.SIGALRM, on_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return render_docx(template, MeetingModel.model_validate_json(meeting_json))
+    except HTTPException as exc:
+        raise RenderJobError(exc.status_code, exc.detail) from None
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
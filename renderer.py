@@ -1,29 +1,52 @@
 import io
+import logging
+import os
+import threading
+import uuid
 from pathlib import Path
 
 from docx import Document
 from docxtpl import DocxTemplate
 from fastapi import HTTPException
 
+from config import settings
+from docx_optimizer import optimize_docx
 from models import MeetingModel, Section, SectionDates, TemplateSpec
 
+logger = logging.getLogger(__name__)
 
 BASE_DIR = Path(__file__).resolve().parent
 
+# Concurrent first renders must not each write the fallback template
+_fallback_lock = threading.Lock()
+
 
 def render_docx(template: TemplateSpec, meeting: MeetingModel) -> bytes:
-    template_path = Path(template.docx_path)
-    if not template_path.is_absolute():
-        template_path = (BASE_DIR / template.docx_path).resolve()
-    _ensure_template_exists(template_path)
+    artifacts = template.artifacts
+    if artifacts is not None and artifacts.docx_bytes is not None:
+        # Preloaded by template_registry: no disk access on the request path
+        doc = DocxTemplate(io.BytesIO(artifacts.docx_bytes))
+    else:
+        template_path = Path(template.docx_path)
+        if not template_path.is_absolute():
+            template_path = (BASE_DIR / template.docx_path).resolve()
+        _ensure_template_exists(template_path)
+        doc = DocxTemplate(template_path)
 
-    doc = DocxTemplate(template_path)
     context = _build_context(meeting)
     doc.render(context)
 
     buffer = io.BytesIO()
     doc.save(buffer)
-    return buffer.getvalue()
+    if not settings.docx_optimize:
+        return buffer.getvalue()
+
+    docx_bytes, savings = optimize_docx(buffer.getvalue(), compresslevel=settings.docx_compress_level)
+    logger.info(
+        "DOCX optimized",
+        extra={"template_id": template.id, "bytes_saved": savings.saved, **savings._asdict()},
+    )
+    return docx_bytes
 
 
 def _build_context(meeting: MeetingModel) -> dict:
@@ -99,9 +122,19 @@ def _extract_contract_dates(sections: list[Section]) -> SectionDates:
 
 def _ensure_template_exists(path: Path) -> None:
     """Create a lightweight fallback template if none is provided."""
-    path.parent.mkdir(parents=True, exist_ok=True)
     if path.exists():
         return
+    with _fallback_lock:
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write aside and rename so other processes never open a half-written file
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        _build_fallback_template().save(tmp_path)
+        os.replace(tmp_path, path)
+
+
+def _build_fallback_template() -> Document:
 
     doc = Document()
     doc.add_heading("Construction Progress Meeting Minutes", level=1)
@@ -151,4 +184,4 @@ def _ensure_template_exists(path: Path) -> None:
     )
 
     doc.add_paragraph("Distribution: {{ distribution }}")
-    doc.save(path)
+    return doc
@@ -0,0 +1,236 @@
+import hashlib
+import io
+import itertools
+import json
+import logging
+import os
+import re
+import uuid
+import zipfile
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from config import settings
+from json_codec import model_json
+from models import MeetingModel, TemplateSpec
+from render_pool import render
+from template_registry import get_template
+
+logger = logging.getLogger(__name__)
+
+MINUTES = "minutes.json"
+DOCX = "minutes.docx"
+RECORD = "result.json"
+
+_SLUG = re.compile(r"[^0-9A-Za-z]+")
+
+
+class StoredResult(BaseModel):
+    """What is kept about one successful transform, next to its minutes and DOCX."""
+
+    result_id: str
+    project: str
+    template_id: str
+    template_version: str
+    created_at: datetime
+
+
+def project_dir_name(project: str) -> str:
+    """Readable, filesystem-safe directory name for a project; the hash keeps distinct names apart."""
+    slug = _SLUG.sub("-", project).strip("-")[:60] or "project"
+    return f"{slug}-{hashlib.sha256(project.encode('utf-8')).hexdigest()[:12]}"
+
+
+class ResultStore:
+    """
+    Minutes and DOCX of every successful transform, by project, on a directory
+    such as the shared volume: root/<project>/<result id>/.
+
+    Result ids sort by creation time, so listing a project is a directory scan
+    in order with no index to maintain.
+    """
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def save(self, template: TemplateSpec, meeting: MeetingModel, docx_bytes: bytes | None) -> StoredResult:
+        created_at = datetime.now(timezone.utc)
+        record = StoredResult(
+            result_id=f"{created_at:%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}",
+            project=meeting.meta.project,
+            template_id=template.id,
+            template_version=template.version,
+            created_at=created_at,
+        )
+        path = self.root / project_dir_name(record.project) / record.result_id
+        path.mkdir(parents=True, exist_ok=True)
+        _write_atomic(path / MINUTES, model_json(meeting))
+        if docx_bytes is not None:
+            _write_atomic(path / DOCX, docx_bytes)
+        # Written last: a result without its record is incomplete and not listed
+        _write_atomic(path / RECORD, model_json(record))
+        return record
+
+    def list(self, project: str, *, since: date | None = None, until: date | None = None) -> list[StoredResult]:
+        """The project's results created between since and until (inclusive, UTC days), oldest first."""
+        directory = self.root / project_dir_name(project)
+        if not directory.is_dir():
+            return []
+        results = []
+        for path in sorted(directory.iterdir()):
+            try:
+                record = StoredResult.model_validate_json((path / RECORD).read_bytes())
+            except FileNotFoundError:
+                continue
+            day = record.created_at.date()
+            if (since is None or day >= since) and (until is None or day <= until):
+                results.append(record)
+        return results
+
+    def minutes(self, record: StoredResult) -> MeetingModel:
+        return MeetingModel.model_validate_json(self._path(record, MINUTES).read_bytes())
+
+    def docx(self, record: StoredResult) -> bytes | None:
+        try:
+            return self._path(record, DOCX).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def _path(self, record: StoredResult, name: str) -> Path:
+        return self.root / project_dir_name(record.project) / record.result_id / name
+
+
+def get_result_store() -> ResultStore | None:
+    """The store under settings.results_dir, or None when results are not kept."""
+    return ResultStore(settings.results_dir) if settings.results_dir else None
+
+
+def store_result(template: TemplateSpec, meeting: MeetingModel, docx_bytes: bytes) -> StoredResult | None:
+    """Keep a successful transform for export; a failure here never fails the transform."""
+    store = get_result_store()
+    if store is None:
+        return None
+    try:
+        record = store.save(template, meeting, docx_bytes)
+    except OSError as exc:
+        logger.warning("Storing result failed", exc_info=exc, extra={"project": meeting.meta.project})
+        return None
+    logger.info("Result stored", extra={"project": record.project, "result_id": record.result_id})
+    return record
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, non-seekable file for ZipFile that hands its bytes out chunk by chunk."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(entries: Iterable[tuple[str, datetime, Callable[[], bytes | None]]]) -> Iterator[bytes]:
+    """
+    Build a ZIP archive on the fly: yield its bytes after each member.
+
+    entries are (name, timestamp, load); load is only called when the member
+    is written and may return None to skip it. Only one member's content is
+    held at a time, whatever the number of members.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, timestamp, load in entries:
+            data = load()
+            if data is None:
+                continue
+            info = zipfile.ZipInfo(name, date_time=timestamp.timetuple()[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(info, data)
+            del data
+            yield sink.drain()
+    yield sink.drain()
+
+
+def export_zip(
+    store: ResultStore,
+    records: list[StoredResult],
+    rerender: Callable[[StoredResult, MeetingModel], bytes | None] | None = None,
+) -> Iterator[bytes]:
+    """
+    Stream a ZIP of stored results: a manifest, then minutes JSON and DOCX per meeting.
+
+    A result stored without its DOCX is re-rendered from its minutes
+    (default: rerender with the template it was made with).
+    """
+    rerender = rerender or rerender_result
+    manifest = json.dumps([record.model_dump(mode="json") for record in records], indent=2).encode("utf-8")
+    members = itertools.chain(
+        [("manifest.json", datetime.now(timezone.utc), lambda: manifest)],
+        _result_members(store, records, rerender),
+    )
+    return stream_zip(members)
+
+
+def rerender_result(record: StoredResult, minutes: MeetingModel) -> bytes | None:
+    """Render stored minutes with their template version, else its latest; None if the template is gone."""
+    try:
+        template = get_template(record.template_id, record.template_version)
+    except HTTPException:
+        try:
+            template = get_template(record.template_id)
+        except HTTPException:
+            logger.warning(
+                "Template gone; exporting minutes without DOCX",
+                extra={"result_id": record.result_id, "template_id": record.template_id},
+            )
+            return None
+    return render(template, minutes)
+
+
+def _result_members(
+    store: ResultStore,
+    records: list[StoredResult],
+    rerender: Callable[[StoredResult, MeetingModel], bytes | None],
+) -> Iterator[tuple[str, datetime, Callable[[], bytes | None]]]:
+    for record in records:
+        minutes = store.minutes(record)
+        stem = _member_stem(minutes, record)
+        yield f"{stem}.json", record.created_at, lambda minutes=minutes: model_json(minutes)
+        yield (
+            f"{stem}.docx",
+            record.created_at,
+            lambda record=record, minutes=minutes: store.docx(record) or rerender(record, minutes),
+        )
+
+
+def _member_stem(minutes: MeetingModel, record: StoredResult) -> str:
+    date = _SLUG.sub("-", minutes.meta.date).strip("-") or "undated"
+    job = _SLUG.sub("-", minutes.meta.job_min_no).strip("-")
+    return "_".join(part for part in ("meeting_minutes", date, job, record.result_id) if part)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
@@ -0,0 +1,120 @@
+import math
+import re
+from collections import Counter
+
+from models import TemplateSectionSpec
+from tokens import estimate_tokens
+
+# Passages are built from consecutive speaker turns up to this many characters
+PASSAGE_MAX_CHARS = 1200
+PASSAGE_SEPARATOR = "\n[...]\n"
+
+_TOKEN = re.compile(r"[^\W_]+")
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "for", "from", "has", "have", "i",
+    "in", "is", "it", "of", "on", "or", "so", "that", "the", "there", "this", "to", "was", "we",
+    "were", "will", "with", "you", "xx", "no",
+}
+
+
+def tokenize(text: str) -> list[str]:
+    return [token for token in _TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def chunk_turns(text: str, max_chars: int = PASSAGE_MAX_CHARS) -> list[str]:
+    """Group consecutive transcript lines (speaker turns) into passages of up to max_chars."""
+    passages: list[str] = []
+    current: list[str] = []
+    size = 0
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if current and size + len(line) > max_chars:
+            passages.append("\n".join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        passages.append("\n".join(current))
+    return passages
+
+
+class BM25Index:
+    """Okapi BM25 over an in-memory list of passages."""
+
+    def __init__(self, passages: list[str], *, k1: float = 1.5, b: float = 0.75):
+        self.passages = passages
+        self.k1 = k1
+        self.b = b
+        self._term_freqs = [Counter(tokenize(passage)) for passage in passages]
+        self._lengths = [sum(freqs.values()) for freqs in self._term_freqs]
+        self._avg_length = (sum(self._lengths) / len(passages)) if passages else 0.0
+        doc_freqs: Counter = Counter()
+        for freqs in self._term_freqs:
+            doc_freqs.update(freqs.keys())
+        count = len(passages)
+        self._idf = {term: math.log(1 + (count - df + 0.5) / (df + 0.5)) for term, df in doc_freqs.items()}
+
+    @classmethod
+    def from_text(cls, text: str, max_chars: int = PASSAGE_MAX_CHARS) -> "BM25Index":
+        return cls(chunk_turns(text, max_chars))
+
+    def scores(self, query: str) -> list[float]:
+        terms = [term for term in set(tokenize(query)) if term in self._idf]
+        results = []
+        for freqs, length in zip(self._term_freqs, self._lengths, strict=True):
+            norm = self.k1 * (1 - self.b + self.b * length / self._avg_length) if self._avg_length else self.k1
+            score = 0.0
+            for term in terms:
+                tf = freqs.get(term)
+                if tf:
+                    score += self._idf[term] * tf * (self.k1 + 1) / (tf + norm)
+            results.append(score)
+        return results
+
+    def top_passages(self, query: str, token_budget: int) -> list[int]:
+        """Indices of the best-scoring passages (score > 0) that fit in token_budget."""
+        scored = sorted(
+            ((score, index) for index, score in enumerate(self.scores(query)) if score > 0),
+            key=lambda item: (-item[0], item[1]),
+        )
+        selected: list[int] = []
+        used = 0
+        for _, index in scored:
+            cost = estimate_tokens(self.passages[index])
+            if used + cost > token_budget:
+                continue
+            selected.append(index)
+            used += cost
+        return selected
+
+
+def section_query(section: TemplateSectionSpec) -> str:
+    return " ".join([section.title, *section.aliases])
+
+
+def relevant_excerpt(index: BM25Index, sections: list[TemplateSectionSpec], token_budget_per_section: int) -> str:
+    """
+    Transcript excerpt for a group of sections: the top passages for each section,
+    in transcript order, separated by PASSAGE_SEPARATOR.
+
+    A section whose title and aliases match nothing gets the opening passages
+    instead (introductions and apologies are rarely named outright).
+    """
+    selected: set[int] = set()
+    for section in sections:
+        hits = index.top_passages(section_query(section), token_budget_per_section)
+        selected.update(hits or _leading_passages(index, token_budget_per_section))
+    return PASSAGE_SEPARATOR.join(index.passages[i] for i in sorted(selected))
+
+
+def _leading_passages(index: BM25Index, token_budget: int) -> list[int]:
+    selected: list[int] = []
+    used = 0
+    for position, passage in enumerate(index.passages):
+        used += estimate_tokens(passage)
+        if used > token_budget:
+            break
+        selected.append(position)
+    return selected
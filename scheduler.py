@@ -0,0 +1,182 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, Awaitable, Callable, TypeVar
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+LANES = (INTERACTIVE, BATCH)
+# Share of dispatched work each lane gets while both have jobs waiting
+DEFAULT_LANE_WEIGHTS = {INTERACTIVE: 4.0, BATCH: 1.0}
+
+
+class _Job:
+    __slots__ = ("tenant", "cost", "lane", "ready", "enqueued_at")
+
+    def __init__(self, tenant: str, cost: float, lane: str):
+        self.tenant = tenant
+        self.cost = cost
+        self.lane = lane
+        self.ready: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.enqueued_at = time.monotonic()
+
+
+class _Lane:
+    """
+    Start-time fair queue over tenants.
+
+    A job's start tag is max(lane clock, its tenant's last finish tag); the
+    finish tag adds cost / tenant weight. Dispatching in start-tag order gives
+    each tenant a share of the lane proportional to its weight, whatever the
+    size of its backlog.
+    """
+
+    def __init__(self, name: str, weight: float):
+        self.name = name
+        self.weight = weight
+        self.clock = 0.0
+        self.served = 0.0
+        self.running = 0
+        self._heap: list[tuple[float, int, _Job]] = []
+        self._finish: dict[str, float] = {}
+        self._seq = itertools.count()
+
+    def push(self, job: _Job, tenant_weight: float) -> None:
+        start = max(self.clock, self._finish.get(job.tenant, 0.0))
+        self._finish[job.tenant] = start + job.cost / tenant_weight
+        heapq.heappush(self._heap, (start, next(self._seq), job))
+
+    def pop(self) -> _Job | None:
+        while self._heap:
+            start, _, job = heapq.heappop(self._heap)
+            if job.ready.done():  # waiter went away while queued
+                continue
+            self.clock = start
+            self.served += job.cost / self.weight
+            return job
+        # Idle lane: forget finish tags so returning tenants are not penalised for old work
+        self._finish.clear()
+        return None
+
+    def waiting(self) -> int:
+        return sum(1 for _, _, job in self._heap if not job.ready.done())
+
+
+class Scheduler:
+    """
+    Admission control in front of process_transcript.
+
+    Jobs are classified by estimated token cost: up to interactive_max_tokens
+    go to the interactive lane, larger ones to the batch lane. At most
+    max_inflight jobs run at once, and batch jobs never take the last
+    interactive_reserved slots, so a short meeting starts as soon as any
+    reserved or free slot opens even while a batch drains. When both lanes
+    wait, free slots are shared by lane weight; within a lane, by tenant
+    (project) weight.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_inflight: int,
+        interactive_reserved: int = 0,
+        interactive_max_tokens: int,
+        lane_weights: dict[str, float] | None = None,
+        tenant_weights: dict[str, float] | None = None,
+    ):
+        weights = {**DEFAULT_LANE_WEIGHTS, **(lane_weights or {})}
+        self.max_inflight = max_inflight
+        self.batch_max_inflight = max(1, max_inflight - interactive_reserved)
+        self.interactive_max_tokens = interactive_max_tokens
+        self.tenant_weights = tenant_weights or {}
+        self._lanes = {name: _Lane(name, weights[name]) for name in LANES}
+        self._running = 0
+
+    def classify(self, cost_tokens: int) -> str:
+        return INTERACTIVE if cost_tokens <= self.interactive_max_tokens else BATCH
+
+    async def run(self, *, tenant: str, cost_tokens: int, factory: Callable[[], Awaitable[T]]) -> T:
+        """Wait for a slot in the job's lane, then run factory() while holding it."""
+        lane = self._lanes[self.classify(cost_tokens)]
+        job = _Job(tenant, max(cost_tokens, 1), lane.name)
+        if not lane.waiting():
+            # A lane that sat idle does not bank credit: it rejoins level with the busy lanes
+            busy = [other.served for other in self._lanes.values() if other is not lane and other.waiting()]
+            if busy:
+                lane.served = max(lane.served, min(busy))
+        lane.push(job, self.tenant_weights.get(tenant, 1.0))
+        self._dispatch()
+        try:
+            await job.ready
+        except asyncio.CancelledError:
+            if job.ready.done() and not job.ready.cancelled():
+                self._release(lane)  # granted just as the caller went away
+            raise
+
+        waited = time.monotonic() - job.enqueued_at
+        logger.info(
+            "Scheduled job",
+            extra={"lane": lane.name, "tenant": tenant, "cost_tokens": cost_tokens, "queue_seconds": round(waited, 3)},
+        )
+        try:
+            return await factory()
+        finally:
+            self._release(lane)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "running": self._running,
+            "max_inflight": self.max_inflight,
+            "lanes": {
+                name: {"running": lane.running, "waiting": lane.waiting()} for name, lane in self._lanes.items()
+            },
+        }
+
+    def _release(self, lane: _Lane) -> None:
+        lane.running -= 1
+        self._running -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self._running < self.max_inflight:
+            job = self._next_job()
+            if job is None:
+                return
+            lane = self._lanes[job.lane]
+            lane.running += 1
+            self._running += 1
+            job.ready.set_result(None)
+
+    def _next_job(self) -> _Job | None:
+        # Least-served lane first, by weighted cost dispatched so far
+        for lane in sorted(self._lanes.values(), key=lambda lane: lane.served):
+            if lane.name == BATCH and lane.running >= self.batch_max_inflight:
+                continue
+            job = lane.pop()
+            if job is not None:
+                return job
+        return None
+
+
+_scheduler: Scheduler | None = None
+
+
+def get_scheduler() -> Scheduler:
+    """The scheduler for this event loop's process, created on first use from settings."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = Scheduler(
+            max_inflight=settings.scheduler_max_inflight,
+            interactive_reserved=settings.scheduler_interactive_reserved,
+            interactive_max_tokens=settings.scheduler_interactive_max_tokens,
+            tenant_weights=settings.scheduler_tenant_weights,
+        )
+    return _scheduler
@@ -0,0 +1,273 @@
+import logging
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from config import settings
+from models import MeetingModel
+from results_store import ResultStore, StoredResult
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    id INTEGER PRIMARY KEY,
+    result_id TEXT NOT NULL UNIQUE,
+    project TEXT NOT NULL,
+    job_min_no TEXT NOT NULL,
+    meeting_date TEXT NOT NULL,
+    meeting_day TEXT,
+    template_id TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS meetings_project_day ON meetings (project, meeting_day, created_at);
+
+CREATE TABLE IF NOT EXISTS actions (
+    id INTEGER PRIMARY KEY,
+    meeting_id INTEGER NOT NULL REFERENCES meetings (id) ON DELETE CASCADE,
+    section_code TEXT NOT NULL,
+    section_title TEXT NOT NULL,
+    action TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    owner_key TEXT NOT NULL,
+    due_date TEXT NOT NULL,
+    due_day TEXT
+);
+CREATE INDEX IF NOT EXISTS actions_meeting ON actions (meeting_id);
+CREATE INDEX IF NOT EXISTS actions_owner ON actions (owner_key);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS entries USING fts5 (
+    title,
+    body,
+    owner,
+    kind UNINDEXED,
+    meeting_id UNINDEXED,
+    section_code UNINDEXED,
+    tokenize = 'porter unicode61'
+);
+"""
+
+# Query terms: words, kept whole so FTS5 operators in user input are never interpreted
+_TERM = re.compile(r"\w+")
+
+
+class SearchHit(BaseModel):
+    result_id: str
+    project: str
+    meeting_date: str
+    job_min_no: str
+    kind: str  # "section", "action" or "attendee"
+    section_code: str
+    title: str
+    snippet: str
+    owner: str
+
+
+class OpenAction(BaseModel):
+    result_id: str
+    project: str
+    meeting_date: str
+    section_code: str
+    section_title: str
+    action: str
+    owner: str
+    due_date: str
+
+
+class SearchIndex:
+    """
+    SQLite FTS5 index over stored minutes: section notes, actions (with owners
+    and due dates) and attendees, plus a plain table of actions for owner views.
+
+    One writer at a time: the Modal app indexes from a single-container
+    function; readers open the file read-only.
+    """
+
+    def __init__(self, path: str | Path, *, readonly: bool = False):
+        self.path = Path(path)
+        if readonly:
+            self._db = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.executescript(SCHEMA)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA foreign_keys = ON")
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def add(self, record: StoredResult, meeting: MeetingModel) -> None:
+        """Index one stored result, replacing it if it was indexed before."""
+        with self._lock, self._db:
+            self._delete(record.result_id)
+            cursor = self._db.execute(
+                "INSERT INTO meetings (result_id, project, job_min_no, meeting_date, meeting_day, template_id, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    record.result_id,
+                    record.project,
+                    meeting.meta.job_min_no,
+                    meeting.meta.date,
+                    _iso_day(meeting.meta.date),
+                    record.template_id,
+                    record.created_at.isoformat(),
+                ),
+            )
+            meeting_id = cursor.lastrowid
+            entries = []
+            actions = []
+            for section in meeting.sections:
+                entries.append((section.title, section.notes, "", "section", meeting_id, section.code))
+                for item in section.actions:
+                    entries.append((section.title, item.action, item.owner, "action", meeting_id, section.code))
+                    actions.append(
+                        (
+                            meeting_id,
+                            section.code,
+                            section.title,
+                            item.action,
+                            item.owner,
+                            item.owner.strip().casefold(),
+                            item.due_date,
+                            _iso_day(item.due_date),
+                        )
+                    )
+            for person in [*meeting.attendees, *meeting.apologies]:
+                entries.append((person.name, person.company, "", "attendee", meeting_id, ""))
+            self._db.executemany(
+                "INSERT INTO entries (title, body, owner, kind, meeting_id, section_code) VALUES (?, ?, ?, ?, ?, ?)",
+                entries,
+            )
+            self._db.executemany(
+                "INSERT INTO actions (meeting_id, section_code, section_title, action, owner, owner_key, due_date, due_day)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                actions,
+            )
+
+    def sync_project(self, store: ResultStore, project: str) -> int:
+        """Index the project's stored results that are not indexed yet; return how many were added."""
+        with self._lock:
+            known = {
+                row["result_id"]
+                for row in self._db.execute("SELECT result_id FROM meetings WHERE project = ?", (project,))
+            }
+        added = 0
+        for record in store.list(project):
+            if record.result_id not in known:
+                self.add(record, store.minutes(record))
+                added += 1
+        return added
+
+    def search(self, query: str, *, project: str | None = None, limit: int = 20) -> list[SearchHit]:
+        """Best matches for all words of query, across sections, actions and attendees."""
+        terms = _TERM.findall(query)
+        if not terms:
+            return []
+        match = " ".join(f'"{term}"' for term in terms)
+        sql = (
+            "SELECT m.result_id, m.project, m.meeting_date, m.job_min_no, e.kind, e.section_code, e.title, e.owner,"
+            " snippet(entries, 1, '[', ']', '...', 12) AS snippet"
+            " FROM entries e JOIN meetings m ON m.id = e.meeting_id"
+            " WHERE entries MATCH ?"
+        )
+        params: list = [match]
+        if project is not None:
+            sql += " AND m.project = ?"
+            params.append(project)
+        sql += " ORDER BY bm25(entries, 2.0, 1.0, 3.0) LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [SearchHit(**dict(row)) for row in rows]
+
+    def open_actions(self, *, owner: str | None = None, project: str | None = None) -> dict[str, list[OpenAction]]:
+        """
+        Open actions grouped by owner.
+
+        Minutes carry outstanding actions forward until they are done, so the
+        open actions of a project are those in its latest meeting (by meeting
+        date, then by when it was indexed). owner matches case-insensitively.
+        """
+        sql = """
+            WITH latest AS (
+                SELECT id FROM (
+                    SELECT id, ROW_NUMBER() OVER (
+                        PARTITION BY project ORDER BY meeting_day DESC NULLS LAST, created_at DESC
+                    ) AS position
+                    FROM meetings
+                    {project_filter}
+                ) WHERE position = 1
+            )
+            SELECT m.result_id, m.project, m.meeting_date, a.section_code, a.section_title, a.action, a.owner,
+                   a.due_date
+            FROM actions a JOIN latest l ON l.id = a.meeting_id JOIN meetings m ON m.id = a.meeting_id
+            {owner_filter}
+            ORDER BY a.owner_key, a.due_day IS NULL, a.due_day, m.project
+        """
+        params: list = []
+        project_filter = owner_filter = ""
+        if project is not None:
+            project_filter = "WHERE project = ?"
+            params.append(project)
+        if owner is not None:
+            owner_filter = "WHERE a.owner_key = ?"
+            params.append(owner.strip().casefold())
+        with self._lock:
+            rows = self._db.execute(
+                sql.format(project_filter=project_filter, owner_filter=owner_filter), params
+            ).fetchall()
+        # Owners differing only in case or spacing are one person, shown as first spelled
+        grouped: dict[str, list[OpenAction]] = {}
+        labels: dict[str, str] = {}
+        for row in rows:
+            action = OpenAction(**dict(row))
+            label = labels.setdefault(action.owner.strip().casefold(), action.owner.strip() or "Unassigned")
+            grouped.setdefault(label, []).append(action)
+        return grouped
+
+    def _delete(self, result_id: str) -> None:
+        row = self._db.execute("SELECT id FROM meetings WHERE result_id = ?", (result_id,)).fetchone()
+        if row is None:
+            return
+        self._db.execute("DELETE FROM entries WHERE meeting_id = ?", (row["id"],))
+        self._db.execute("DELETE FROM meetings WHERE id = ?", (row["id"],))
+
+
+_index: SearchIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_search_index() -> SearchIndex | None:
+    """The process-wide writable index at settings.search_index_path, or None when search is off."""
+    global _index
+    if not settings.search_index_path:
+        return None
+    with _index_lock:
+        if _index is None:
+            _index = SearchIndex(settings.search_index_path)
+    return _index
+
+
+def index_result(record: StoredResult | None, meeting: MeetingModel) -> None:
+    """Add a just-stored result to the index; a failure here never fails the transform."""
+    index = get_search_index()
+    if index is None or record is None:
+        return
+    try:
+        index.add(record, meeting)
+    except sqlite3.Error as exc:
+        logger.warning("Indexing result failed", exc_info=exc, extra={"result_id": record.result_id})
+
+
+def _iso_day(value: str) -> str | None:
+    """dd/mm/yyyy as yyyy-mm-dd for ordering; None for empty or unparseable dates."""
+    try:
+        return datetime.strptime(value.strip(), "%d/%m/%Y").replace(tzinfo=timezone.utc).date().isoformat()
+    except ValueError:
+        return None
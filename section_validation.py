@@ -0,0 +1,101 @@
+import logging
+import re
+from typing import NamedTuple
+
+from models import Section, TemplateExtractionSpec, TemplateSectionSpec
+
+logger = logging.getLogger(__name__)
+
+# A title this long that is neither the template title nor an alias is notes
+# spilled into the title: the section is asked for again rather than kept
+MAX_SECTION_TITLE_CHARS = 100
+
+_SPACES = re.compile(r"\s+")
+_EDGE_PUNCTUATION = re.compile(r"^[\W_]+|[\W_]+$")
+
+
+def normalize_name(value: str) -> str:
+    """Case-, whitespace- and edge-punctuation-insensitive form of a section code or title."""
+    return _EDGE_PUNCTUATION.sub("", _SPACES.sub(" ", value).strip()).casefold()
+
+
+class SectionIndex:
+    """Template sections by normalized code, and by normalized title and aliases."""
+
+    def __init__(self, extraction: TemplateExtractionSpec):
+        self.specs = extraction.predefined_sections
+        self.by_code = {normalize_name(spec.code): spec for spec in self.specs}
+        self.by_name: dict[str, TemplateSectionSpec] = {}
+        for spec in self.specs:
+            for name in (spec.title, *spec.aliases):
+                self.by_name.setdefault(normalize_name(name), spec)
+
+    def resolve(self, section: Section) -> TemplateSectionSpec | None:
+        """The template section a returned section stands for, by code first, then by title or alias."""
+        return self.by_code.get(normalize_name(section.code)) or self.by_name.get(normalize_name(section.title))
+
+    def names(self, spec: TemplateSectionSpec) -> set[str]:
+        return {normalize_name(name) for name in (spec.title, *spec.aliases)}
+
+
+class SectionCheck(NamedTuple):
+    """Sections by template code (canonical code and title), unknown extras, and sections to ask for again."""
+
+    found: dict[str, Section]
+    extras: list[Section]
+    faulty: list[TemplateSectionSpec]
+
+
+def check_sections(
+    sections: list[Section], extraction: TemplateExtractionSpec, expected: list[TemplateSectionSpec] | None = None
+) -> SectionCheck:
+    """
+    Check returned sections against the template.
+
+    A section whose code is wrong but whose title or an alias names a template
+    section is recoded; a matched section gets the template's title. A section
+    of expected (default: every predefined section) that is missing, or whose
+    title is an over-long mismatch, is faulty. The first of several sections
+    for the same code wins; sections matching nothing are returned as extras.
+    """
+    index = SectionIndex(extraction)
+    found: dict[str, Section] = {}
+    extras: list[Section] = []
+    overlong: set[str] = set()
+    for section in sections:
+        spec = index.resolve(section)
+        if spec is None:
+            extras.append(section)
+            continue
+        if spec.code in found or spec.code in overlong:
+            continue
+        if normalize_name(section.title) not in index.names(spec) and len(section.title) > MAX_SECTION_TITLE_CHARS:
+            overlong.add(spec.code)
+            continue
+        if section.code != spec.code:
+            logger.info("Section recoded", extra={"from_code": section.code, "to_code": spec.code})
+        found[spec.code] = section.model_copy(update={"code": spec.code, "title": spec.title})
+
+    faulty = [spec for spec in (index.specs if expected is None else expected) if spec.code not in found]
+    if faulty:
+        logger.warning(
+            "Sections missing or invalid",
+            extra={
+                "missing": [spec.code for spec in faulty if spec.code not in overlong],
+                "overlong_title": sorted(overlong),
+                "unknown_codes": [section.code for section in extras],
+            },
+        )
+    return SectionCheck(found, extras, faulty)
+
+
+def splice_sections(extraction: TemplateExtractionSpec, check: SectionCheck, reasked: list[Section]) -> list[Section]:
+    """
+    Template-ordered sections: checked sections, then re-asked ones in their
+    place (empty if still missing), then the unknown extras.
+    """
+    retry = check_sections(reasked, extraction, check.faulty)
+    found = {**retry.found, **check.found}
+    return [
+        found.get(spec.code) or Section(code=spec.code, title=spec.title) for spec in extraction.predefined_sections
+    ] + check.extras
@@ -1,6 +1,35 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
 from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+
+from config import settings
+from llm_extractor import PromptParts, compile_prompt_parts
+from models import (
+    MeetingExtraction,
+    PeopleExtraction,
+    SectionsExtraction,
+    TemplateBindingSpec,
+    TemplateExtractionSpec,
+    TemplateSectionSpec,
+    TemplateSpec,
+)
+
+try:  # YAML specs are optional; JSON specs always work
+    import yaml
+except ImportError:  # pragma: no cover - depends on the environment
+    yaml = None
+
+logger = logging.getLogger(__name__)
 
-from models import TemplateBindingSpec, TemplateExtractionSpec, TemplateSectionSpec, TemplateSpec
+BASE_DIR = Path(__file__).resolve().parent
+SPEC_SUFFIXES = {".json", ".yaml", ".yml"}
 
 
 PROGRESS_TEMPLATE = TemplateSpec(
@@ -24,13 +53,179 @@ PROGRESS_TEMPLATE = TemplateSpec(
         wants_dates=True,
     ),
     binding=TemplateBindingSpec(id="progress_minutes_v1"),
+    # No size tiers: reasoning effort and output caps are opt-in per template, since
+    # non-reasoning deployments (e.g. GPT-4) reject the reasoning parameter
 )
 
-TEMPLATES: dict[str, TemplateSpec] = {PROGRESS_TEMPLATE.id: PROGRESS_TEMPLATE}
+BUILTIN_TEMPLATES: list[TemplateSpec] = [PROGRESS_TEMPLATE]
+
+# Latest version of each template, and every loaded (id, version).
+# Both are replaced wholesale by load_templates, so lookups never see a half-built registry.
+TEMPLATES: dict[str, TemplateSpec] = {}
+TEMPLATE_VERSIONS: dict[tuple[str, str], TemplateSpec] = {}
+
+_reload_lock = threading.Lock()
+_watcher_lock = threading.Lock()
+_watcher: threading.Thread | None = None
+
+
+class TemplateArtifacts(BaseModel):
+    """Per-template work done once at load time instead of on every request."""
+
+    prompt_parts: PromptParts
+    # Routing task ("full", "people", "sections") -> JSON schema of the call's output
+    output_schemas: dict[str, dict[str, Any]]
+    docx_bytes: bytes | None = None
+    docx_sha256: str | None = None
 
 
-def get_template(template_id: str) -> TemplateSpec:
+def get_template(template_id: str, version: str | None = None) -> TemplateSpec:
     try:
-        return TEMPLATES[template_id]
+        if version is None:
+            return TEMPLATES[template_id]
+        return TEMPLATE_VERSIONS[(template_id, version)]
     except KeyError as exc:
         raise HTTPException(status_code=400, detail="Unknown template_id") from exc
+
+
+def templates_dir() -> Path:
+    return Path(settings.templates_dir) if settings.templates_dir else BASE_DIR / "templates"
+
+
+def resolve_docx_path(template: TemplateSpec) -> Path:
+    path = Path(template.docx_path)
+    if not path.is_absolute():
+        path = (BASE_DIR / template.docx_path).resolve()
+    return path
+
+
+def load_templates(directory: Path | None = None) -> None:
+    """
+    Load built-in and file-backed specs, precompute their artifacts and swap them in.
+
+    Spec files (.json, or .yaml/.yml when PyYAML is installed) hold one spec or a
+    list of specs; a relative docx_path is resolved against the spec file's
+    directory. A file spec with the same id and version as a built-in replaces it.
+    Files that fail to parse are logged and skipped.
+    """
+    directory = directory or templates_dir()
+    specs: dict[tuple[str, str], TemplateSpec] = {
+        (spec.id, spec.version): spec.model_copy(deep=True) for spec in BUILTIN_TEMPLATES
+    }
+    for path in _spec_files(directory):
+        try:
+            for spec in _read_spec_file(path):
+                specs[(spec.id, spec.version)] = spec
+        except (OSError, ValueError, ValidationError) as exc:
+            logger.error("Skipping invalid template spec", exc_info=exc, extra={"path": str(path)})
+
+    latest: dict[str, TemplateSpec] = {}
+    for spec in specs.values():
+        spec.attach_artifacts(build_artifacts(spec))
+        current = latest.get(spec.id)
+        if current is None or _version_key(spec.version) > _version_key(current.version):
+            latest[spec.id] = spec
+
+    global TEMPLATES, TEMPLATE_VERSIONS
+    with _reload_lock:
+        TEMPLATE_VERSIONS = specs
+        TEMPLATES = latest
+    logger.info("Templates loaded", extra={"templates": sorted(f"{i}@{v}" for i, v in specs)})
+
+
+def build_artifacts(template: TemplateSpec) -> TemplateArtifacts:
+    docx_path = resolve_docx_path(template)
+    docx_bytes = docx_path.read_bytes() if docx_path.is_file() else None
+    return TemplateArtifacts(
+        prompt_parts=compile_prompt_parts(template.extraction),
+        output_schemas=_output_schemas(template),
+        docx_bytes=docx_bytes,
+        docx_sha256=hashlib.sha256(docx_bytes).hexdigest() if docx_bytes is not None else None,
+    )
+
+
+def start_hot_reload(interval: float | None = None, directory: Path | None = None) -> threading.Thread | None:
+    """
+    Poll the templates directory in a daemon thread and reload when files change.
+
+    Only the watcher touches the filesystem; get_template stays a dict lookup.
+    App entry points start it; importers such as render workers and tests do not.
+    """
+    global _watcher
+    interval = settings.template_reload_seconds if interval is None else interval
+    with _watcher_lock:
+        if interval <= 0 or (_watcher is not None and _watcher.is_alive()):
+            return _watcher
+        _watcher = threading.Thread(target=_watch, args=(interval, directory), name="template-reload", daemon=True)
+        _watcher.start()
+    return _watcher
+
+
+def _watch(interval: float, directory: Path | None) -> None:
+    fingerprint = _fingerprint(directory or templates_dir())
+    while True:
+        time.sleep(interval)
+        current = _fingerprint(directory or templates_dir())
+        if current == fingerprint:
+            continue
+        fingerprint = current
+        try:
+            load_templates(directory)
+        except Exception as exc:
+            logger.error("Template reload failed; keeping previous templates", exc_info=exc)
+
+
+def _spec_files(directory: Path) -> list[Path]:
+    if not directory.is_dir():
+        return []
+    return sorted(path for path in directory.iterdir() if path.suffix.lower() in SPEC_SUFFIXES)
+
+
+def _read_spec_file(path: Path) -> list[TemplateSpec]:
+    raw = path.read_text(encoding="utf-8")
+    if path.suffix.lower() == ".json":
+        data = json.loads(raw)
+    elif yaml is not None:
+        data = yaml.safe_load(raw)
+    else:
+        raise ValueError("PyYAML is not installed")
+
+    specs = [TemplateSpec.model_validate(item) for item in (data if isinstance(data, list) else [data])]
+    for spec in specs:
+        if not Path(spec.docx_path).is_absolute():
+            spec.docx_path = str((path.parent / spec.docx_path).resolve())
+    return specs
+
+
+def _fingerprint(directory: Path) -> tuple:
+    if not directory.is_dir():
+        return ()
+    entries = []
+    for path in sorted(directory.iterdir()):
+        if path.suffix.lower() in SPEC_SUFFIXES | {".docx"}:
+            stat = path.stat()
+            entries.append((path.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(entries)
+
+
+def _output_schemas(template: TemplateSpec) -> dict[str, dict[str, Any]]:
+    """Output schema per call type, with section codes restricted to the template's codes."""
+    codes = [section.code for section in template.extraction.predefined_sections]
+    schemas = {}
+    for task, model in (("full", MeetingExtraction), ("people", PeopleExtraction), ("sections", SectionsExtraction)):
+        schema = model.model_json_schema()
+        section = schema.get("$defs", {}).get("Section")
+        if section is not None:
+            section["properties"]["code"]["enum"] = codes
+        schemas[task] = schema
+    return schemas
+
+
+def _version_key(version: str) -> tuple:
+    parts = version.split(".")
+    if all(part.isdigit() for part in parts):
+        return (1, tuple(int(part) for part in parts))
+    return (0, version)
+
+
+load_templates()
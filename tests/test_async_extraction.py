@@ -0,0 +1,77 @@
+"""Test extract_meeting_model_async with a mocked AsyncOpenAI client."""
+import asyncio
+import json
+from unittest.mock import MagicMock, patch
+
+from llm_extractor import extract_meeting_model_async
+from models import MeetingMeta
+from template_registry import get_template
+
+
+META = MeetingMeta(
+    project="Test Project",
+    job_min_no="TEST-001",
+    description="Progress Meeting",
+    date="01/01/2024",
+    time="10:00",
+    location="Site Office",
+)
+
+VALID = json.dumps(
+    {
+        "meta": META.model_dump(),
+        "attendees": [{"name": "John Doe", "initials": "JD", "company": "Test Co"}],
+        "apologies": [],
+        "sections": [
+            {"code": s.code, "title": s.title, "notes": f"{s.title}."}
+            for s in get_template("progress_minutes_v1").extraction.predefined_sections
+        ],
+    }
+)
+
+
+def _response(text: str) -> MagicMock:
+    response = MagicMock()
+    response.output_text = text
+    return response
+
+
+def test_async_extraction_repairs_invalid_json():
+    calls = []
+
+    async def fake_create(**kwargs):
+        calls.append(kwargs["input"])
+        return _response(VALID if len(calls) > 1 else '{"meta": ')
+
+    with patch("llm_extractor.async_client") as mock_client:
+        mock_client.responses.create = fake_create
+        meeting = asyncio.run(extract_meeting_model_async("transcript", META, get_template("progress_minutes_v1")))
+
+    assert len(calls) == 2
+    assert "Broken JSON" in calls[1]
+    assert meeting.meta == META
+    assert [p.name for p in meeting.attendees] == ["John Doe"]
+
+
+def test_async_extractions_run_concurrently():
+    in_flight = 0
+    peak = 0
+
+    async def fake_create(**kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return _response(VALID)
+
+    async def run_many():
+        template = get_template("progress_minutes_v1")
+        return await asyncio.gather(*(extract_meeting_model_async("transcript", META, template) for _ in range(20)))
+
+    with patch("llm_extractor.async_client") as mock_client:
+        mock_client.responses.create = fake_create
+        meetings = asyncio.run(run_many())
+
+    assert len(meetings) == 20
+    assert peak == 20
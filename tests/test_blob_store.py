@@ -0,0 +1,83 @@
+"""Test streaming uploads into a blob store."""
+import asyncio
+import hashlib
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from blob_store import MULTIPART_OVERHEAD_BYTES, LocalBlobStore, UploadLimitMiddleware, save_upload
+
+
+def test_save_upload_streams_to_store(tmp_path):
+    content = b"Speaker 1: hello\n" * 1000
+    store = LocalBlobStore(tmp_path)
+    upload = UploadFile(io.BytesIO(content), filename="meeting.txt")
+
+    ref = asyncio.run(save_upload(upload, store, max_bytes=len(content), chunk_size=1024))
+
+    assert ref.size == len(content)
+    assert ref.filename == "meeting.txt"
+    assert ref.sha256 == hashlib.sha256(content).hexdigest()
+    assert store.read(ref.key) == content
+
+
+def test_save_upload_rejects_oversized_file(tmp_path):
+    store = LocalBlobStore(tmp_path)
+    upload = UploadFile(io.BytesIO(b"x" * 5000), filename="big.txt")
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(save_upload(upload, store, max_bytes=4096, chunk_size=1024))
+
+    assert exc_info.value.status_code == 413
+    # Partial blob is cleaned up
+    assert not any(path.is_file() for path in tmp_path.rglob("*"))
+
+
+def _call_limited(headers: list[tuple[bytes, bytes]], chunks: list[bytes]) -> tuple[list[dict], int]:
+    """Send a request through UploadLimitMiddleware; return what it sent back and the body bytes the app read."""
+    messages = [{"type": "http.request", "body": chunk, "more_body": True} for chunk in chunks]
+    messages.append({"type": "http.request", "body": b"", "more_body": False})
+    sent, read = [], 0
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    async def app(scope, receive, send):
+        nonlocal read
+        while True:
+            message = await receive()
+            read += len(message["body"])
+            if not message["more_body"]:
+                break
+
+    scope = {"type": "http", "method": "POST", "path": "/transform", "headers": headers}
+    asyncio.run(UploadLimitMiddleware(app, max_bytes=4096)(scope, receive, send))
+    return sent, read
+
+
+def test_upload_limit_rejects_on_content_length_before_reading_the_body():
+    length = str(4096 + MULTIPART_OVERHEAD_BYTES + 1).encode()
+
+    sent, read = _call_limited([(b"content-length", length)], [b"x" * 1024])
+
+    assert sent[0]["status"] == 413
+    assert read == 0
+
+
+def test_upload_limit_stops_a_chunked_body_at_the_limit():
+    chunks = [b"x" * 16 * 1024] * 10
+
+    with pytest.raises(HTTPException) as exc_info:
+        _call_limited([], chunks)
+
+    assert exc_info.value.status_code == 413
+
+
+def test_upload_limit_passes_bodies_within_the_limit():
+    sent, read = _call_limited([(b"content-length", b"4096")], [b"x" * 4096])
+
+    assert sent == [] and read == 4096
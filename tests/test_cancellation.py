@@ -0,0 +1,150 @@
+"""Test that cancelled requests abort their in-flight work (LLM calls, coalesced calls)."""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from cancellation import ClientDisconnected, cancel_on_disconnect
+from coalescing import DistributedSingleFlight, LocalInflightStore, SingleFlight
+from llm_extractor import extract_meeting_model_async
+from models import MeetingMeta
+from template_registry import get_template
+from usage import UsageLedger
+
+
+META = MeetingMeta(
+    project="Test Project",
+    job_min_no="TEST-001",
+    description="Progress Meeting",
+    date="01/01/2024",
+    time="10:00",
+    location="Site Office",
+)
+
+
+class _Request:
+    """Stands in for a Starlette request whose client disconnects after `after` polls."""
+
+    def __init__(self, after: int):
+        self.after = after
+        self.url = type("URL", (), {"path": "/transform"})()
+
+    async def is_disconnected(self) -> bool:
+        self.after -= 1
+        return self.after < 0
+
+
+def test_disconnect_cancels_in_flight_llm_call_and_records_it():
+    started = asyncio.Event()
+    aborted = []
+
+    async def fake_create(**kwargs):
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            aborted.append(kwargs["model"])
+            raise
+
+    async def run():
+        work = extract_meeting_model_async("transcript", META, get_template("progress_minutes_v1"))
+        with patch("cancellation.DISCONNECT_POLL_SECONDS", 0.01):
+            await cancel_on_disconnect(_Request(after=1), work)
+
+    with patch("llm_extractor.async_client") as mock_client, patch("usage.ledger", UsageLedger()) as ledger:
+        mock_client.responses.create = fake_create
+        with pytest.raises(ClientDisconnected):
+            asyncio.run(run())
+
+    assert started.is_set()
+    assert len(aborted) == 1
+    assert ledger.cancellations()["calls"] == 1
+    assert ledger.cancellations()["output_tokens_avoided"] > 0
+    assert ledger.summary() == []
+
+
+def test_single_flight_cancels_work_only_when_last_waiter_leaves():
+    cancelled = asyncio.Event()
+
+    async def work():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def run():
+        flight = SingleFlight()
+        first = asyncio.ensure_future(flight.run("key", work))
+        second = asyncio.ensure_future(flight.run("key", work))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        await asyncio.sleep(0.01)
+        assert not cancelled.is_set()
+        assert flight.inflight("key")
+
+        second.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+        await asyncio.sleep(0)
+        assert not flight.inflight("key")
+
+    asyncio.run(run())
+
+
+def test_distributed_leader_cancellation_cancels_spawned_call():
+    cancelled_calls = []
+    store = LocalInflightStore()
+
+    async def spawn():
+        return "fc-1"
+
+    async def wait(call_id):
+        await asyncio.sleep(10)
+
+    async def cancel(call_id):
+        cancelled_calls.append(call_id)
+
+    async def run():
+        leader = asyncio.ensure_future(DistributedSingleFlight(store).run("key", spawn, wait, cancel))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert await store.get("key") is None
+
+    asyncio.run(run())
+    assert cancelled_calls == ["fc-1"]
+
+
+def test_distributed_leader_leaves_call_running_for_followers():
+    cancelled_calls = []
+    store = LocalInflightStore()
+
+    async def spawn():
+        return "fc-1"
+
+    async def cancel(call_id):
+        cancelled_calls.append(call_id)
+
+    async def run():
+        done = asyncio.Event()
+
+        async def wait(call_id):
+            await done.wait()
+            return "minutes"
+
+        flight = DistributedSingleFlight(store)
+        leader = asyncio.ensure_future(flight.run("key", spawn, wait, cancel))
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(flight.run("key", spawn, wait, cancel))
+        await asyncio.sleep(0.01)
+
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        done.set()
+        return await follower
+
+    assert asyncio.run(run()) == ("minutes", True)
+    assert cancelled_calls == []
@@ -0,0 +1,95 @@
+"""Test per-stage checkpoints of the async pipeline and their TTL sweep."""
+import asyncio
+import json
+import os
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+from checkpoints import JobCheckpoints, sweep_expired
+from models import MeetingMeta
+from pipeline import run_pipeline_async
+from template_registry import get_template
+
+
+META = MeetingMeta(
+    project="Test Project",
+    job_min_no="TEST-001",
+    description="Progress Meeting",
+    date="01/01/2024",
+    time="10:00",
+    location="Site Office",
+)
+TRANSCRIPT = b"Alice Smith: The pour is next week.\nBob Jones: Agreed.\n"
+VALID = json.dumps(
+    {
+        "meta": META.model_dump(),
+        "attendees": [{"name": "Alice Smith", "initials": "AS", "company": "Test Co"}],
+        "apologies": [],
+        "sections": [
+            {"code": s.code, "title": s.title, "notes": f"{s.title}."}
+            for s in get_template("progress_minutes_v1").extraction.predefined_sections
+        ],
+    }
+)
+
+
+def test_retry_after_render_failure_resumes_without_llm_call(tmp_path):
+    template = get_template("progress_minutes_v1")
+    checkpoints = JobCheckpoints(tmp_path, "job1")
+    calls = []
+    reads = []
+
+    async def fake_create(**kwargs):
+        calls.append(kwargs["model"])
+        usage = SimpleNamespace(input_tokens=100, output_tokens=20)
+        return SimpleNamespace(output_text=VALID, usage=usage)
+
+    async def read_upload():
+        reads.append(1)
+        return TRANSCRIPT
+
+    async def run():
+        return await run_pipeline_async(read_upload, "t.txt", META, template, checkpoints=checkpoints)
+
+    with patch("llm_extractor.async_client") as mock_client:
+        mock_client.responses.create = fake_create
+        with patch("pipeline.render_async", side_effect=HTTPException(status_code=504, detail="timeout")):
+            with pytest.raises(HTTPException):
+                asyncio.run(run())
+        result = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert len(reads) == 1
+    assert json.loads(result["minutes_json"])["attendees"][0]["name"] == "Alice Smith"
+    # The retry reports the tokens the checkpointed extraction cost
+    assert json.loads(result["usage_json"])["total_tokens"] == 120
+    assert checkpoints.load_docx() is not None
+
+    checkpoints.clear()
+    assert not checkpoints.path.exists()
+
+
+def test_invalid_job_key_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        JobCheckpoints(tmp_path, "../uploads")
+
+
+def test_sweep_removes_only_expired_entries(tmp_path):
+    old = tmp_path / "old"
+    old.mkdir()
+    (old / "transcript.json").write_text("{}")
+    fresh = tmp_path / "fresh"
+    fresh.mkdir()
+    (fresh / "transcript.json").write_text("{}")
+    expired = time.time() - 7200
+    for path in (old, old / "transcript.json"):
+        os.utime(path, (expired, expired))
+
+    assert sweep_expired(tmp_path, ttl_seconds=3600) == 1
+    assert not old.exists()
+    assert fresh.exists()
+    assert sweep_expired(tmp_path / "missing", ttl_seconds=3600) == 0
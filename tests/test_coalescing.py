@@ -0,0 +1,60 @@
+"""Test single-flight coalescing of identical requests."""
+import asyncio
+
+from coalescing import DistributedSingleFlight, LocalInflightStore, SingleFlight, request_key
+
+
+def test_request_key_depends_on_content_template_and_meta():
+    base = dict(content_sha256="abc", filename="a.txt", template_id="t1", meta={"project": "P", "date": "01/01/2024"})
+
+    assert request_key(**base) == request_key(**{**base, "meta": {"date": "01/01/2024", "project": "P"}})
+    assert request_key(**base) != request_key(**{**base, "template_id": "t2"})
+    assert request_key(**base) != request_key(**{**base, "content_sha256": "abd"})
+
+
+def test_single_flight_runs_work_once_for_concurrent_callers():
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"minutes": "ok"}
+
+    async def main():
+        flight = SingleFlight()
+        return await asyncio.gather(*(flight.run("key", work) for _ in range(5)))
+
+    results = asyncio.run(main())
+
+    assert calls == 1
+    assert all(result == {"minutes": "ok"} for result in results)
+
+
+def test_distributed_single_flight_attaches_to_leader_call():
+    store = LocalInflightStore()
+    spawned: list[str] = []
+
+    async def spawn():
+        await asyncio.sleep(0.01)
+        spawned.append("call-1")
+        return "call-1"
+
+    async def wait(call_id):
+        # Long enough for the follower to poll the published call id
+        await asyncio.sleep(0.5)
+        return f"result of {call_id}"
+
+    async def main():
+        # Two "containers" sharing one store
+        first = DistributedSingleFlight(store)
+        second = DistributedSingleFlight(store)
+        return await asyncio.gather(first.run("key", spawn, wait), second.run("key", spawn, wait))
+
+    results = asyncio.run(main())
+
+    assert spawned == ["call-1"]
+    assert sorted(coalesced for _, coalesced in results) == [False, True]
+    assert all(result == "result of call-1" for result, _ in results)
+    # Claim is released once the call has finished
+    assert asyncio.run(store.get("key")) is None
@@ -0,0 +1,124 @@
+"""Test DOCX output optimization: savings, and that the package still opens with the same content."""
+import copy
+import io
+import struct
+import zipfile
+import zlib
+from unittest.mock import patch
+
+from docx import Document
+from lxml import etree
+
+from docx_optimizer import RELATIONSHIPS, optimize_docx
+from models import ActionItem, MeetingMeta, MeetingModel, Person, Section
+from renderer import render_docx
+from template_registry import get_template
+
+R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+A = "http://schemas.openxmlformats.org/drawingml/2006/main"
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def _png() -> bytes:
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(b"\0\xff\0\0")) + chunk(b"IEND", b"")
+
+
+def _assert_package_is_consistent(data: bytes) -> None:
+    """Every relationship target exists and every part has a content type, as Word requires."""
+    archive = zipfile.ZipFile(io.BytesIO(data))
+    assert archive.testzip() is None
+    names = set(archive.namelist())
+    assert archive.namelist()[0] == "[Content_Types].xml"
+    types = etree.fromstring(archive.read("[Content_Types].xml"))
+    defaults = {element.get("Extension") for element in types if element.tag.endswith("Default")}
+    overrides = {element.get("PartName").lstrip("/") for element in types if element.tag.endswith("Override")}
+    assert overrides <= names
+    for name in names:
+        assert name in overrides or name.rsplit(".", 1)[-1] in defaults
+        if name.endswith(".rels"):
+            base = name.split("_rels/")[0]
+            for rel in etree.fromstring(archive.read(name)).iter(f"{{{RELATIONSHIPS}}}Relationship"):
+                if rel.get("TargetMode") != "External":
+                    target = zipfile.Path(archive, base).joinpath(rel.get("Target"))
+                    assert target.exists(), (name, rel.get("Target"))
+
+
+def test_rendered_minutes_shrink_and_round_trip():
+    meeting = MeetingModel(
+        meta=MeetingMeta(
+            project="Site A",
+            job_min_no="JOB-001",
+            description="Progress Meeting",
+            date="01/01/2024",
+            time="10:00",
+            location="Site Office",
+        ),
+        attendees=[Person(name="Alice Smith", company="Acme")],
+        sections=[
+            Section(code="2", title="Progress", notes="Scaffold up.", actions=[ActionItem(action="Book crane")]),
+        ],
+    )
+    with patch("renderer.settings.docx_optimize", False):
+        original = render_docx(get_template("progress_minutes_v1"), meeting)
+
+    optimized, savings = optimize_docx(original)
+
+    assert savings.bytes_before == len(original)
+    assert savings.saved > 0 and savings.styles_removed > 0
+    _assert_package_is_consistent(optimized)
+    before, after = Document(io.BytesIO(original)), Document(io.BytesIO(optimized))
+    assert [(p.style.name, p.text) for p in after.paragraphs] == [(p.style.name, p.text) for p in before.paragraphs]
+    assert [[cell.text for cell in row.cells] for row in after.tables[0].rows] == [
+        [cell.text for cell in row.cells] for row in before.tables[0].rows
+    ]
+    # Optimizing again finds nothing left to remove
+    _, again = optimize_docx(optimized)
+    assert (again.styles_removed, again.numbering_removed, again.custom_xml_removed) == (0, 0, 0)
+
+
+def test_identical_media_are_stored_once():
+    document = Document()
+    document.add_picture(io.BytesIO(_png()))
+    buffer = io.BytesIO()
+    document.save(buffer)
+
+    # Make a second picture that points at a byte-identical copy of the image
+    source = zipfile.ZipFile(io.BytesIO(buffer.getvalue()))
+    parts = {name: source.read(name) for name in source.namelist()}
+    image = next(name for name in parts if name.startswith("word/media/"))
+    copy_name = image.replace("image1", "image_copy")
+    parts[copy_name] = parts[image]
+    rels = etree.fromstring(parts["word/_rels/document.xml.rels"])
+    etree.SubElement(
+        rels,
+        f"{{{RELATIONSHIPS}}}Relationship",
+        Id="rIdCopy",
+        Type=f"{R}/image",
+        Target=copy_name.removeprefix("word/"),
+    )
+    parts["word/_rels/document.xml.rels"] = etree.tostring(rels)
+    body = etree.fromstring(parts["word/document.xml"])
+    paragraph = next(body.iter(f"{{{A}}}blip")).getparent()
+    while paragraph.tag != f"{{{W}}}p":
+        paragraph = paragraph.getparent()
+    duplicate = copy.deepcopy(paragraph)
+    next(duplicate.iter(f"{{{A}}}blip")).set(f"{{{R}}}embed", "rIdCopy")
+    paragraph.addnext(duplicate)
+    parts["word/document.xml"] = etree.tostring(body)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as target:
+        for name, data in parts.items():
+            target.writestr(name, data)
+
+    optimized, savings = optimize_docx(buffer.getvalue())
+
+    assert savings.media_deduplicated == 1
+    assert [name for name in zipfile.ZipFile(io.BytesIO(optimized)).namelist() if "media" in name] == [image]
+    _assert_package_is_consistent(optimized)
+    shapes = Document(io.BytesIO(optimized)).inline_shapes
+    assert len(shapes) == 2
+
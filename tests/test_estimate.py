@@ -0,0 +1,83 @@
+"""Test the /estimate preflight: prompt sizes, truncation, cost and latency, with no LLM call."""
+from unittest.mock import patch
+
+import pytest
+
+from estimate import JobTimings, estimate_transcript
+from llm_extractor import MAX_TRANSCRIPT_CHARS, section_groups
+from model_routing import strong_model
+from models import MeetingMeta
+from template_registry import get_template
+from tokens import estimate_tokens
+
+
+META = MeetingMeta(
+    project="Test Project",
+    job_min_no="TEST-001",
+    description="Progress Meeting",
+    date="01/01/2024",
+    time="10:00",
+    location="Site Office",
+)
+TRANSCRIPT = (
+    b"Alice Smith: The pour is next week.\nBob Jones: Agreed, the crane is booked.\n"
+    b"Alice Smith: Good.\nBob Jones: I will confirm the date.\n"
+)
+
+
+def test_single_mode_estimate_counts_the_prompt_and_prices_it():
+    template = get_template("progress_minutes_v1")
+
+    with (
+        patch("llm_extractor.client") as mock_client,
+        patch("llm_extractor.async_client") as mock_async_client,
+        patch("estimate.settings.model_prices", {strong_model(template.routing): (1.0, 10.0)}),
+        patch("llm_extractor.settings.extraction_mode", "single"),
+    ):
+        estimate = estimate_transcript(TRANSCRIPT, "t.txt", META, template)
+
+    mock_client.responses.create.assert_not_called()
+    mock_async_client.responses.create.assert_not_called()
+    assert estimate.mode == "single"
+    assert estimate.speakers == 2
+    assert estimate.tokens == estimate_tokens(estimate.characters)
+    assert not estimate.truncated and estimate.characters_dropped == 0
+    assert len(estimate.calls) == 1
+    # The prompt wraps the transcript in instructions and the template sections
+    assert estimate.input_tokens > estimate.tokens
+    expected = (estimate.input_tokens * 1.0 + estimate.output_tokens * 10.0) / 1_000_000
+    assert estimate.cost_usd == pytest.approx(expected, abs=1e-4)
+    assert estimate.latency_seconds is None
+
+
+def test_parallel_estimate_reports_truncation_and_one_call_per_group():
+    template = get_template("progress_minutes_v1")
+    line = "Alice Smith: The concrete pour for the east wing slab is scheduled for next week.\n"
+    transcript = (line * (MAX_TRANSCRIPT_CHARS // len(line) + 100)).encode()
+
+    with patch("llm_extractor.settings.extraction_mode", "parallel"), patch("estimate.settings.model_prices", {}):
+        estimate = estimate_transcript(transcript, "t.txt", META, template)
+
+    assert estimate.truncated
+    assert estimate.characters_dropped == estimate.characters - MAX_TRANSCRIPT_CHARS
+    assert estimate.retrieval
+    assert len(estimate.calls) == 1 + len(section_groups(template.extraction))
+    # Section calls get excerpts, far smaller than the truncated transcript
+    assert max(call.prompt_tokens for call in estimate.calls[1:]) < estimate_tokens(MAX_TRANSCRIPT_CHARS) // 4
+    assert estimate.cost_usd is None
+
+
+def test_latency_prediction_uses_the_size_bucket_then_a_fitted_line():
+    timings = JobTimings(window=50)
+    assert timings.predict(1000) == (None, 0)
+
+    for tokens, seconds in [(1000, 10.0), (1100, 12.0), (4000, 40.0), (16000, 160.0), (32000, 320.0)]:
+        timings.record(tokens, seconds)
+    # Too few in 1000's bucket: fitted line through all five (seconds = tokens / 100)
+    predicted, samples = timings.predict(8000)
+    assert samples == 5
+    assert predicted == pytest.approx(80.0, rel=0.05)
+
+    for seconds in (11.0, 13.0, 14.0, 12.0):
+        timings.record(1000, seconds)
+    assert timings.predict(1000) == (12.0, 5)
@@ -0,0 +1,124 @@
+"""Test the hedging policy and hedged calls on the async client."""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from hedging import HedgePolicy, LatencyTracker
+from llm_extractor import _create_response_async
+from model_routing import CallOptions
+
+
+def _policy(**overrides) -> HedgePolicy:
+    config = {"percentile": 90, "min_samples": 5, "window": 100, "max_rate": 0.5, "hedge_model": "backup"}
+    return HedgePolicy(**{**config, **overrides})
+
+
+def test_percentile_is_per_deployment_and_size_bucket():
+    tracker = LatencyTracker(window=100)
+    for seconds in range(1, 11):
+        tracker.record("gpt", 1000, float(seconds))
+
+    assert tracker.percentile("gpt", 1000, 90, min_samples=5) == 9.0
+    # Same power-of-two bucket
+    assert tracker.percentile("gpt", 900, 50, min_samples=5) == 5.0
+    assert tracker.percentile("gpt", 5000, 90, min_samples=5) is None
+    assert tracker.percentile("other", 1000, 90, min_samples=5) is None
+    assert tracker.percentile("gpt", 1000, 90, min_samples=11) is None
+
+
+def test_hedge_rate_is_capped():
+    policy = _policy(max_rate=0.25)
+    options = CallOptions(model="gpt")
+    for _ in range(8):
+        policy.hedge_delay(options, 1000)
+
+    assert [policy.admit_hedge() for _ in range(4)] == [True, True, False, False]
+    assert policy.stats()["hedges"] == 2
+
+
+def test_disabled_policy_never_hedges():
+    policy = _policy(percentile=0)
+    for _ in range(10):
+        policy.latencies.record("gpt", 1000, 1.0)
+
+    assert policy.hedge_delay(CallOptions(model="gpt"), 1000) is None
+
+
+def test_slow_call_is_hedged_to_backup_deployment_and_loser_cancelled():
+    policy = _policy()
+    prompt = "x" * 4000
+    for _ in range(10):
+        policy.latencies.record("gpt", 1000, 0.01)
+    for _ in range(4):
+        policy.hedge_delay(CallOptions(model="gpt"), 1000)
+    cancelled = []
+
+    async def fake_create(**kwargs):
+        try:
+            await asyncio.sleep(5 if kwargs["model"] == "gpt" else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(kwargs["model"])
+            raise
+        return SimpleNamespace(output_text=kwargs["model"], usage=None)
+
+    async def run():
+        response = await _create_response_async(prompt, CallOptions(model="gpt"))
+        await asyncio.sleep(0.01)  # let the cancelled primary unwind
+        return response
+
+    with patch("llm_extractor.get_hedge_policy", return_value=policy), patch(
+        "llm_extractor.async_client"
+    ) as mock_client:
+        mock_client.responses.create = fake_create
+        response = asyncio.run(run())
+
+    assert response.output_text == "backup"
+    assert cancelled == ["gpt"]
+    assert policy.stats() == {"calls": 5, "hedges": 1, "hedge_wins": 1}
+    # The beaten primary counts once, at the time it had taken; the hedge counts for its own deployment
+    assert policy.latencies.percentile("gpt", 1000, 100, min_samples=11) > 0.01
+    assert policy.latencies.percentile("gpt", 1000, 100, min_samples=12) is None
+    assert policy.latencies.percentile("backup", 1000, 100, min_samples=1) is not None
+
+
+def test_call_cancelled_by_its_caller_records_no_latency():
+    policy = _policy()
+    for _ in range(10):
+        policy.latencies.record("gpt", 1000, 1.0)
+
+    async def fake_create(**kwargs):
+        await asyncio.sleep(5)
+
+    async def run():
+        call = asyncio.ensure_future(_create_response_async("x" * 4000, CallOptions(model="gpt")))
+        await asyncio.sleep(0.01)
+        call.cancel()  # the client disconnected
+        await asyncio.gather(call, return_exceptions=True)
+
+    with patch("llm_extractor.get_hedge_policy", return_value=policy), patch(
+        "llm_extractor.async_client"
+    ) as mock_client:
+        mock_client.responses.create = fake_create
+        asyncio.run(run())
+
+    assert policy.latencies.percentile("gpt", 1000, 100, min_samples=11) is None
+
+
+def test_fast_call_is_not_hedged():
+    policy = _policy()
+    for _ in range(10):
+        policy.latencies.record("gpt", 1000, 1.0)
+    models = []
+
+    async def fake_create(**kwargs):
+        models.append(kwargs["model"])
+        return SimpleNamespace(output_text="{}", usage=None)
+
+    with patch("llm_extractor.get_hedge_policy", return_value=policy), patch(
+        "llm_extractor.async_client"
+    ) as mock_client:
+        mock_client.responses.create = fake_create
+        asyncio.run(_create_response_async("x" * 4000, CallOptions(model="gpt")))
+
+    assert models == ["gpt"]
+    assert policy.stats()["hedges"] == 0
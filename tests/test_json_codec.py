@@ -0,0 +1,27 @@
+"""Test the pre-serialized /transform response body."""
+import json
+
+from json_codec import model_json, transform_response_body
+from models import ActionItem, MeetingMeta, MeetingModel, Section
+
+
+def test_transform_response_body_matches_dict_serialization():
+    meeting = MeetingModel(
+        meta=MeetingMeta(
+            project="Café “Project”",
+            job_min_no="1",
+            description="Progress Meeting",
+            date="01/01/2024",
+            time="10:00",
+            location="Site",
+        ),
+        sections=[Section(code="1", title="Intro", actions=[ActionItem(action='Say "hi"')])],
+    )
+
+    body = transform_response_body(request_id="abc", minutes_json=model_json(meeting), docx_base64="UEsDBA==")
+
+    assert json.loads(body) == {
+        "request_id": "abc",
+        "minutes": meeting.model_dump(),
+        "docx_base64": "UEsDBA==",
+    }
@@ -109,3 +109,30 @@ def test_json_repair_failure():
 
         assert exc_info.value.status_code == 502
         assert "repair call failed" in exc_info.value.detail
+
+
+def test_extract_meeting_model_repairs_invalid_json_in_json_mode():
+    """Syntax errors from the fast validate_json path go through the repair call."""
+    from llm_extractor import extract_meeting_model
+
+    meta = MeetingMeta(
+        project="Test Project",
+        job_min_no="TEST-001",
+        description="Test Meeting",
+        date="01/01/2024",
+        time="10:00",
+        location="Test Location",
+    )
+    sections = [
+        {"code": s.code, "title": s.title} for s in get_template("progress_minutes_v1").extraction.predefined_sections
+    ]
+    valid = json.dumps({"meta": meta.model_dump(), "sections": sections})
+    broken = MagicMock(output_text=valid[:-1])
+    repaired = MagicMock(output_text=valid)
+
+    with patch('llm_extractor.client') as mock_client:
+        mock_client.responses.create.side_effect = [broken, repaired]
+        meeting = extract_meeting_model("transcript", meta, get_template("progress_minutes_v1"))
+
+    assert mock_client.responses.create.call_count == 2
+    assert meeting.sections[0].title == "Introductions"
@@ -0,0 +1,88 @@
+"""Peak-memory regression tests for the low-memory pipeline mode (tracemalloc)."""
+import asyncio
+import gc
+import json
+import tracemalloc
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import llm_extractor
+from llm_extractor import extract_meeting_model
+from models import MeetingMeta
+from pipeline import run_pipeline_async
+from template_registry import get_template
+from transcript_loader import load_transcript_with_speakers
+
+
+META = MeetingMeta(
+    project="Test Project",
+    job_min_no="TEST-001",
+    description="Progress Meeting",
+    date="01/01/2024",
+    time="10:00",
+    location="Site Office",
+)
+
+LINE = "Alice Smith: The concrete pour on level three is scheduled for next week.\n"
+LARGE = (LINE * (150_000 // len(LINE))).encode("utf-8")
+SMALL = (LINE * 10).encode("utf-8")
+
+
+async def _fake_create_async(**kwargs):
+    return _fake_create(**kwargs)
+
+
+def _fake_create(**kwargs):
+    """First answer is broken JSON so every run also goes through the repair call."""
+    # A plain object: MagicMock would allocate child mocks for every attribute read
+    response = SimpleNamespace(output_text='{"meta": ', usage=None)
+    if "Broken JSON" in kwargs["input"]:
+        response.output_text = json.dumps(
+            {
+                "meta": META.model_dump(),
+                "attendees": [],
+                "apologies": [],
+                "sections": [
+                    {"code": s.code, "title": s.title, "notes": f"{s.title}."}
+                    for s in get_template("progress_minutes_v1").extraction.predefined_sections
+                ],
+            }
+        )
+    return response
+
+
+def _peak(func) -> int:
+    func()  # warm caches and lazily built templates outside the measurement
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_low_memory_extraction_holds_at_most_two_transcript_copies():
+    template = get_template("progress_minutes_v1")
+    transcript = load_transcript_with_speakers(LARGE, "transcript.txt")
+
+    with patch.object(llm_extractor.settings, "low_memory", True), patch("llm_extractor.client") as mock_client:
+        mock_client.responses.create.side_effect = _fake_create
+        peak = _peak(lambda: extract_meeting_model(transcript.text, META, template, speakers=transcript.speakers))
+
+    assert peak < 2 * len(LARGE)
+
+
+def test_low_memory_pipeline_peak_does_not_scale_past_transcript_budget():
+    template = get_template("progress_minutes_v1")
+
+    def run(data: bytes) -> None:
+        asyncio.run(run_pipeline_async(data, "transcript.txt", META, template))
+
+    with patch.object(llm_extractor.settings, "low_memory", True), patch("llm_extractor.async_client") as mock_client:
+        mock_client.responses.create = _fake_create_async
+        baseline = _peak(lambda: run(SMALL))
+        peak = _peak(lambda: run(LARGE))
+
+    # Rendering has a fixed cost; whatever the transcript adds on top must stay bounded
+    assert peak - baseline < 2 * len(LARGE)
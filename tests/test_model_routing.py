@@ -0,0 +1,53 @@
+"""Test the per-template model cascade policy."""
+from model_routing import escalation_options, section_group_task, select_call_options
+from models import RoutingTier, TemplateRoutingSpec, TemplateSectionSpec
+from template_registry import get_template
+
+
+ROUTING = TemplateRoutingSpec(
+    fast_model="fast",
+    strong_model="strong",
+    size_tiers=[
+        RoutingTier(max_chars=1000, reasoning_effort="low", max_output_tokens=2000),
+        RoutingTier(reasoning_effort="high", max_output_tokens=8000),
+    ],
+)
+
+
+def test_easy_tasks_use_fast_model_and_size_picks_tier():
+    people = select_call_options(ROUTING, task="people", transcript_chars=500)
+    sections = select_call_options(ROUTING, task="sections", transcript_chars=50000)
+
+    assert people.model == "fast"
+    assert people.request_kwargs() == {
+        "model": "fast",
+        "reasoning": {"effort": "low"},
+        "max_output_tokens": 2000,
+    }
+    assert sections.model == "strong"
+    assert sections.reasoning_effort == "high"
+
+
+def test_builtin_template_sends_only_the_model():
+    routing = get_template("progress_minutes_v1").routing
+
+    for chars in (10, 50000, 500000):
+        options = select_call_options(routing, task="full", transcript_chars=chars)
+        assert set(options.request_kwargs()) == {"model"}
+
+
+def test_escalation_only_from_fast_model():
+    fast = select_call_options(ROUTING, task="dates", transcript_chars=10)
+    strong = select_call_options(ROUTING, task="full", transcript_chars=10)
+
+    assert escalation_options(ROUTING, fast).model == "strong"
+    assert escalation_options(ROUTING, strong) is None
+
+
+def test_contract_dates_group_is_dates_task():
+    dates = [TemplateSectionSpec(code="6", title="Contract Dates")]
+    mixed = dates + [TemplateSectionSpec(code="3", title="Health & Safety")]
+
+    assert section_group_task(dates, wants_dates=True) == "dates"
+    assert section_group_task(mixed, wants_dates=True) == "sections"
+    assert section_group_task(dates, wants_dates=False) == "sections"
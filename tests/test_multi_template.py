@@ -0,0 +1,132 @@
+"""Test several templates served by one extraction: combining specs, projecting minutes, one LLM call."""
+import asyncio
+import base64
+import io
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from docx import Document
+from fastapi import HTTPException
+
+from models import ActionItem, MeetingMeta, MeetingModel, Section, TemplateSectionSpec
+from multi_template import combine_templates, project_meeting
+from pipeline import run_pipeline_multi_async
+from template_registry import get_template
+
+
+META = MeetingMeta(
+    project="Test Project",
+    job_min_no="TEST-001",
+    description="Progress Meeting",
+    date="01/01/2024",
+    time="10:00",
+    location="Site Office",
+)
+
+
+def _summary_template():
+    """A short client summary: progress first, then a section the full minutes do not have."""
+    full = get_template("progress_minutes_v1")
+    by_code = {spec.code: spec for spec in full.extraction.predefined_sections}
+    extraction = full.extraction.model_copy(
+        update={
+            "predefined_sections": [
+                TemplateSectionSpec(code="2", title="Works Update", aliases=[by_code["2"].title]),
+                TemplateSectionSpec(code="1", title=by_code["1"].title),
+                TemplateSectionSpec(code="10", title="Client Matters"),
+            ],
+            "wants_actions": False,
+            "section_groups": [["2", "10"]],
+        }
+    )
+    return full.model_copy(update={"id": "client_summary_v1", "label": "Client Summary", "extraction": extraction})
+
+
+def test_compatible_templates_combine_into_the_union_of_sections():
+    full, summary = get_template("progress_minutes_v1"), _summary_template()
+
+    combined = combine_templates([full, summary])
+
+    codes = [spec.code for spec in combined.extraction.predefined_sections]
+    assert codes == [spec.code for spec in full.extraction.predefined_sections] + ["10"]
+    progress = combined.extraction.predefined_sections[codes.index("2")]
+    assert "Works Update" in progress.aliases
+    assert combined.id == "progress_minutes_v1+client_summary_v1"
+    assert combined.extraction.wants_actions
+    grouped = [code for group in combined.extraction.section_groups for code in group]
+    assert len(grouped) == len(set(grouped)) and "10" in grouped
+    assert combined.artifacts is None
+    assert combine_templates([full]) is full
+
+
+def test_templates_that_disagree_on_a_section_code_are_rejected():
+    full = get_template("progress_minutes_v1")
+    clash = _summary_template()
+    clash.extraction.predefined_sections[1] = TemplateSectionSpec(code="1", title="Budget")
+
+    with pytest.raises(HTTPException) as excinfo:
+        combine_templates([full, clash])
+
+    assert excinfo.value.status_code == 400
+    assert "section 1" in excinfo.value.detail
+
+
+def test_projection_follows_each_template():
+    full, summary = get_template("progress_minutes_v1"), _summary_template()
+    combined = combine_templates([full, summary])
+    meeting = MeetingModel(
+        meta=META,
+        sections=[
+            Section(code="2", title="Progress", notes="On track.", actions=[ActionItem(action="Book crane")]),
+            Section(code="10", title="Client Matters", notes="Invoice queried."),
+            Section(code="99", title="Any Other Business", notes="None."),
+        ],
+    )
+
+    projected = project_meeting(meeting, summary, combined)
+
+    assert [(s.code, s.title) for s in projected.sections] == [
+        ("2", "Works Update"),
+        ("1", full.extraction.predefined_sections[0].title),
+        ("10", "Client Matters"),
+        ("99", "Any Other Business"),
+    ]
+    assert projected.sections[0].notes == "On track." and projected.sections[0].actions == []
+    minutes = project_meeting(meeting, full, combined)
+    assert [s.code for s in minutes.sections] == [s.code for s in full.extraction.predefined_sections] + ["99"]
+    assert minutes.sections[1].actions[0].action == "Book crane"
+
+
+def test_one_llm_call_renders_a_document_per_template():
+    full, summary = get_template("progress_minutes_v1"), _summary_template()
+    combined = combine_templates([full, summary])
+    prompts = []
+
+    async def fake_create(**kwargs):
+        prompts.append(kwargs["input"])
+        sections = [
+            {"code": spec.code, "title": spec.title, "notes": f"Notes {spec.code}."}
+            for spec in combined.extraction.predefined_sections
+        ]
+        payload = {"meta": META.model_dump(), "attendees": [], "apologies": [], "sections": sections}
+        return MagicMock(output_text=json.dumps(payload))
+
+    with (
+        patch("llm_extractor.async_client") as mock_client,
+        patch("llm_extractor.settings.extraction_mode", "single"),
+        patch("pipeline.store_result"),
+    ):
+        mock_client.responses.create = fake_create
+        result = asyncio.run(
+            run_pipeline_multi_async(b"Alice: The pour is next week.", "t.txt", META, [full, summary])
+        )
+
+    assert len(prompts) == 1
+    assert "Client Matters" in prompts[0]
+    assert [document["template_id"] for document in result["documents"]] == [full.id, summary.id]
+    summary_minutes = json.loads(result["documents"][1]["minutes_json"])
+    assert [section["code"] for section in summary_minutes["sections"]] == ["2", "1", "10"]
+    for document in result["documents"]:
+        docx = Document(io.BytesIO(base64.b64decode(document["docx_base64"])))
+        assert docx.paragraphs or docx.tables
@@ -0,0 +1,123 @@
+"""Test parallel per-section extraction with a mocked LLM client."""
+import json
+from unittest.mock import MagicMock, patch
+
+from llm_extractor import extract_meeting_model, section_groups
+from models import MeetingMeta, SpeakerIndex, SpeakerStats, TemplateExtractionSpec, TemplateSectionSpec
+from template_registry import get_template
+
+
+META = MeetingMeta(
+    project="Test Project",
+    job_min_no="TEST-001",
+    description="Progress Meeting",
+    date="01/01/2024",
+    time="10:00",
+    location="Site Office",
+)
+
+
+def _fake_create(**kwargs):
+    """Answer each narrow prompt with the slice of output it asks for."""
+    prompt = kwargs["input"]
+    response = MagicMock()
+    if '"sections" key' not in prompt:
+        payload = {
+            "attendees": [{"name": "John Doe", "initials": "JD", "company": "Test Co"}],
+            "apologies": [],
+        }
+    else:
+        block = prompt.split("=== TEMPLATE SECTIONS ===", 1)[1].split("=== TASKS ===", 1)[0]
+        sections = []
+        for line in block.splitlines():
+            line = line.strip()
+            if ":" in line and line.split(":", 1)[0].isdigit():
+                code, title = line.split(":", 1)
+                sections.append({"code": code, "title": title.split(" (aliases:")[0].strip(), "notes": f"notes {code}"})
+        payload = {"sections": sections}
+    response.output_text = json.dumps(payload)
+    return response
+
+
+def test_parallel_mode_merges_partial_results():
+    template = get_template("progress_minutes_v1")
+
+    with patch("llm_extractor.client") as mock_client:
+        mock_client.responses.create.side_effect = _fake_create
+        meeting = extract_meeting_model("transcript text", META, template, mode="parallel")
+
+    # One people call plus one call per predefined section
+    assert mock_client.responses.create.call_count == 1 + len(template.extraction.predefined_sections)
+    assert meeting.meta == META
+    assert [p.name for p in meeting.attendees] == ["John Doe"]
+    assert [s.code for s in meeting.sections] == [s.code for s in template.extraction.predefined_sections]
+    assert meeting.sections[2].notes == "notes 3"
+
+
+def test_section_groups_respects_configured_groups():
+    extraction = TemplateExtractionSpec(
+        predefined_sections=[
+            TemplateSectionSpec(code="1", title="A"),
+            TemplateSectionSpec(code="2", title="B"),
+            TemplateSectionSpec(code="3", title="C"),
+        ],
+        section_groups=[["1", "3"]],
+    )
+
+    groups = section_groups(extraction)
+
+    assert [[s.code for s in group] for group in groups] == [["1", "3"], ["2"]]
+
+
+def test_fast_model_result_escalates_to_strong_model_when_invalid():
+    template = get_template("progress_minutes_v1").model_copy(deep=True)
+    template.routing.fast_model = "fast-deployment"
+    template.routing.strong_model = "strong-deployment"
+
+    def fake_create(**kwargs):
+        if kwargs["model"] == "fast-deployment":
+            response = MagicMock()
+            # Valid JSON, invalid schema: attendees must be a list
+            response.output_text = json.dumps({"attendees": "John Doe", "apologies": []})
+            return response
+        return _fake_create(**kwargs)
+
+    with patch("llm_extractor.client") as mock_client:
+        mock_client.responses.create.side_effect = fake_create
+        meeting = extract_meeting_model("transcript text", META, template, mode="parallel")
+
+    models_used = [call.kwargs["model"] for call in mock_client.responses.create.call_args_list]
+    # People and contract dates go to the fast deployment first, then escalate
+    assert models_used.count("fast-deployment") == 2
+    assert [p.name for p in meeting.attendees] == ["John Doe"]
+    assert meeting.sections[-1].code == "6"
+
+
+def test_speaker_index_prefills_attendees():
+    template = get_template("progress_minutes_v1")
+    speakers = SpeakerIndex(
+        speakers=[SpeakerStats(name="Alice Smith", initials="AS", turns=3), SpeakerStats(name="John Doe", initials="JD")]
+    )
+
+    def fake_create(**kwargs):
+        if "=== KNOWN SPEAKERS ===" in kwargs["input"] and '"sections" key' not in kwargs["input"]:
+            response = MagicMock()
+            response.output_text = json.dumps(
+                {
+                    "attendees": [{"name": "john doe", "initials": "JD"}, {"name": "Silent Sam", "initials": "SS"}],
+                    "apologies": [],
+                    "speaker_companies": {"Alice Smith": "ClientCo"},
+                }
+            )
+            return response
+        return _fake_create(**kwargs)
+
+    with patch("llm_extractor.client") as mock_client:
+        mock_client.responses.create.side_effect = fake_create
+        meeting = extract_meeting_model("transcript text", META, template, mode="parallel", speakers=speakers)
+
+    assert [(p.name, p.company) for p in meeting.attendees] == [
+        ("Alice Smith", "ClientCo"),
+        ("John Doe", ""),
+        ("Silent Sam", ""),
+    ]
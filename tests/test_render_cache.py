@@ -0,0 +1,75 @@
+"""Test the rendered-document cache."""
+from unittest.mock import patch
+
+import render_pool
+from models import MeetingMeta, MeetingModel, Section
+from render_cache import RenderCache, render_key
+from template_registry import get_template
+
+
+MEETING = MeetingModel(
+    meta=MeetingMeta(
+        project="Test Project",
+        job_min_no="TEST-001",
+        description="Progress Meeting",
+        date="01/01/2024",
+        time="10:00",
+        location="Site Office",
+    ),
+    sections=[Section(code="1", title="Introductions", notes="Introductions and agenda.")],
+)
+
+
+def test_lru_evicts_by_total_bytes():
+    cache = RenderCache(max_bytes=10)
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    assert cache.get("a") == b"12345"  # a is now most recently used
+    cache.put("c", b"12345")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"12345"
+    assert cache.stats()["bytes"] == 10
+
+
+def test_disk_tier_survives_memory_eviction(tmp_path):
+    cache = RenderCache(max_bytes=5, directory=tmp_path)
+    cache.put("a" * 64, b"12345")
+    cache.put("b" * 64, b"12345")
+
+    assert cache.get("a" * 64) == b"12345"
+    assert cache.stats()["disk_hits"] == 1
+    # Larger than the memory budget: kept on disk only
+    cache.put("c" * 64, b"123456")
+    assert RenderCache(max_bytes=5, directory=tmp_path).get("c" * 64) == b"123456"
+
+
+def test_key_tracks_meeting_content_template_file_and_output_settings():
+    template = get_template("progress_minutes_v1")
+    changed = MEETING.model_copy(deep=True)
+    changed.sections[0].notes = "Different notes."
+
+    key = render_key(template, MEETING)
+    assert key == render_key(template, MEETING.model_copy(deep=True))
+    assert key != render_key(template, changed)
+    with patch("render_cache._template_content_hash", return_value="edited"):
+        assert key != render_key(template, MEETING)
+    with patch("render_cache.settings.docx_optimize", False):
+        assert key != render_key(template, MEETING)
+    with patch("render_cache.settings.docx_compress_level", 1):
+        assert key != render_key(template, MEETING)
+
+
+def test_render_returns_cached_bytes_on_repeat():
+    template = get_template("progress_minutes_v1")
+    cache = RenderCache(max_bytes=10 * 1024 * 1024)
+
+    with patch("render_pool.get_render_cache", return_value=cache), patch(
+        "render_pool.render_docx", wraps=render_pool.render_docx
+    ) as mock_render:
+        first = render_pool.render(template, MEETING)
+        second = render_pool.render(template, MEETING)
+
+    assert first == second
+    assert mock_render.call_count == 1
+    assert cache.hit_ratio == 0.5
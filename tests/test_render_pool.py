@@ -0,0 +1,79 @@
+"""Test the process-pool DOCX renderer."""
+import io
+
+import pytest
+from docx import Document
+from fastapi import HTTPException
+
+from models import MeetingMeta, MeetingModel, Section
+from render_pool import RenderPool
+from template_registry import build_artifacts, get_template
+
+
+MEETING = MeetingModel(
+    meta=MeetingMeta(
+        project="Test Project",
+        job_min_no="TEST-001",
+        description="Progress Meeting",
+        date="01/01/2024",
+        time="10:00",
+        location="Site Office",
+    ),
+    sections=[Section(code="1", title="Introductions", notes="Introductions and agenda.")],
+)
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = RenderPool(max_workers=1, max_pending=1, timeout=30, queue_timeout=0.1)
+    pool.warm()
+    yield pool
+    pool.shutdown()
+
+
+def test_pool_renders_valid_docx(pool):
+    docx_bytes = pool.render(get_template("progress_minutes_v1"), MEETING)
+
+    text = "\n".join(p.text for p in Document(io.BytesIO(docx_bytes)).paragraphs)
+    assert "Introductions and agenda." in text
+
+
+def test_pool_rejects_jobs_beyond_max_pending(pool):
+    pool._slots.acquire()
+    try:
+        with pytest.raises(HTTPException) as exc_info:
+            pool.render(get_template("progress_minutes_v1"), MEETING)
+    finally:
+        pool._slots.release()
+    assert exc_info.value.status_code == 503
+
+
+def test_pool_times_out_slow_jobs(pool):
+    pool.timeout = 1e-6
+    try:
+        with pytest.raises(HTTPException) as exc_info:
+            pool.render(get_template("progress_minutes_v1"), MEETING)
+    finally:
+        pool.timeout = 30
+    assert exc_info.value.status_code == 504
+    # The worker survives a timeout and keeps serving
+    assert pool.render(get_template("progress_minutes_v1"), MEETING)
+
+
+def test_templates_added_or_edited_after_start_render_current_docx(pool, tmp_path):
+    docx_path = tmp_path / "late.docx"
+
+    def register(text: str):
+        document = Document()
+        document.add_paragraph(text + " {{ project }}")
+        document.save(docx_path)
+        template = get_template("progress_minutes_v1").model_copy(update={"id": "late_v1", "docx_path": str(docx_path)})
+        template.attach_artifacts(build_artifacts(template))
+        return template
+
+    def rendered_text(template) -> str:
+        return "\n".join(p.text for p in Document(io.BytesIO(pool.render(template, MEETING))).paragraphs)
+
+    # Unknown to the worker's own registry, which was loaded before this template existed
+    assert rendered_text(register("Added after start")) == "Added after start Test Project"
+    assert rendered_text(register("Edited after start")) == "Edited after start Test Project"
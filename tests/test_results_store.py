@@ -0,0 +1,74 @@
+"""Test the result store and the streamed ZIP export."""
+import io
+import json
+import zipfile
+from datetime import date, datetime, timezone
+
+from models import MeetingMeta, MeetingModel, Section
+from results_store import ResultStore, export_zip, stream_zip
+from template_registry import get_template
+
+
+def _meeting(project: str, day: int) -> MeetingModel:
+    meta = MeetingMeta(
+        project=project,
+        job_min_no=f"JOB-{day:03d}",
+        description="Progress Meeting",
+        date=f"{day:02d}/01/2024",
+        time="10:00",
+        location="Site Office",
+    )
+    return MeetingModel(meta=meta, sections=[Section(code="1", title="Introductions", notes=f"Day {day}.")])
+
+
+def test_results_are_listed_per_project_in_creation_order(tmp_path):
+    store = ResultStore(tmp_path)
+    template = get_template("progress_minutes_v1")
+    first = store.save(template, _meeting("Site A / Phase 1", 1), b"docx-1")
+    store.save(template, _meeting("Site B", 2), b"docx-2")
+    second = store.save(template, _meeting("Site A / Phase 1", 3), None)
+
+    records = store.list("Site A / Phase 1")
+
+    assert [record.result_id for record in records] == [first.result_id, second.result_id]
+    assert store.minutes(records[1]).meta.job_min_no == "JOB-003"
+    assert store.docx(records[0]) == b"docx-1"
+    assert store.docx(records[1]) is None
+    assert store.list("Site A / Phase 1", since=date(2999, 1, 1)) == []
+    assert store.list("Unknown") == []
+
+
+def test_export_zip_streams_minutes_and_rerenders_missing_docx(tmp_path):
+    store = ResultStore(tmp_path)
+    template = get_template("progress_minutes_v1")
+    for day in range(1, 4):
+        store.save(template, _meeting("Site A", day), b"stored" if day != 2 else None)
+    records = store.list("Site A")
+    rerendered = []
+
+    def rerender(record, minutes):
+        rerendered.append(minutes.meta.job_min_no)
+        return b"rerendered"
+
+    chunks = list(export_zip(store, records, rerender))
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+
+    # Bytes leave after every member, not once at the end
+    assert len([chunk for chunk in chunks if chunk]) >= 1 + 2 * len(records)
+    names = archive.namelist()
+    assert names[0] == "manifest.json"
+    assert len(json.loads(archive.read("manifest.json"))) == 3
+    assert len([name for name in names if name.endswith(".docx")]) == 3
+    docx_2 = next(name for name in names if "JOB-002" in name and name.endswith(".docx"))
+    assert archive.read(docx_2) == b"rerendered"
+    json_1 = next(name for name in names if "JOB-001" in name and name.endswith(".json"))
+    assert json.loads(archive.read(json_1))["sections"][0]["notes"] == "Day 1."
+    assert rerendered == ["JOB-002"]
+    assert archive.testzip() is None
+
+
+def test_stream_zip_skips_members_without_content():
+    now = datetime.now(timezone.utc)
+    data = b"".join(stream_zip([("a.txt", now, lambda: b"a"), ("b.txt", now, lambda: None)]))
+
+    assert zipfile.ZipFile(io.BytesIO(data)).namelist() == ["a.txt"]
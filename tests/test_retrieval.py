@@ -0,0 +1,41 @@
+"""Test BM25 passage retrieval for section prompts."""
+from models import TemplateSectionSpec
+from retrieval import BM25Index, chunk_turns, relevant_excerpt
+
+
+TRANSCRIPT = "\n".join(
+    [
+        "Alice: Welcome everyone, introductions round the table.",
+        "Bob: Programme is two weeks behind on the east block.",
+        "Carol: The scaffold incident on Tuesday was reported to health and safety.",
+        "Bob: Drainage design drawings are still with the consultant.",
+        "Alice: Safety walk next Friday, all contractors to attend.",
+    ]
+)
+
+
+def test_chunk_turns_groups_lines_up_to_max_chars():
+    passages = chunk_turns(TRANSCRIPT, max_chars=120)
+
+    assert len(passages) > 1
+    assert all(len(p) <= 120 or "\n" not in p for p in passages)
+    assert "\n".join(passages) == TRANSCRIPT
+
+
+def test_relevant_excerpt_picks_matching_passages_in_order():
+    index = BM25Index(TRANSCRIPT.splitlines())
+    section = TemplateSectionSpec(code="3", title="Health & Safety")
+
+    excerpt = relevant_excerpt(index, [section], token_budget_per_section=1000)
+
+    lines = excerpt.split("\n[...]\n")
+    assert lines == [TRANSCRIPT.splitlines()[2], TRANSCRIPT.splitlines()[4]]
+
+
+def test_unmatched_section_falls_back_to_opening_passages():
+    index = BM25Index(TRANSCRIPT.splitlines())
+    section = TemplateSectionSpec(code="9", title="Commercial")
+
+    excerpt = relevant_excerpt(index, [section], token_budget_per_section=20)
+
+    assert excerpt == TRANSCRIPT.splitlines()[0]
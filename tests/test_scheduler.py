@@ -0,0 +1,85 @@
+"""Test the size-aware, tenant-fair admission scheduler."""
+import asyncio
+
+from scheduler import BATCH, INTERACTIVE, Scheduler
+
+
+async def _submit_all(scheduler: Scheduler, jobs: list[tuple[str, int]], order: list[str], gate: asyncio.Event):
+    async def job(name: str, tenant: str, cost: int):
+        async def work():
+            order.append(name)
+            await gate.wait()
+
+        await scheduler.run(tenant=tenant, cost_tokens=cost, factory=work)
+
+    tasks = []
+    for index, (tenant, cost) in enumerate(jobs):
+        tasks.append(asyncio.create_task(job(f"{tenant}{index}", tenant, cost)))
+        await asyncio.sleep(0)
+    return tasks
+
+
+def test_classifies_by_estimated_tokens():
+    scheduler = Scheduler(max_inflight=4, interactive_max_tokens=1000)
+    assert scheduler.classify(800) == INTERACTIVE
+    assert scheduler.classify(40000) == BATCH
+
+
+def test_small_job_overtakes_batch_backlog():
+    async def scenario():
+        scheduler = Scheduler(max_inflight=2, interactive_reserved=1, interactive_max_tokens=1000)
+        order: list[str] = []
+        gate = asyncio.Event()
+        tasks = await _submit_all(scheduler, [("big", 40000)] * 3, order, gate)
+        tasks += await _submit_all(scheduler, [("small", 500)], order, gate)
+        await asyncio.sleep(0)
+        snapshot = list(order)
+        gate.set()
+        await asyncio.gather(*tasks)
+        return snapshot
+
+    # One batch job runs, the other two wait; the reserved slot goes to the stand-up
+    assert asyncio.run(scenario()) == ["big0", "small0"]
+
+
+def test_tenants_share_a_lane_by_weight():
+    async def scenario():
+        scheduler = Scheduler(max_inflight=1, interactive_max_tokens=0, tenant_weights={"heavy": 2.0})
+        order: list[str] = []
+        release = asyncio.Event()
+
+        async def job(tenant: str):
+            async def work():
+                order.append(tenant)
+
+            await scheduler.run(tenant=tenant, cost_tokens=1000, factory=work)
+
+        blocker = asyncio.create_task(scheduler.run(tenant="x", cost_tokens=1, factory=release.wait))
+        await asyncio.sleep(0)
+        tasks = [asyncio.create_task(job("a")) for _ in range(6)]
+        tasks += [asyncio.create_task(job("heavy")) for _ in range(6)]
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(blocker, *tasks)
+        return order
+
+    order = asyncio.run(scenario())
+    # "heavy" has twice the weight, so it gets two slots for every one of "a"
+    assert order[:6].count("heavy") == 4
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    async def scenario():
+        scheduler = Scheduler(max_inflight=1, interactive_max_tokens=1000)
+        release = asyncio.Event()
+        running = asyncio.create_task(scheduler.run(tenant="a", cost_tokens=1, factory=release.wait))
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(scheduler.run(tenant="b", cost_tokens=1, factory=release.wait))
+        await asyncio.sleep(0)
+        queued.cancel()
+        release.set()
+        await running
+        result = await scheduler.run(tenant="c", cost_tokens=1, factory=lambda: asyncio.sleep(0, "done"))
+        return result, scheduler.stats()["running"]
+
+    assert asyncio.run(scenario()) == ("done", 0)
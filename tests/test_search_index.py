@@ -0,0 +1,86 @@
+"""Test the full-text search index over stored minutes and the open-actions view."""
+from models import ActionItem, MeetingMeta, MeetingModel, Person, Section
+from results_store import ResultStore
+from search_index import SearchIndex
+from template_registry import get_template
+
+
+def _meeting(project: str, day: int, actions: list[ActionItem]) -> MeetingModel:
+    meta = MeetingMeta(
+        project=project,
+        job_min_no=f"JOB-{day:03d}",
+        description="Progress Meeting",
+        date=f"{day:02d}/01/2024",
+        time="10:00",
+        location="Site Office",
+    )
+    return MeetingModel(
+        meta=meta,
+        attendees=[Person(name="Alice Smith", company="Acme Builders")],
+        sections=[
+            Section(code="1", title="Introductions", notes="Welcome."),
+            Section(code="2", title="Progress", notes=f"Scaffolding erected on day {day}.", actions=actions),
+        ],
+    )
+
+
+def test_search_matches_notes_actions_and_attendees(tmp_path):
+    store = ResultStore(tmp_path / "results")
+    index = SearchIndex(tmp_path / "search.db")
+    template = get_template("progress_minutes_v1")
+    meeting = _meeting("Site A", 1, [ActionItem(action="Order the concrete pumps", owner="Bob Jones")])
+    record = store.save(template, meeting, None)
+    index.add(record, meeting)
+    # Re-indexing the same result replaces it
+    index.add(record, meeting)
+
+    hits = index.search("scaffolding")
+    assert [(hit.kind, hit.section_code, hit.result_id) for hit in hits] == [("section", "2", record.result_id)]
+    assert "[Scaffolding]" in hits[0].snippet
+
+    # Porter stemming, and FTS5 syntax in the query is taken literally
+    action = index.search('pump*"')
+    assert [(hit.kind, hit.owner) for hit in action] == [("action", "Bob Jones")]
+    assert [hit.kind for hit in index.search("acme")] == ["attendee"]
+    assert index.search("scaffolding", project="Site B") == []
+    assert index.search("   ") == []
+
+
+def test_open_actions_come_from_each_projects_latest_meeting(tmp_path):
+    store = ResultStore(tmp_path / "results")
+    index = SearchIndex(tmp_path / "search.db")
+    template = get_template("progress_minutes_v1")
+    # Stored out of order: meeting dates, not storage order, decide the latest
+    store.save(template, _meeting("Site A", 8, [ActionItem(action="Pour slab", owner="bob jones", due_date="20/01/2024")]), None)
+    store.save(template, _meeting("Site A", 1, [ActionItem(action="Old action", owner="Bob Jones")]), None)
+    store.save(
+        template,
+        _meeting(
+            "Site B",
+            3,
+            [
+                ActionItem(action="Submit drawings", owner="Bob Jones", due_date="15/01/2024"),
+                ActionItem(action="Book crane"),
+            ],
+        ),
+        None,
+    )
+
+    assert index.sync_project(store, "Site A") == 2
+    assert index.sync_project(store, "Site A") == 0
+    assert index.sync_project(store, "Site B") == 1
+
+    bob = index.open_actions(owner=" BOB JONES ")
+    assert {owner: [a.action for a in actions] for owner, actions in bob.items()} == {
+        "Bob Jones": ["Submit drawings", "Pour slab"],
+    }
+
+    everyone = index.open_actions(project="Site B")
+    assert {owner: [a.action for a in actions] for owner, actions in everyone.items()} == {
+        "Unassigned": ["Book crane"],
+        "Bob Jones": ["Submit drawings"],
+    }
+
+    reader = SearchIndex(tmp_path / "search.db", readonly=True)
+    assert len(reader.search("slab")) == 1
+    reader.close()
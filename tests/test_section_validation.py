@@ -0,0 +1,92 @@
+"""Test section validation against the template and the targeted re-ask of faulty sections."""
+import json
+from unittest.mock import MagicMock, patch
+
+from llm_extractor import extract_meeting_model
+from models import MeetingMeta, Section
+from section_validation import MAX_SECTION_TITLE_CHARS, check_sections, splice_sections
+from template_registry import get_template
+
+
+META = MeetingMeta(
+    project="Test Project",
+    job_min_no="TEST-001",
+    description="Progress Meeting",
+    date="01/01/2024",
+    time="10:00",
+    location="Site Office",
+)
+
+
+def test_wrong_code_is_recoded_by_alias_and_titles_are_canonical():
+    extraction = get_template("progress_minutes_v1").extraction
+    sections = [
+        Section(code="1", title="introductions", notes="Hello."),
+        Section(code="9", title="Contract", notes="Dates."),
+        Section(code="1", title="Introductions", notes="Duplicate."),
+    ]
+
+    check = check_sections(sections, extraction)
+
+    assert check.found["1"].title == "Introductions"
+    assert check.found["1"].notes == "Hello."
+    assert check.found["6"].title == "Contract Dates"
+    assert check.extras == []
+    assert [spec.code for spec in check.faulty] == ["2", "3", "4", "5"]
+
+
+def test_overlong_title_is_faulty_and_unknown_sections_are_extras():
+    extraction = get_template("progress_minutes_v1").extraction
+    sections = [
+        Section(code="2", title="Progress " * (MAX_SECTION_TITLE_CHARS // 5)),
+        Section(code="99", title="Any Other Business"),
+    ]
+
+    check = check_sections(sections, extraction, expected=extraction.predefined_sections[:2])
+
+    assert [spec.code for spec in check.faulty] == ["1", "2"]
+    assert [section.code for section in check.extras] == ["99"]
+
+    spliced = splice_sections(extraction, check, [Section(code="2", title="Monthly Progress", notes="On track.")])
+    assert [section.code for section in spliced] == [spec.code for spec in extraction.predefined_sections] + ["99"]
+    assert spliced[1].notes == "On track."
+    assert spliced[0].notes == ""
+
+
+def test_single_mode_reasks_only_missing_sections():
+    template = get_template("progress_minutes_v1")
+    specs = template.extraction.predefined_sections
+    prompts = []
+
+    def fake_create(**kwargs):
+        prompts.append(kwargs["input"])
+        if len(prompts) == 1:
+            sections = [{"code": s.code, "title": s.title, "notes": "First pass."} for s in specs[:-2]]
+            payload = {"meta": META.model_dump(), "attendees": [], "apologies": [], "sections": sections}
+        else:
+            payload = {"sections": [{"code": s.code, "title": s.title, "notes": "Re-asked."} for s in specs[-2:]]}
+        return MagicMock(output_text=json.dumps(payload))
+
+    with patch("llm_extractor.client") as mock_client:
+        mock_client.responses.create.side_effect = fake_create
+        meeting = extract_meeting_model("transcript text", META, template)
+
+    assert len(prompts) == 2
+    block = prompts[1].split("=== TEMPLATE SECTIONS ===", 1)[1].split("=== TASKS ===", 1)[0]
+    assert f"{specs[-1].code}: {specs[-1].title}" in block
+    assert f"{specs[0].code}: {specs[0].title}" not in block
+    assert [s.code for s in meeting.sections] == [s.code for s in specs]
+    assert [s.notes for s in meeting.sections[-3:]] == ["First pass.", "Re-asked.", "Re-asked."]
+
+
+def test_failed_reask_leaves_sections_empty():
+    template = get_template("progress_minutes_v1")
+    first = {"meta": META.model_dump(), "attendees": [], "apologies": [], "sections": []}
+
+    with patch("llm_extractor.client") as mock_client:
+        mock_client.responses.create.side_effect = [MagicMock(output_text=json.dumps(first)), Exception("boom")]
+        meeting = extract_meeting_model("transcript text", META, template)
+
+    assert mock_client.responses.create.call_count == 2
+    assert [s.code for s in meeting.sections] == [s.code for s in template.extraction.predefined_sections]
+    assert all(s.notes == "" for s in meeting.sections)
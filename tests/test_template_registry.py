@@ -0,0 +1,89 @@
+"""Test the file-backed template registry."""
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+import template_registry
+from llm_extractor import extract_meeting_model
+from models import MeetingMeta
+from template_registry import get_template, load_templates
+
+
+def _spec(version: str, title: str) -> dict:
+    return {
+        "id": "site_walk",
+        "version": version,
+        "label": "Site Walk Notes",
+        "docx_path": "site_walk.docx",
+        "extraction": {"predefined_sections": [{"code": "1", "title": title}]},
+        "binding": {"id": "site_walk"},
+    }
+
+
+@pytest.fixture
+def templates_dir(tmp_path):
+    yield tmp_path
+    # Restore the default registry for other tests
+    load_templates()
+
+
+def test_load_templates_from_directory(templates_dir):
+    (templates_dir / "site_walk_v1.json").write_text(json.dumps(_spec("1", "Walkround")))
+    (templates_dir / "site_walk_v2.json").write_text(json.dumps(_spec("2", "Observations")))
+    (templates_dir / "site_walk.docx").write_bytes(b"PK fake docx")
+    (templates_dir / "broken.json").write_text("{not json")
+
+    load_templates(templates_dir)
+
+    latest = get_template("site_walk")
+    assert latest.version == "2"
+    assert get_template("site_walk", version="1").extraction.predefined_sections[0].title == "Walkround"
+    assert latest.docx_path == str((templates_dir / "site_walk.docx").resolve())
+    # Built-in templates are still available
+    assert get_template("progress_minutes_v1").id == "progress_minutes_v1"
+
+    artifacts = latest.artifacts
+    assert artifacts.docx_bytes == b"PK fake docx"
+    assert "1: Observations" in artifacts.prompt_parts.template_sections
+    section_schema = artifacts.output_schemas["sections"]["$defs"]["Section"]
+    assert section_schema["properties"]["code"]["enum"] == ["1"]
+    assert set(artifacts.output_schemas) == {"full", "people", "sections"}
+
+
+def test_unknown_template_raises_400(templates_dir):
+    load_templates(templates_dir)
+
+    with pytest.raises(HTTPException) as exc_info:
+        get_template("site_walk")
+
+    assert exc_info.value.status_code == 400
+
+
+def test_fingerprint_changes_when_spec_changes(templates_dir):
+    before = template_registry._fingerprint(templates_dir)
+    (templates_dir / "site_walk_v1.json").write_text(json.dumps(_spec("1", "Walkround")))
+
+    assert template_registry._fingerprint(templates_dir) != before
+
+
+def test_structured_output_sends_the_compiled_schema():
+    template = get_template("progress_minutes_v1")
+    meta = MeetingMeta(
+        project="P", job_min_no="1", description="Progress Meeting", date="01/01/2024", time="10:00", location="X"
+    )
+    sections = [{"code": spec.code, "title": spec.title} for spec in template.extraction.predefined_sections]
+    payload = {"meta": meta.model_dump(), "attendees": [], "apologies": [], "sections": sections}
+
+    with patch("llm_extractor.client") as mock_client, patch.multiple(
+        "llm_extractor.settings", openai_structured_output=True, extraction_mode="single"
+    ):
+        mock_client.responses.create.return_value = SimpleNamespace(output_text=json.dumps(payload), usage=None)
+        extract_meeting_model("Alice: Hello", meta, template)
+
+    text_format = mock_client.responses.create.call_args.kwargs["text"]["format"]
+    assert text_format["type"] == "json_schema"
+    assert text_format["schema"] is template.artifacts.output_schemas["full"]
+    assert text_format["schema"]["$defs"]["Section"]["properties"]["code"]["enum"] == [s["code"] for s in sections]
@@ -0,0 +1,140 @@
+"""Test transcript parsing for the supported upload formats."""
+import gzip
+import io
+import json
+import zipfile
+
+import pytest
+from docx import Document
+from fastapi import HTTPException
+
+from transcript_loader import load_transcript, load_transcript_with_speakers, transcript_size
+
+
+SRT = b"""1
+00:00:01,000 --> 00:00:04,000
+Alice: Morning all, let's start.
+
+2
+00:00:05,000 --> 00:00:08,500
+<i>Bob: Drainage drawings are late.</i>
+"""
+
+
+def test_srt_keeps_caption_text_only():
+    assert load_transcript(SRT, "meeting.srt") == "Alice: Morning all, let's start.\nBob: Drainage drawings are late."
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        # Teams / Stream
+        {"entries": [{"speakerDisplayName": "Alice", "text": "Morning all"}, {"speakerDisplayName": "Bob", "text": "Hi"}]},
+        # AssemblyAI / Otter-style utterances
+        {"utterances": [{"speaker": "Alice", "text": "Morning all"}, {"speaker": "Bob", "text": "Hi"}]},
+        # Plain list of segments with word-level text
+        [{"speaker": {"name": "Alice"}, "words": [{"word": "Morning"}, {"word": "all"}]}, {"speaker": "Bob", "text": "Hi"}],
+        # Malformed word items (numbers, nulls, lists, non-text words) are skipped
+        [
+            {"speaker": "Alice", "words": [3, None, ["x"], {"word": 7}, {"word": "Morning"}, "all"]},
+            {"speaker": "Bob", "text": "Hi"},
+        ],
+    ],
+)
+def test_json_layouts_flatten_to_speaker_lines(payload):
+    assert load_transcript(json.dumps(payload).encode(), "meeting.json") == "Alice: Morning all\nBob: Hi"
+
+
+def test_compressed_uploads_are_transparent():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("__MACOSX/.meeting.srt", b"junk")
+        archive.writestr("exports/meeting.srt", SRT)
+
+    expected = load_transcript(SRT, "meeting.srt")
+    assert load_transcript(gzip.compress(SRT), "meeting.srt.gz") == expected
+    assert load_transcript(buffer.getvalue(), "meeting.zip") == expected
+
+
+def test_transcript_size_counts_text_not_compressed_bytes():
+    text = b"Alice: The concrete pour is next week.\n" * 2000
+    docx = io.BytesIO()
+    document = Document()
+    for line in text.decode().splitlines()[:200]:
+        document.add_paragraph(line)
+    document.save(docx)
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as target:
+        target.writestr("meeting.txt", text)
+
+    assert transcript_size(io.BytesIO(gzip.compress(text)), "meeting.txt.gz") == len(text)
+    assert transcript_size(io.BytesIO(archive.getvalue()), "meeting.zip") == len(text)
+    # Paragraph text only, without the line breaks
+    assert transcript_size(io.BytesIO(docx.getvalue()), "meeting.docx") == len(text) // 10 - 200
+    assert transcript_size(io.BytesIO(text), "meeting.txt") == len(text)
+    assert transcript_size(io.BytesIO(b"not a zip"), "meeting.zip") == len(b"not a zip")
+
+
+def test_truncated_gzip_is_rejected():
+    with pytest.raises(HTTPException) as exc_info:
+        load_transcript(gzip.compress(SRT)[:-8], "meeting.srt.gz")
+
+    assert exc_info.value.status_code == 400
+
+
+VTT = b"""WEBVTT
+
+1
+00:00:01.000 --> 00:00:04.000
+<v Alice Smith>Morning all, let's start.</v>
+
+2
+00:00:04.500 --> 00:00:06.000
+<v Bob O'Neil>Drainage drawings are late.</v>
+
+3
+00:00:06.000 --> 00:00:10.000
+<v Alice Smith>Bob to chase the consultant.</v>
+"""
+
+
+def test_vtt_speakers_are_indexed_and_kept_in_text():
+    transcript = load_transcript_with_speakers(VTT, "meeting.vtt")
+
+    assert transcript.text.splitlines()[0] == "Alice Smith: Morning all, let's start."
+    alice, bob = transcript.speakers.speakers
+    assert (alice.name, alice.initials, alice.turns, alice.talk_seconds) == ("Alice Smith", "AS", 2, 7.0)
+    assert (bob.name, bob.initials, bob.turns) == ("Bob O'Neil", "BON", 1)
+
+
+def test_plain_text_labels_need_to_recur_to_count_as_speakers():
+    text = b"Alice: Hello\nBob: Hi\nAlice: Shall we start?\nNote: minutes to follow\nAction: Bob to chase"
+
+    transcript = load_transcript_with_speakers(text, "meeting.txt")
+
+    assert transcript.text == text.decode()
+    assert [s.name for s in transcript.speakers.speakers] == ["Alice"]
+
+
+@pytest.mark.parametrize(
+    ("payload", "labels"),
+    [
+        # Deepgram-style numbered speakers
+        ([{"speaker": 0, "text": "Morning all"}, {"speaker": 1, "text": "Hi"}, {"speaker": 0, "text": "Start?"}], "01"),
+        # AssemblyAI-style lettered speakers
+        ({"utterances": [{"speaker": "A", "text": "Morning all"}, {"speaker": "B", "text": "Hi"}]}, "AB"),
+    ],
+)
+def test_anonymous_json_speakers_are_not_indexed(payload, labels):
+    transcript = load_transcript_with_speakers(json.dumps(payload).encode(), "meeting.json")
+
+    assert transcript.text.splitlines()[:2] == [f"Speaker {labels[0]}: Morning all", f"Speaker {labels[1]}: Hi"]
+    assert transcript.speakers.speakers == []
+
+
+def test_anonymous_plain_text_labels_are_not_indexed():
+    text = b"Speaker 1: Hello\nSPEAKER_02: Hi\nSpeaker 1: Start?\nSPEAKER_02: Yes\nAlice: Hi\nAlice: Bye"
+
+    transcript = load_transcript_with_speakers(text, "meeting.txt")
+
+    assert [s.name for s in transcript.speakers.speakers] == ["Alice"]
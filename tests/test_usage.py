@@ -0,0 +1,179 @@
+"""Test token usage capture and budget enforcement with a mocked LLM client."""
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+import usage
+from llm_extractor import extract_meeting_model
+from model_routing import CallOptions
+from models import MeetingMeta, RoutingTier, TemplateRoutingSpec
+from template_registry import get_template
+from tokens import estimate_tokens
+from usage import CallUsage, SharedDayTotals, UsageLedger, budgeted_call, track_usage
+
+
+META = MeetingMeta(
+    project="Test Project",
+    job_min_no="TEST-001",
+    description="Progress Meeting",
+    date="01/01/2024",
+    time="10:00",
+    location="Site Office",
+)
+
+SECTIONS = [{"code": s.code, "title": s.title} for s in get_template("progress_minutes_v1").extraction.predefined_sections]
+VALID = json.dumps({"meta": META.model_dump(), "attendees": [], "apologies": [], "sections": SECTIONS})
+
+
+def _response(text: str, input_tokens: int, output_tokens: int, reasoning_tokens: int = 0) -> SimpleNamespace:
+    return SimpleNamespace(
+        output_text=text,
+        usage=SimpleNamespace(
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            input_tokens_details=SimpleNamespace(cached_tokens=0),
+            output_tokens_details=SimpleNamespace(reasoning_tokens=reasoning_tokens),
+        ),
+    )
+
+
+def test_usage_includes_repair_call_and_reaches_the_ledger():
+    responses = [_response('{"meta": ', 1000, 200, 150), _response(VALID, 1500, 300)]
+    ledger = UsageLedger()
+
+    with patch("llm_extractor.client") as mock_client, patch("usage.ledger", ledger):
+        mock_client.responses.create.side_effect = responses
+        with track_usage(project="Test Project", template_id="progress_minutes_v1") as tracker:
+            extract_meeting_model("transcript", META, get_template("progress_minutes_v1"))
+
+    report = tracker.report()
+    assert [call.kind for call in report.calls] == ["extract", "repair"]
+    assert report.total_tokens == 3000
+    assert report.repair_tokens == 1800
+    assert report.reasoning_tokens == 150
+    [row] = ledger.summary()
+    assert (row["project"], row["template_id"], row["calls"], row["total_tokens"]) == (
+        "Test Project",
+        "progress_minutes_v1",
+        2,
+        3000,
+    )
+
+
+def test_parallel_calls_count_towards_the_request():
+    def fake_create(**kwargs):
+        if '"sections" key' in kwargs["input"]:
+            return _response('{"sections": []}', 100, 10)
+        return _response('{"attendees": [], "apologies": []}', 100, 10)
+
+    template = get_template("progress_minutes_v1")
+    with patch("llm_extractor.client") as mock_client:
+        mock_client.responses.create.side_effect = fake_create
+        with track_usage() as tracker:
+            extract_meeting_model("transcript", META, template, mode="parallel")
+
+    # People, one call per section, and one re-ask for the sections none of them returned
+    assert len(tracker.report().calls) == 1 + len(template.extraction.predefined_sections) + 1
+
+
+def test_request_budget_rejects_before_sending():
+    with patch("llm_extractor.client") as mock_client, patch("usage.settings.token_budget_per_request", 1000):
+        with track_usage(), pytest.raises(HTTPException) as exc_info:
+            extract_meeting_model("transcript", META, get_template("progress_minutes_v1"))
+
+    assert exc_info.value.status_code == 429
+    mock_client.responses.create.assert_not_called()
+
+
+def test_day_budget_downgrades_to_fast_model_with_smaller_output_cap():
+    with patch("llm_extractor.client") as mock_client, patch("usage.ledger", UsageLedger()), patch.multiple(
+        "usage.settings", token_budget_per_day=5000, token_budget_action="downgrade", openai_fast_model="fast"
+    ):
+        mock_client.responses.create.return_value = _response(VALID, 100, 10)
+        extract_meeting_model("transcript", META, get_template("progress_minutes_v1"))
+
+    kwargs = mock_client.responses.create.call_args.kwargs
+    assert kwargs["model"] == "fast"
+    assert "reasoning" not in kwargs
+    assert kwargs["max_output_tokens"] < 5000
+
+
+def test_downgrade_lowers_reasoning_effort_only_when_one_was_set():
+    template = get_template("progress_minutes_v1")
+    routing = TemplateRoutingSpec(size_tiers=[RoutingTier(reasoning_effort="high")])
+    template = template.model_copy(update={"routing": routing})
+
+    with patch("llm_extractor.client") as mock_client, patch("usage.ledger", UsageLedger()), patch.multiple(
+        "usage.settings", token_budget_per_day=5000, token_budget_action="downgrade", openai_fast_model="fast"
+    ):
+        mock_client.responses.create.return_value = _response(VALID, 100, 10)
+        extract_meeting_model("transcript", META, template)
+
+    assert mock_client.responses.create.call_args.kwargs["reasoning"] == {"effort": "low"}
+
+
+def test_shared_ledgers_enforce_one_day_budget_across_processes():
+    store = {}
+    first, second = UsageLedger(), UsageLedger()
+    first.share(SharedDayTotals(store, process_id="a"), interval=3600)
+    second.share(SharedDayTotals(store, process_id="b"), interval=3600)
+
+    first.record(CallUsage(model="m", input_tokens=4000, output_tokens=500), project="P", template_id="t")
+    first.sync_shared()
+    second.sync_shared()
+    assert second.day_tokens() == 4500
+
+    with patch("llm_extractor.client") as mock_client, patch("usage.ledger", second), patch.multiple(
+        "usage.settings", token_budget_per_day=5000, token_budget_action="reject"
+    ):
+        with pytest.raises(HTTPException) as exc_info:
+            extract_meeting_model("transcript", META, get_template("progress_minutes_v1"))
+
+    assert exc_info.value.status_code == 429
+    mock_client.responses.create.assert_not_called()
+
+
+def test_shared_totals_drop_past_days():
+    store = {"2026-10-18/a": 900, "2026-10-18/b": 700, "2026-10-19/b": 300}
+    shared = SharedDayTotals(store, process_id="a")
+
+    shared.sync("2026-10-19", 100)
+
+    assert store == {"2026-10-19/a": 100, "2026-10-19/b": 300}
+    assert shared.others("2026-10-19") == 300
+
+def test_concurrent_calls_cannot_overshoot_a_nearly_exhausted_budget():
+    options = CallOptions(model="m", max_output_tokens=1000)
+    prompt = "transcript"
+    start = threading.Barrier(10)
+
+    def call() -> bool:
+        start.wait()
+        try:
+            with budgeted_call(prompt, options):
+                time.sleep(0.5)
+        except HTTPException:
+            return False
+        return True
+
+    def slow_remaining_budget(tracker):
+        # Widen the gap between reading the budget and reserving from it
+        remaining = remaining_budget(tracker)
+        time.sleep(0.02)
+        return remaining
+
+    budget = 3 * (estimate_tokens(prompt) + 1000) + 500
+    remaining_budget = usage._remaining_budget
+    with patch("usage.ledger", UsageLedger()), patch("usage._remaining_budget", slow_remaining_budget), patch.multiple(
+        "usage.settings", token_budget_per_day=budget, token_budget_action="reject"
+    ):
+        with ThreadPoolExecutor(max_workers=10) as pool:
+            admitted = list(pool.map(lambda _: call(), range(10)))
+
+    assert admitted.count(True) == 3
@@ -0,0 +1,10 @@
+import math
+
+# Rough average for English prose with OpenAI tokenizers; good enough for
+# budgets and estimates, not for billing.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text_or_length: str | int) -> int:
+    length = text_or_length if isinstance(text_or_length, int) else len(text_or_length)
+    return math.ceil(length / CHARS_PER_TOKEN)
@@ -1,23 +1,174 @@
+import gzip
+import io
+import json
+import re
+import zipfile
+import zlib
 from pathlib import Path
 import tempfile
+from typing import Any, BinaryIO, NamedTuple
 
 from docx import Document
 from fastapi import HTTPException
+from lxml import etree
 
+from models import LoadedTranscript, SpeakerIndex, SpeakerStats
 
-SUPPORTED_EXTENSIONS = {"docx", "vtt", "txt", "text"}
+
+SUPPORTED_EXTENSIONS = {"docx", "vtt", "srt", "json", "txt", "text"}
+COMPRESSED_EXTENSIONS = {"gz", "zip"}
+
+# Guard against decompression bombs: compressed uploads may not expand beyond this
+MAX_DECOMPRESSED_BYTES = 200 * 1024 * 1024
+DECOMPRESS_CHUNK_BYTES = 64 * 1024
+
+DOCX_BODY_PART = "word/document.xml"
+DOCX_TEXT_TAG = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}t"
+
+# Keys used by common meeting-platform JSON exports (Teams/Stream, Zoom, Otter,
+# AssemblyAI, AWS Transcribe, Deepgram-style utterances, generic segment lists)
+JSON_SEGMENT_KEYS = (
+    "entries",
+    "utterances",
+    "segments",
+    "timeline",
+    "transcript",
+    "transcripts",
+    "results",
+    "items",
+    "captions",
+)
+JSON_SPEAKER_KEYS = (
+    "speakerDisplayName",
+    "speaker_name",
+    "speakerName",
+    "speaker",
+    "username",
+    "user",
+    "name",
+    "participant",
+)
+JSON_TEXT_KEYS = ("text", "transcript", "content", "caption", "words")
+# Timing keys; string values are hh:mm:ss(.fff), numbers are seconds unless the key ends in "_ms"
+JSON_START_KEYS = ("startOffset", "start_time", "start", "start_ms", "ts")
+JSON_END_KEYS = ("endOffset", "end_time", "end", "end_ms")
+
+# "Name: text" labels in plain text are only trusted as speakers if they recur
+# and are not one of these common minute-taking labels
+MIN_LABEL_TURNS = 2
+NON_SPEAKER_LABELS = {
+    "action", "actions", "agenda", "date", "item", "location", "note", "notes",
+    "re", "subject", "time", "attendees", "apologies", "present", "project",
+}
+
+_SRT_TIMESTAMP = re.compile(r"^\d{1,2}:\d{2}:\d{2}[,.]\d{1,3}\s*-->")
+_CUE_TIMING = re.compile(r"^((?:\d+:)?\d{1,2}:\d{2}[,.]\d{1,3})\s*-->\s*((?:\d+:)?\d{1,2}:\d{2}[,.]\d{1,3})")
+_VOICE_TAG = re.compile(r"<v(?:\.[^ >]*)?\s+([^>]+)>")
+_MARKUP_TAG = re.compile(r"</?[^>]+>")
+# Diarization labels ("0", "A", "Speaker 2", "SPEAKER_01", "spk_3") name no one: they stay in the
+# text but are not indexed as speakers, so they never become attendees
+_ANONYMOUS_SPEAKER = re.compile(r"^(?:\d+|[^\W\d_]|(?:speaker|spk|spkr)[ _\-]?\w{1,3})$", re.IGNORECASE)
+_SPEAKER_LABEL = re.compile(r"^([A-Z][\w.'\-]*(?: [A-Z][\w.'\-]*){0,3}):\s+(.+)$")
+# _SPEAKER_LABEL for one line of a larger text: the separator may not cross a line break
+_SPEAKER_LABEL_LINE = re.compile(r"^([A-Z][\w.'\-]*(?: [A-Z][\w.'\-]*){0,3}):[^\S\r\n][^\r\n]", re.MULTILINE)
+
+
+class Turn(NamedTuple):
+    speaker: str
+    text: str
+    start: float | None = None
+    end: float | None = None
 
 
 def load_transcript(file_bytes: bytes, filename: str) -> str:
+    return load_transcript_with_speakers(file_bytes, filename).text
+
+
+def load_transcript_with_speakers(file_bytes: bytes, filename: str) -> LoadedTranscript:
+    """
+    Load a transcript and index its speakers.
+
+    Formats that label speakers (VTT voice tags, "Name: text" lines, JSON
+    speaker fields) keep the label in the text as "Name: text" and contribute
+    to the SpeakerIndex; talk time is only known for timed formats.
+    """
     ext = filename.lower().rsplit(".", 1)[-1] if "." in filename else ""
+    if ext in COMPRESSED_EXTENSIONS:
+        file_bytes, filename = _decompress(file_bytes, filename, ext)
+        ext = filename.lower().rsplit(".", 1)[-1] if "." in filename else "txt"
     if ext not in SUPPORTED_EXTENSIONS:
         raise HTTPException(status_code=400, detail="Unsupported file type")
 
     if ext == "docx":
-        return _extract_docx(file_bytes)
-    if ext == "vtt":
-        return _extract_vtt(file_bytes)
-    return file_bytes.decode("utf-8", errors="ignore")
+        turns = _labelled_turns(_extract_docx(file_bytes).splitlines())
+    elif ext == "vtt":
+        turns = _vtt_turns(file_bytes)
+    elif ext == "srt":
+        turns = _srt_turns(file_bytes)
+    elif ext == "json":
+        return _extract_json(file_bytes)
+    else:
+        text = file_bytes.decode("utf-8", errors="ignore")
+        del file_bytes
+        return LoadedTranscript(text=text, speakers=_label_speaker_index(text))
+
+    return _from_turns(turns)
+
+
+def transcript_size(file: BinaryIO, filename: str) -> int:
+    """
+    Approximate characters of transcript in an upload, read as a stream: the
+    inflated size of .gz and .zip uploads and the text of .docx ones, so a
+    job can be costed by its text without loading it. Capped just above
+    MAX_DECOMPRESSED_BYTES; unreadable uploads count at their raw size and
+    fail later, when parsed.
+    """
+    raw_size = file.seek(0, io.SEEK_END)
+    file.seek(0)
+    ext = _extension(filename)
+    try:
+        if ext == "gz":
+            return _stream_size(gzip.GzipFile(fileobj=file))
+        if ext == "zip":
+            with zipfile.ZipFile(file) as archive:
+                info = _zip_transcript(archive)
+                if info is None:
+                    return raw_size
+                if _extension(info.filename) == "docx":
+                    with archive.open(info) as member:
+                        return _docx_text_size(member)
+                return info.file_size
+        if ext == "docx":
+            return _docx_text_size(file)
+    except (OSError, EOFError, KeyError, zlib.error, zipfile.BadZipFile, etree.LxmlError):
+        pass
+    return raw_size
+
+
+def build_speaker_index(turns: list[Turn]) -> SpeakerIndex:
+    turn_counts: dict[str, int] = {}
+    talk_seconds: dict[str, float] = {}
+    for turn in turns:
+        if not turn.speaker or _ANONYMOUS_SPEAKER.match(turn.speaker):
+            continue
+        turn_counts[turn.speaker] = turn_counts.get(turn.speaker, 0) + 1
+        duration = turn.end - turn.start if turn.start is not None and turn.end is not None else 0.0
+        talk_seconds[turn.speaker] = talk_seconds.get(turn.speaker, 0.0) + max(duration, 0.0)
+    return SpeakerIndex(
+        speakers=[
+            SpeakerStats(name=name, initials=speaker_initials(name), turns=count, talk_seconds=talk_seconds[name])
+            for name, count in turn_counts.items()
+        ]
+    )
+
+
+def speaker_initials(name: str) -> str:
+    return "".join(part[0] for part in re.findall(r"[^\W\d_]+", name)).upper()
+
+
+def _from_turns(turns: list[Turn]) -> LoadedTranscript:
+    text = "\n".join(f"{turn.speaker}: {turn.text}" if turn.speaker else turn.text for turn in turns)
+    return LoadedTranscript(text=text, speakers=build_speaker_index(turns))
 
 
 def _extract_docx(file_bytes: bytes) -> str:
@@ -29,9 +180,11 @@ def _extract_docx(file_bytes: bytes) -> str:
         return "\n".join(paragraphs)
 
 
-def _extract_vtt(file_bytes: bytes) -> str:
+def _vtt_turns(file_bytes: bytes) -> list[Turn]:
+    """One turn per cue line; <v Name> voice tags become the turn's speaker."""
     text = file_bytes.decode("utf-8", errors="ignore")
-    lines = []
+    turns = []
+    start = end = None
     for raw_line in text.splitlines():
         line = raw_line.strip()
         if not line:
@@ -39,8 +192,272 @@ def _extract_vtt(file_bytes: bytes) -> str:
         if line.startswith("WEBVTT"):
             continue
         if "-->" in line:
+            start, end = _cue_timing(line)
             continue
         if line.replace(".", "").isdigit():
             continue
-        lines.append(line)
-    return "\n".join(lines)
+        voice = _VOICE_TAG.search(line)
+        line = _MARKUP_TAG.sub("", line).strip()
+        if not line:
+            continue
+        if voice:
+            turns.append(Turn(voice.group(1).strip(), line, start, end))
+        else:
+            turns.append(_label_turn(line, start, end))
+    return turns
+
+
+def _srt_turns(file_bytes: bytes) -> list[Turn]:
+    """Keep only caption text from SubRip cues: drop cue numbers, timings and markup."""
+    text = file_bytes.decode("utf-8-sig", errors="ignore")
+    turns = []
+    start = end = None
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line or line.isdigit():
+            continue
+        if _SRT_TIMESTAMP.match(line):
+            start, end = _cue_timing(line)
+            continue
+        line = _MARKUP_TAG.sub("", line).strip()
+        if line:
+            turns.append(_label_turn(line, start, end))
+    return turns
+
+
+def _labelled_turns(lines: list[str]) -> list[Turn]:
+    """
+    Split plain text lines on "Name: text" labels.
+
+    Labels seen fewer than MIN_LABEL_TURNS times (or in NON_SPEAKER_LABELS) are
+    not treated as speakers and their lines are kept verbatim.
+    """
+    turns = [_label_turn(line) for line in lines]
+    counts: dict[str, int] = {}
+    for turn in turns:
+        if turn.speaker:
+            counts[turn.speaker] = counts.get(turn.speaker, 0) + 1
+    return [
+        turn if not turn.speaker or counts[turn.speaker] >= MIN_LABEL_TURNS else Turn("", line)
+        for turn, line in zip(turns, lines, strict=True)
+    ]
+
+
+def _label_speaker_index(text: str) -> SpeakerIndex:
+    """
+    SpeakerIndex for plain text, which is kept verbatim.
+
+    Same speakers as _labelled_turns, but only the label counts are kept: the
+    lines are scanned one at a time instead of materialising a Turn per line.
+    """
+    counts: dict[str, int] = {}
+    for match in _SPEAKER_LABEL_LINE.finditer(text):
+        name = match.group(1)
+        if name.lower() not in NON_SPEAKER_LABELS and not _ANONYMOUS_SPEAKER.match(name):
+            counts[name] = counts.get(name, 0) + 1
+    return SpeakerIndex(
+        speakers=[
+            SpeakerStats(name=name, initials=speaker_initials(name), turns=count)
+            for name, count in counts.items()
+            if count >= MIN_LABEL_TURNS
+        ]
+    )
+
+
+def _label_turn(line: str, start: float | None = None, end: float | None = None) -> Turn:
+    match = _SPEAKER_LABEL.match(line)
+    if match and match.group(1).lower() not in NON_SPEAKER_LABELS:
+        return Turn(match.group(1), match.group(2).strip(), start, end)
+    return Turn("", line, start, end)
+
+
+def _cue_timing(line: str) -> tuple[float | None, float | None]:
+    match = _CUE_TIMING.match(line)
+    if not match:
+        return None, None
+    return _parse_timestamp(match.group(1)), _parse_timestamp(match.group(2))
+
+
+def _parse_timestamp(value: str) -> float | None:
+    try:
+        seconds = 0.0
+        for part in value.replace(",", ".").split(":"):
+            seconds = seconds * 60 + float(part)
+        return seconds
+    except ValueError:
+        return None
+
+
+def _extract_json(file_bytes: bytes) -> LoadedTranscript:
+    """
+    Flatten a meeting-platform JSON transcript into "Speaker: text" lines.
+
+    Accepts a top-level list of segments, an object holding the segment list
+    under one of JSON_SEGMENT_KEYS, or an object whose "transcript" is plain text.
+    """
+    try:
+        data = json.loads(file_bytes)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid JSON transcript") from exc
+
+    segments = _json_segments(data)
+    if isinstance(segments, str):
+        return LoadedTranscript(text=segments)
+    if segments is None:
+        raise HTTPException(status_code=400, detail="Unrecognised JSON transcript layout")
+
+    turns = []
+    for segment in segments:
+        if isinstance(segment, str):
+            turn = Turn("", segment.strip())
+        elif isinstance(segment, dict):
+            turn = Turn(
+                _json_speaker(segment),
+                _json_text(segment).strip(),
+                _json_time(segment, JSON_START_KEYS),
+                _json_time(segment, JSON_END_KEYS),
+            )
+        else:
+            continue
+        if turn.text:
+            turns.append(turn)
+    return _from_turns(turns)
+
+
+def _json_time(segment: dict, keys: tuple[str, ...]) -> float | None:
+    for key in keys:
+        value = segment.get(key)
+        if isinstance(value, str):
+            return _parse_timestamp(value)
+        if isinstance(value, (int, float)):
+            return value / 1000 if key.endswith("_ms") else float(value)
+    return None
+
+
+def _json_segments(data: Any) -> list | str | None:
+    if isinstance(data, list):
+        return data
+    if not isinstance(data, dict):
+        return None
+    for key in JSON_SEGMENT_KEYS:
+        value = data.get(key)
+        if isinstance(value, list):
+            return value
+        if isinstance(value, str) and key == "transcript":
+            return value
+        if isinstance(value, dict):
+            nested = _json_segments(value)
+            if nested is not None:
+                return nested
+    return None
+
+
+def _json_text(segment: dict) -> str:
+    for key in JSON_TEXT_KEYS:
+        value = segment.get(key)
+        if isinstance(value, str):
+            return value
+        if isinstance(value, list):
+            # Word-level exports: [{"word"/"text": ...}, ...]; anything else in the list is skipped
+            words = [w.get("word") or w.get("text") if isinstance(w, dict) else w for w in value]
+            return " ".join(word for word in words if isinstance(word, str) and word)
+    return ""
+
+
+def _json_speaker(segment: dict) -> str:
+    for key in JSON_SPEAKER_KEYS:
+        value = segment.get(key)
+        if isinstance(value, dict):
+            value = value.get("name") or value.get("displayName") or value.get("username")
+        if isinstance(value, (str, int)) and str(value).strip():
+            label = str(value).strip()
+            # Deepgram numbers speakers and AssemblyAI letters them; "0: ..." reads as a list item
+            return f"Speaker {label}" if label.isdigit() or len(label) == 1 else label
+    users = segment.get("users")
+    if isinstance(users, list) and users and isinstance(users[0], dict):
+        return str(users[0].get("username") or users[0].get("name") or "").strip()
+    return ""
+
+
+def _decompress(file_bytes: bytes, filename: str, ext: str) -> tuple[bytes, str]:
+    """Return (content, inner filename) for a .gz or .zip upload."""
+    if ext == "gz":
+        return _gunzip(file_bytes), filename[: -len(".gz")]
+    return _unzip(file_bytes)
+
+
+def _gunzip(file_bytes: bytes) -> bytes:
+    """Inflate gzip data chunk by chunk, enforcing MAX_DECOMPRESSED_BYTES as it goes."""
+    out = bytearray()
+    data = memoryview(file_bytes)
+    try:
+        while len(data):
+            decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+            end = 0
+            while end < len(data) and not decompressor.eof:
+                pending = data[end : end + DECOMPRESS_CHUNK_BYTES]
+                end += len(pending)
+                while pending and not decompressor.eof:
+                    out += decompressor.decompress(pending, DECOMPRESS_CHUNK_BYTES)
+                    _check_decompressed_size(len(out))
+                    pending = decompressor.unconsumed_tail
+            if not decompressor.eof:
+                raise zlib.error("truncated gzip stream")
+            # Concatenated gzip members
+            data = memoryview(decompressor.unused_data + bytes(data[end:]))
+    except zlib.error as exc:
+        raise HTTPException(status_code=400, detail="Invalid gzip file") from exc
+    return bytes(out)
+
+
+def _unzip(file_bytes: bytes) -> tuple[bytes, str]:
+    """Read the first supported transcript in a .zip archive chunk by chunk."""
+    try:
+        with zipfile.ZipFile(io.BytesIO(file_bytes)) as archive:
+            info = _zip_transcript(archive)
+            if info is not None:
+                _check_decompressed_size(info.file_size)
+                out = bytearray()
+                with archive.open(info) as member:
+                    while chunk := member.read(DECOMPRESS_CHUNK_BYTES):
+                        out += chunk
+                        _check_decompressed_size(len(out))
+                return bytes(out), Path(info.filename).name
+    except zipfile.BadZipFile as exc:
+        raise HTTPException(status_code=400, detail="Invalid zip file") from exc
+    raise HTTPException(status_code=400, detail="Zip file contains no supported transcript")
+
+
+def _zip_transcript(archive: zipfile.ZipFile) -> zipfile.ZipInfo | None:
+    """The archive member _unzip reads: the first file with a supported extension."""
+    for info in archive.infolist():
+        name = Path(info.filename).name
+        if not info.is_dir() and not name.startswith(".") and _extension(name) in SUPPORTED_EXTENSIONS:
+            return info
+    return None
+
+
+def _extension(filename: str) -> str:
+    return filename.lower().rsplit(".", 1)[-1] if "." in filename else ""
+
+
+def _stream_size(stream: BinaryIO) -> int:
+    size = 0
+    while size <= MAX_DECOMPRESSED_BYTES and (chunk := stream.read(DECOMPRESS_CHUNK_BYTES)):
+        size += len(chunk)
+    return size
+
+
+def _docx_text_size(file: BinaryIO) -> int:
+    """Characters in the body's text runs, parsed incrementally."""
+    size = 0
+    with zipfile.ZipFile(file) as document, document.open(DOCX_BODY_PART) as body:
+        for _, element in etree.iterparse(body, events=("end",), tag=DOCX_TEXT_TAG):
+            size += len(element.text or "")
+            element.clear()
+    return size
+
+
+def _check_decompressed_size(size: int) -> None:
+    if size > MAX_DECOMPRESSED_BYTES:
+        raise HTTPException(status_code=413, detail="Decompressed transcript too large")
@@ -0,0 +1,407 @@
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Iterator
+
+from fastapi import HTTPException
+from pydantic import BaseModel, computed_field
+
+from config import settings
+from model_routing import CallOptions
+from tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+BUDGET_ACTIONS = ("reject", "downgrade")
+# Output assumed for a budget check when the call sets no max_output_tokens
+UNCAPPED_OUTPUT_TOKENS = 16000
+# A downgraded call must still be allowed at least this much output to be worth sending
+MIN_DOWNGRADE_OUTPUT_TOKENS = 1000
+# How often a shared ledger publishes its day total and reads the other processes' totals
+SHARED_SYNC_SECONDS = 5.0
+
+
+class BudgetExceeded(HTTPException):
+    """A call was refused before it was sent because it would exceed a token budget."""
+
+    def __init__(self, detail: str):
+        super().__init__(status_code=429, detail=detail)
+
+
+class CallUsage(BaseModel):
+    """Token usage reported by one Responses API call."""
+
+    model: str
+    kind: str = "extract"  # "extract", "repair" or "hedge"
+    input_tokens: int = 0
+    cached_input_tokens: int = 0
+    output_tokens: int = 0
+    reasoning_tokens: int = 0
+
+    @computed_field
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+
+class UsageReport(BaseModel):
+    """Every LLM call made for one request, with totals."""
+
+    calls: list[CallUsage] = []
+
+    @computed_field
+    @property
+    def input_tokens(self) -> int:
+        return sum(call.input_tokens for call in self.calls)
+
+    @computed_field
+    @property
+    def output_tokens(self) -> int:
+        return sum(call.output_tokens for call in self.calls)
+
+    @computed_field
+    @property
+    def reasoning_tokens(self) -> int:
+        return sum(call.reasoning_tokens for call in self.calls)
+
+    @computed_field
+    @property
+    def repair_tokens(self) -> int:
+        return sum(call.total_tokens for call in self.calls if call.kind == "repair")
+
+    @computed_field
+    @property
+    def total_tokens(self) -> int:
+        return sum(call.total_tokens for call in self.calls)
+
+
+class UsageTracker:
+    """
+    Collects the usage of one request.
+
+    Shared by every thread and task working on the request; reserved tokens
+    cover calls that have been checked against the budget but not answered yet.
+    """
+
+    def __init__(self, *, project: str | None = None, template_id: str | None = None):
+        self.project = project
+        self.template_id = template_id
+        self._calls: list[CallUsage] = []
+        self._reserved = 0
+        self._lock = threading.Lock()
+
+    def add(self, call: CallUsage) -> None:
+        with self._lock:
+            self._calls.append(call)
+
+    def reserve(self, tokens: int) -> None:
+        """Reserve (or, with a negative count, release) tokens for a call in flight."""
+        with self._lock:
+            self._reserved += tokens
+
+    def used_tokens(self) -> int:
+        with self._lock:
+            return self._reserved + sum(call.total_tokens for call in self._calls)
+
+    def report(self) -> UsageReport:
+        with self._lock:
+            return UsageReport(calls=list(self._calls))
+
+
+class SharedDayTotals:
+    """
+    Day token totals of every process, in a dict shared by all of them (a
+    modal.Dict on Modal), so token_budget_per_day caps the fleet.
+
+    Each process writes only its own "<day>/<process id>" entry, so there are
+    no write races, and entries outlive the process: a container that scales
+    down or restarts still counts towards the day. Entries of past UTC days
+    are removed at sync, so the dict only ever holds today's processes.
+    """
+
+    def __init__(self, store: Any, *, process_id: str | None = None):
+        self._store = store
+        self._id = process_id or uuid.uuid4().hex
+        self._others: tuple[str, int] = ("", 0)
+
+    def sync(self, day: str, own_tokens: int) -> None:
+        """Publish this process's day total and read the others' (blocking; see UsageLedger.share)."""
+        own_key = f"{day}/{self._id}"
+        self._store[own_key] = own_tokens
+        others = 0
+        for key, tokens in list(self._store.items()):
+            if key.split("/", 1)[0] < day:
+                self._forget(key)
+            elif key.startswith(f"{day}/") and key != own_key:
+                others += int(tokens)
+        self._others = (day, others)
+
+    def _forget(self, key: str) -> None:
+        # Past days no longer count; another process may have removed the entry first
+        try:
+            self._store.pop(key)
+        except KeyError:
+            pass
+
+    def others(self, day: str) -> int:
+        """The other processes' day total as of the last sync."""
+        synced_day, tokens = self._others
+        return tokens if synced_day == day else 0
+
+
+class UsageLedger:
+    """
+    Per-process usage totals by UTC day, project, template and deployment.
+
+    Containers each keep their own ledger; the per-call log records carry the
+    same keys for fleet-wide aggregation. With share(), day_tokens also counts
+    the other processes, so the day budget holds across containers.
+    """
+
+    def __init__(self) -> None:
+        self._totals: dict[tuple[str, str, str, str], dict[str, int]] = {}
+        self._reserved: dict[str, int] = {}
+        self._cancelled: dict[str, dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self._shared: SharedDayTotals | None = None
+
+    def record(self, call: CallUsage, *, project: str | None, template_id: str | None) -> None:
+        key = (_today(), project or "", template_id or "", call.model)
+        with self._lock:
+            totals = self._totals.setdefault(
+                key, {"calls": 0, "input_tokens": 0, "output_tokens": 0, "reasoning_tokens": 0, "total_tokens": 0}
+            )
+            totals["calls"] += 1
+            totals["input_tokens"] += call.input_tokens
+            totals["output_tokens"] += call.output_tokens
+            totals["reasoning_tokens"] += call.reasoning_tokens
+            totals["total_tokens"] += call.total_tokens
+
+    def day_tokens(self, day: str | None = None) -> int:
+        day = day or _today()
+        others = self._shared.others(day) if self._shared is not None else 0
+        return self._own_day_tokens(day) + others
+
+    def share(self, shared: SharedDayTotals, *, interval: float = SHARED_SYNC_SECONDS) -> None:
+        """
+        Count other processes in day_tokens. Totals are exchanged in a daemon
+        thread every interval seconds, off the LLM call path, so the fleet
+        may overshoot the day budget by what it spends in one interval.
+        """
+        self._shared = shared
+        self.sync_shared()
+        threading.Thread(target=self._sync_forever, args=(interval,), daemon=True, name="usage-sync").start()
+
+    def sync_shared(self) -> None:
+        if self._shared is None:
+            return
+        day = _today()
+        try:
+            self._shared.sync(day, self._own_day_tokens(day))
+        except Exception as exc:
+            # Keep budgeting on the last known totals rather than fail calls
+            logger.warning("Shared usage sync failed", extra={"error": str(exc)})
+
+    def _sync_forever(self, interval: float) -> None:
+        while True:
+            time.sleep(interval)
+            self.sync_shared()
+
+    def _own_day_tokens(self, day: str) -> int:
+        with self._lock:
+            used = sum(totals["total_tokens"] for key, totals in self._totals.items() if key[0] == day)
+            return used + self._reserved.get(day, 0)
+
+    def summary(self, day: str | None = None) -> list[dict[str, Any]]:
+        day = day or _today()
+        with self._lock:
+            return [
+                {"day": d, "project": project, "template_id": template_id, "model": model, **totals}
+                for (d, project, template_id, model), totals in sorted(self._totals.items())
+                if d == day
+            ]
+
+    def reserve(self, day: str, tokens: int) -> None:
+        """Reserve (or, with a negative count, release) tokens for a call in flight."""
+        with self._lock:
+            self._reserved[day] = self._reserved.get(day, 0) + tokens
+
+    def record_cancelled(self, output_tokens_avoided: int) -> None:
+        """Count a call aborted in flight and the output it was allowed (an upper bound on the saving)."""
+        with self._lock:
+            totals = self._cancelled.setdefault(_today(), {"calls": 0, "output_tokens_avoided": 0})
+            totals["calls"] += 1
+            totals["output_tokens_avoided"] += output_tokens_avoided
+
+    def cancellations(self, day: str | None = None) -> dict[str, int]:
+        day = day or _today()
+        with self._lock:
+            return dict(self._cancelled.get(day, {"calls": 0, "output_tokens_avoided": 0}))
+
+
+ledger = UsageLedger()
+_current: contextvars.ContextVar[UsageTracker | None] = contextvars.ContextVar("usage_tracker", default=None)
+# Held while a call is checked against the budgets and reserved, so concurrent calls cannot both fit
+_admission_lock = threading.Lock()
+
+
+@contextmanager
+def track_usage(*, project: str | None = None, template_id: str | None = None) -> Iterator[UsageTracker]:
+    """Collect the usage of every LLM call made inside the block (including worker threads that copy the context)."""
+    tracker = UsageTracker(project=project, template_id=template_id)
+    token = _current.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _current.reset(token)
+        report = tracker.report()
+        logger.info(
+            "Request token usage",
+            extra={
+                "project": project,
+                "template_id": template_id,
+                "calls": len(report.calls),
+                "input_tokens": report.input_tokens,
+                "output_tokens": report.output_tokens,
+                "reasoning_tokens": report.reasoning_tokens,
+                "repair_tokens": report.repair_tokens,
+                "total_tokens": report.total_tokens,
+            },
+        )
+
+
+class BudgetedCall:
+    """Handle for one call admitted by budgeted_call: the options to send and where to record usage."""
+
+    def __init__(self, options: CallOptions, kind: str, tracker: UsageTracker | None):
+        self.options = options
+        self.kind = kind
+        self.tracker = tracker
+
+    def record(self, response: Any) -> CallUsage:
+        call = usage_from_response(response, model=self.options.model, kind=self.kind)
+        project = self.tracker.project if self.tracker else None
+        template_id = self.tracker.template_id if self.tracker else None
+        if self.tracker is not None:
+            self.tracker.add(call)
+        ledger.record(call, project=project, template_id=template_id)
+        logger.info(
+            "LLM call usage",
+            extra={"project": project, "template_id": template_id, **call.model_dump()},
+        )
+        return call
+
+
+@contextmanager
+def budgeted_call(prompt: str, options: CallOptions, *, kind: str = "extract") -> Iterator[BudgetedCall]:
+    """
+    Admit one call against the per-request and per-day budgets before it is sent.
+
+    The call's worst case (prompt estimate + output cap) is checked and
+    reserved in one step, and stays reserved while the call is in flight. If
+    it does not fit, it is rejected with a 429, or with
+    TOKEN_BUDGET_ACTION=downgrade sent to the fast deployment (at low effort,
+    if it had an effort) with its output cap cut to what is left.
+    """
+    tracker = _current.get()
+    prompt_tokens = estimate_tokens(prompt)
+    estimate = prompt_tokens + (options.max_output_tokens or UNCAPPED_OUTPUT_TOKENS)
+    day = _today()
+    with _admission_lock:
+        remaining = _remaining_budget(tracker)
+        if remaining is not None and estimate > remaining:
+            options = _downgrade(options, remaining - prompt_tokens, tracker)
+            estimate = prompt_tokens + options.max_output_tokens
+        _reserve(tracker, day, estimate)
+    try:
+        yield BudgetedCall(options, kind, tracker)
+    except asyncio.CancelledError:
+        # The caller went away: the HTTP request was aborted before the output was generated
+        avoided = options.max_output_tokens or UNCAPPED_OUTPUT_TOKENS
+        ledger.record_cancelled(avoided)
+        logger.info(
+            "LLM call cancelled",
+            extra={
+                "project": tracker.project if tracker else None,
+                "template_id": tracker.template_id if tracker else None,
+                "model": options.model,
+                "kind": kind,
+                "output_tokens_avoided": avoided,
+            },
+        )
+        raise
+    finally:
+        _reserve(tracker, day, -estimate)
+
+
+def usage_from_response(response: Any, *, model: str, kind: str = "extract") -> CallUsage:
+    """Read response.usage; missing or non-numeric fields count as 0."""
+    usage = getattr(response, "usage", None)
+    input_details = getattr(usage, "input_tokens_details", None)
+    output_details = getattr(usage, "output_tokens_details", None)
+    return CallUsage(
+        model=model,
+        kind=kind,
+        input_tokens=_count(getattr(usage, "input_tokens", 0)),
+        cached_input_tokens=_count(getattr(input_details, "cached_tokens", 0)),
+        output_tokens=_count(getattr(usage, "output_tokens", 0)),
+        reasoning_tokens=_count(getattr(output_details, "reasoning_tokens", 0)),
+    )
+
+
+def _remaining_budget(tracker: UsageTracker | None) -> int | None:
+    remaining = []
+    if settings.token_budget_per_request > 0 and tracker is not None:
+        remaining.append(settings.token_budget_per_request - tracker.used_tokens())
+    if settings.token_budget_per_day > 0:
+        remaining.append(settings.token_budget_per_day - ledger.day_tokens())
+    return min(remaining) if remaining else None
+
+
+def _downgrade(options: CallOptions, output_room: int, tracker: UsageTracker | None) -> CallOptions:
+    action = settings.token_budget_action.lower()
+    if action not in BUDGET_ACTIONS:
+        raise ValueError(f"Unknown token budget action: {action}")
+    if action == "reject" or output_room < MIN_DOWNGRADE_OUTPUT_TOKENS:
+        logger.warning(
+            "Token budget exceeded; rejecting call",
+            extra={
+                "project": tracker.project if tracker else None,
+                "template_id": tracker.template_id if tracker else None,
+                "model": options.model,
+            },
+        )
+        raise BudgetExceeded("Token budget exceeded")
+
+    update: dict[str, Any] = {
+        "model": settings.openai_fast_model or options.model,
+        "max_output_tokens": min(output_room, options.max_output_tokens or output_room),
+    }
+    if options.reasoning_effort is not None:
+        # Only lower an effort the template asked for: non-reasoning deployments reject the parameter
+        update["reasoning_effort"] = "low"
+    downgraded = options.model_copy(update=update)
+    logger.warning(
+        "Token budget tight; downgrading call",
+        extra={"from_model": options.model, "to_model": downgraded.model, "max_output_tokens": output_room},
+    )
+    return downgraded
+
+
+def _reserve(tracker: UsageTracker | None, day: str, tokens: int) -> None:
+    if tracker is not None:
+        tracker.reserve(tokens)
+    ledger.reserve(day, tokens)
+
+
+def _count(value: Any) -> int:
+    return value if isinstance(value, int) else 0
+
+
+def _today() -> str:
+    return datetime.now(timezone.utc).date().isoformat()
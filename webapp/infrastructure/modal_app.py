@@ -1,17 +1,43 @@
+import asyncio
 import base64
 import io
 import logging
 import os
+import sqlite3
+import threading
+import time
 import uuid
+from datetime import date
 from pathlib import Path
 from typing import Dict, Any
 
 import modal
-from fastapi import FastAPI, File, Form, UploadFile
+from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from dotenv import load_dotenv
 
+# Process-wide setup, done once per container rather than once per input
+load_dotenv()
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+# Concurrency and autoscaling knobs, read when the app is deployed.
+# process_transcript mostly waits on the LLM, so one container serves many inputs:
+# Modal routes up to PROCESS_TARGET_INPUTS to a container before scaling out, and
+# never more than PROCESS_MAX_INPUTS.
+PROCESS_MAX_INPUTS = int(os.environ.get("PROCESS_MAX_INPUTS", "16"))
+PROCESS_TARGET_INPUTS = int(os.environ.get("PROCESS_TARGET_INPUTS", "12"))
+PROCESS_MIN_CONTAINERS = int(os.environ.get("PROCESS_MIN_CONTAINERS", "0"))
+PROCESS_MAX_CONTAINERS = int(os.environ.get("PROCESS_MAX_CONTAINERS", "20"))
+PROCESS_BUFFER_CONTAINERS = int(os.environ.get("PROCESS_BUFFER_CONTAINERS", "0"))
+PROCESS_SCALEDOWN_WINDOW = int(os.environ.get("PROCESS_SCALEDOWN_WINDOW", "300"))
+PROCESS_TIMEOUT = int(os.environ.get("PROCESS_TIMEOUT", "900"))
+# Retries after a failure or timeout resume from the job's checkpoints (see checkpoints.py)
+PROCESS_RETRIES = int(os.environ.get("PROCESS_RETRIES", "0"))
+# The web endpoint is async and only awaits uploads and process_transcript calls
+WEB_MAX_INPUTS = int(os.environ.get("WEB_MAX_INPUTS", "100"))
+
 # Modal app definition
 app = modal.App("companyheadeddocs")
 
@@ -38,6 +64,7 @@ image = (
         "openai>=1.30.0",
         "python-multipart",
         "python-dotenv",
+        "orjson",
     ])
     .env({
         k: v for k, v in {
@@ -49,6 +76,22 @@ image = (
             "AZURE_OPENAI_BASE_URL": os.environ.get("AZURE_OPENAI_BASE_URL"),
             "OPENAI_BASE_URL": os.environ.get("OPENAI_BASE_URL"),
             "OPENAI_TEMPERATURE": os.environ.get("OPENAI_TEMPERATURE"),
+            "RENDER_WORKERS": os.environ.get("RENDER_WORKERS"),
+            "RENDER_CACHE_DIR": os.environ.get("RENDER_CACHE_DIR"),
+            "TOKEN_BUDGET_PER_REQUEST": os.environ.get("TOKEN_BUDGET_PER_REQUEST"),
+            "TOKEN_BUDGET_PER_DAY": os.environ.get("TOKEN_BUDGET_PER_DAY"),
+            "TOKEN_BUDGET_ACTION": os.environ.get("TOKEN_BUDGET_ACTION"),
+            "SCHEDULER_TENANT_WEIGHTS": os.environ.get("SCHEDULER_TENANT_WEIGHTS"),
+            "OPENAI_HEDGE_MODEL": os.environ.get("OPENAI_HEDGE_MODEL"),
+            "HEDGE_PERCENTILE": os.environ.get("HEDGE_PERCENTILE"),
+            "HEDGE_MAX_RATE": os.environ.get("HEDGE_MAX_RATE"),
+            "MODEL_PRICES": os.environ.get("MODEL_PRICES"),
+            # Nothing outlives a job on the volume unless these are set (e.g. /data/results,
+            # /data/search/minutes.db, /data/checkpoints)
+            "RESULTS_DIR": os.environ.get("RESULTS_DIR"),
+            "SEARCH_INDEX_PATH": os.environ.get("SEARCH_INDEX_PATH"),
+            "CHECKPOINT_DIR": os.environ.get("CHECKPOINT_DIR"),
+            "CHECKPOINT_TTL_SECONDS": os.environ.get("CHECKPOINT_TTL_SECONDS"),
         }.items() if v is not None and v != ""
     })
     .add_local_dir(".", "/root", ignore=["__pycache__", "*.pyc", ".git", "webapp", "out"])
@@ -57,21 +100,152 @@ image = (
 # Volume for persistent storage if needed
 volume = modal.Volume.from_name("companyheadeddocs-data", create_if_missing=True)
 
+# Shared map of in-flight request keys -> process_transcript call ids
+inflight = modal.Dict.from_name("companyheadeddocs-inflight", create_if_missing=True)
+# Per-container day token totals, so TOKEN_BUDGET_PER_DAY caps the whole app (see usage.SharedDayTotals)
+usage_totals = modal.Dict.from_name("companyheadeddocs-usage", create_if_missing=True)
+
+# Per-container coalescers, created lazily inside the container
+_coalescers: Dict[str, Any] = {}
+
+# Volume.reload() must not run concurrently with itself in one container
+_volume_reload_lock = asyncio.Lock()
+
+
+async def _stage_upload(file: UploadFile) -> Dict[str, Any]:
+    """
+    Copy the spooled multipart upload onto the shared volume and return its reference.
+
+    Bodies over MAX_UPLOAD_BYTES were already refused by UploadLimitMiddleware;
+    the copy holds one chunk in memory at a time and the worker receives only
+    the key, not the bytes.
+    """
+    from blob_store import LocalBlobStore, save_upload
+    from config import settings
+    from transcript_loader import transcript_size
+
+    store = LocalBlobStore(settings.upload_dir)
+    ref = await save_upload(file, store)
+
+    def text_size() -> int:
+        with store.open_reader(ref.key) as reader:
+            return transcript_size(reader, ref.filename)
+
+    # The scheduler costs jobs by their text: .gz, .zip and .docx uploads are far smaller
+    staged = {**ref.model_dump(), "text_size": await asyncio.to_thread(text_size)}
+    # Make the new file visible to the worker container
+    await volume.commit.aio()
+    return staged
+
+
+def _share_usage_ledger() -> None:
+    """Once per container: count every container's tokens against the day budget."""
+    from config import settings
+    from usage import SharedDayTotals, ledger
+
+    with _usage_shared_lock:
+        if settings.token_budget_per_day > 0 and not _usage_shared:
+            _usage_shared.append(True)
+            ledger.share(SharedDayTotals(usage_totals))
+
+
+_usage_shared: list[bool] = []
+_usage_shared_lock = threading.Lock()
+
+
+def _get_coalescers():
+    if not _coalescers:
+        from coalescing import DistributedSingleFlight, ModalDictInflightStore, SingleFlight
 
-class TransformResponse(JSONResponse):
+        _coalescers["local"] = SingleFlight()
+        _coalescers["distributed"] = DistributedSingleFlight(ModalDictInflightStore(inflight))
+    return _coalescers["local"], _coalescers["distributed"]
+
+
+async def _process_coalesced(upload: Dict[str, Any], **params: str) -> Dict[str, Any]:
+    """
+    Run process_transcript for a staged upload, coalescing identical requests.
+
+    Requests with the same transcript bytes, filename, template and metadata
+    share one call: duplicates in this container await the same task, and
+    duplicates in other containers attach to the same Modal function call.
+    A duplicate's own staged upload is deleted unused. The leader waits for a
+    slot from the size-aware scheduler before spawning (see scheduler.py).
+
+    When every request waiting on the call has been cancelled (the clients
+    disconnected), the spawned call is cancelled too and its upload deleted.
+    """
+    from blob_store import LocalBlobStore
+    from coalescing import request_key
+    from config import settings
+    from estimate import job_timings
+    from scheduler import get_scheduler
+    from tokens import estimate_tokens
+
+    key = request_key(
+        content_sha256=upload["sha256"],
+        filename=upload["filename"],
+        template_id=params["template_id"],
+        meta={name: value for name, value in params.items() if name != "template_id"},
+    )
+    local, distributed = _get_coalescers()
+    spawned = False
+
+    async def spawn() -> str:
+        nonlocal spawned
+        call = await process_transcript.spawn.aio(
+            **params, filename=upload["filename"], upload_key=upload["key"], job_key=key
+        )
+        spawned = True
+        return call.object_id
+
+    async def wait(call_id: str) -> Dict[str, Any]:
+        return await modal.FunctionCall.from_id(call_id).get.aio()
+
+    async def cancel(call_id: str) -> None:
+        nonlocal spawned
+        await modal.FunctionCall.from_id(call_id).cancel.aio()
+        spawned = False  # the worker will not get to delete the upload
+
+    async def run() -> Dict[str, Any]:
+        started = time.monotonic()
+        result, coalesced = await distributed.run(key, spawn, wait, cancel)
+        if not coalesced and "transcript_chars" in result:
+            # Only the leader saw the whole job; /estimate predicts from these timings
+            job_timings.record(estimate_tokens(result["transcript_chars"]), time.monotonic() - started)
+        return result
+
+    async def scheduled() -> Dict[str, Any]:
+        # Small meetings take the interactive lane and are not queued behind large batches
+        return await get_scheduler().run(
+            tenant=params["project"], cost_tokens=estimate_tokens(upload["text_size"]), factory=run
+        )
+
+    try:
+        return await local.run(key, scheduled)
+    finally:
+        if not spawned:
+            LocalBlobStore(settings.upload_dir).delete(upload["key"])
+
+
+class TransformResponse(Response):
     media_type = "application/json"
 
-    def __init__(self, *, request_id: str, minutes: Dict[str, Any], docx_base64: str):
-        content = {
-            "request_id": request_id,
-            "minutes": minutes,
-            "docx_base64": docx_base64,
-        }
+    def __init__(self, *, request_id: str, minutes_json: str, docx_base64: str, usage_json: str | None = None):
+        from json_codec import transform_response_body
+
+        content = transform_response_body(
+            request_id=request_id,
+            minutes_json=minutes_json,
+            docx_base64=docx_base64,
+            usage_json=usage_json,
+        )
         super().__init__(content=content)
 
 
 @web_app.post("/transform")
 async def transform_web(
+    request: Request,
     template_id: str = Form(...),
     project: str = Form(...),
     job_min_no: str = Form(...),
@@ -85,25 +259,26 @@ async def transform_web(
     Transform a transcript file + meeting metadata into structured minutes
     and a company-headed DOCX, returned as base64 in JSON.
     """
-    import logging
-    logging.basicConfig(level=logging.INFO)
-    logger = logging.getLogger(__name__)
+    from cancellation import CLIENT_CLOSED_REQUEST, ClientDisconnected, cancel_on_disconnect
 
     logger.info(f"Starting transform request for project: {project}")
 
     try:
         # Call the processing function
         logger.info("Calling process_transcript function")
-        result = process_transcript.remote(
-            template_id=template_id,
-            project=project,
-            job_min_no=job_min_no,
-            description=description,
-            date=date,
-            time=time,
-            location=location,
-            file_content=file.file.read(),
-            filename=file.filename,
+        upload = await _stage_upload(file)
+        result = await cancel_on_disconnect(
+            request,
+            _process_coalesced(
+                upload,
+                template_id=template_id,
+                project=project,
+                job_min_no=job_min_no,
+                description=description,
+                date=date,
+                time=time,
+                location=location,
+            ),
         )
 
         logger.info(f"Process completed, result keys: {list(result.keys()) if result else 'None'}")
@@ -113,15 +288,16 @@ async def transform_web(
             return {"error": "Processing failed - no result returned"}
 
         request_id = str(uuid.uuid4())
-        response_data = {
-            "request_id": request_id,
-            "minutes": result["minutes"],
-            "docx_base64": result["docx_base64"]
-        }
-
         logger.info(f"Returning successful response with request_id: {request_id}")
-        return response_data
+        return TransformResponse(
+            request_id=request_id,
+            minutes_json=result["minutes_json"],
+            docx_base64=result["docx_base64"],
+            usage_json=result.get("usage_json"),
+        )
 
+    except ClientDisconnected:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
     except Exception as e:
         logger.error(f"Transform request failed: {str(e)}", exc_info=True)
         return {"error": f"Processing failed: {str(e)}"}
@@ -129,6 +305,7 @@ async def transform_web(
 
 @web_app.post("/transform/download")
 async def transform_download_web(
+    request: Request,
     template_id: str = Form(...),
     project: str = Form(...),
     job_min_no: str = Form(...),
@@ -142,25 +319,32 @@ async def transform_download_web(
     Transform a transcript file + meeting metadata into structured minutes
     and a company-headed DOCX, returned as a file download.
     """
+    from cancellation import CLIENT_CLOSED_REQUEST, ClientDisconnected, cancel_on_disconnect
+
     # Call the processing function
-    result = process_transcript.remote(
-        template_id=template_id,
-        project=project,
-        job_min_no=job_min_no,
-        description=description,
-        date=date,
-        time=time,
-        location=location,
-        file_content=file.file.read(),
-        filename=file.filename,
-    )
+    upload = await _stage_upload(file)
+    try:
+        result = await cancel_on_disconnect(
+            request,
+            _process_coalesced(
+                upload,
+                template_id=template_id,
+                project=project,
+                job_min_no=job_min_no,
+                description=description,
+                date=date,
+                time=time,
+                location=location,
+            ),
+        )
+    except ClientDisconnected:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
 
     # Convert base64 back to bytes
     docx_bytes = base64.b64decode(result["docx_base64"])
 
     # Create filename
-    meeting_data = result["minutes"]
-    meeting_date = meeting_data.get("meta", {}).get("date", "unknown").replace("/", "-")
+    meeting_date = (result.get("meeting_date") or "unknown").replace("/", "-")
     filename = f"meeting_minutes_{meeting_date}.docx"
 
     return StreamingResponse(
@@ -170,6 +354,177 @@ async def transform_download_web(
     )
 
 
+@web_app.post("/transform/multi")
+async def transform_multi_web(
+    request: Request,
+    template_ids: list[str] = Form(...),
+    project: str = Form(...),
+    job_min_no: str = Form(...),
+    description: str = Form("Progress Meeting"),
+    date: str = Form(...),
+    time: str = Form(...),
+    location: str = Form(...),
+    file: UploadFile = File(...),
+):
+    """
+    /transform for several templates (template_ids repeated): one LLM
+    extraction over the union of their sections, then one DOCX per template.
+    """
+    from cancellation import CLIENT_CLOSED_REQUEST, ClientDisconnected, cancel_on_disconnect
+    from json_codec import multi_transform_response_body
+    from multi_template import combine_templates
+    from template_registry import get_template
+
+    template_ids = list(dict.fromkeys(template_ids))
+    # process_transcript takes the ids comma-joined
+    if any("," in template_id for template_id in template_ids):
+        raise HTTPException(status_code=400, detail="Unknown template_id")
+    # Unknown or incompatible templates fail here, before the upload is staged
+    combine_templates([get_template(template_id) for template_id in template_ids])
+
+    upload = await _stage_upload(file)
+    try:
+        result = await cancel_on_disconnect(
+            request,
+            _process_coalesced(
+                upload,
+                template_id=",".join(template_ids),
+                project=project,
+                job_min_no=job_min_no,
+                description=description,
+                date=date,
+                time=time,
+                location=location,
+            ),
+        )
+    except ClientDisconnected:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
+
+    if "documents" not in result:
+        # A single distinct template runs the plain pipeline
+        result["documents"] = [
+            {"template_id": template_ids[0], "minutes_json": result["minutes_json"], "docx_base64": result["docx_base64"]}
+        ]
+    content = multi_transform_response_body(
+        request_id=str(uuid.uuid4()),
+        minutes_json=result["minutes_json"],
+        usage_json=result["usage_json"],
+        documents=[
+            (document["template_id"], document["minutes_json"], document["docx_base64"])
+            for document in result["documents"]
+        ],
+    )
+    return Response(content=content, media_type="application/json")
+
+
+@web_app.post("/estimate")
+async def estimate_web(
+    template_id: str = Form(...),
+    project: str = Form(""),
+    job_min_no: str = Form(""),
+    description: str = Form("Progress Meeting"),
+    date: str = Form(""),
+    time: str = Form(""),
+    location: str = Form(""),
+    file: UploadFile = File(...),
+):
+    """
+    Preflight for /transform with the same form: transcript size, whether it
+    would be truncated, the LLM calls it would make, their cost and the
+    expected duration. Runs in the web container; the LLM is not called.
+
+    Latency is predicted from the jobs this container has forwarded, so a
+    fresh container answers without one until it has seen a few.
+    """
+    from config import settings
+    from estimate import estimate_transcript
+    from models import MeetingMeta
+    from template_registry import get_template
+
+    if file.size is not None and file.size > settings.max_upload_bytes:
+        raise HTTPException(status_code=413, detail="Uploaded file too large")
+    template = get_template(template_id)
+    meta = MeetingMeta(
+        project=project,
+        job_min_no=job_min_no,
+        description=description,
+        date=date,
+        time=time,
+        location=location,
+    )
+    file_bytes = await file.read()
+    return await asyncio.to_thread(estimate_transcript, file_bytes, file.filename, meta, template)
+
+
+@web_app.get("/export")
+async def export_project_web(project: str, since: date | None = None, until: date | None = None):
+    """
+    Every stored result of a project (minutes JSON and DOCX), optionally
+    limited to those created between since and until, as one streamed ZIP.
+    """
+    from results_store import export_zip, get_result_store, project_dir_name
+
+    store = get_result_store()
+    if store is None:
+        raise HTTPException(status_code=404, detail="Result storage is not enabled")
+    # Results are written by process_transcript containers
+    async with _volume_reload_lock:
+        await volume.reload.aio()
+    records = await asyncio.to_thread(store.list, project, since=since, until=until)
+    if not records:
+        raise HTTPException(status_code=404, detail="No stored results for project")
+
+    return StreamingResponse(
+        content=export_zip(store, records),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename={project_dir_name(project)}.zip"},
+    )
+
+
+async def _query_search_index(method: str, *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a SearchIndex query against a fresh read-only view of the index.
+
+    index_project is the only writer; web containers reload the volume to see
+    its latest commit. The connection is closed before the next reload.
+    """
+    from config import settings
+    from search_index import SearchIndex
+
+    if not settings.search_index_path:
+        raise HTTPException(status_code=404, detail="Search is not enabled")
+    async with _volume_reload_lock:
+        try:
+            await volume.reload.aio()
+        except Exception as exc:
+            # e.g. files still open from a staged upload: answer from the current view
+            logger.warning("Volume reload failed; searching the current view", exc_info=exc)
+
+    def query() -> Any:
+        try:
+            index = SearchIndex(settings.search_index_path, readonly=True)
+        except sqlite3.OperationalError:
+            return None  # nothing indexed yet
+        try:
+            return getattr(index, method)(*args, **kwargs)
+        finally:
+            index.close()
+
+    return await asyncio.to_thread(query)
+
+
+@web_app.get("/search")
+async def search_minutes_web(q: str, project: str | None = None, limit: int = 20):
+    """Full-text search over stored minutes: section notes, actions, owners and attendees."""
+    return await _query_search_index("search", q, project=project, limit=min(max(limit, 1), 100)) or []
+
+
+@web_app.get("/actions/open")
+async def open_actions_web(owner: str | None = None, project: str | None = None):
+    """Open actions (those in each project's latest minutes) grouped by owner."""
+    return await _query_search_index("open_actions", owner=owner, project=project) or {}
+
+
 @web_app.get("/health")
 async def health_web():
     """
@@ -189,8 +544,18 @@ async def health_web():
         return {"status": "error", "message": str(e)}
 
 
-@app.function(image=image, volumes={"/data": volume})
-def process_transcript(
+@app.function(
+    image=image,
+    volumes={"/data": volume},
+    min_containers=PROCESS_MIN_CONTAINERS,
+    max_containers=PROCESS_MAX_CONTAINERS,
+    buffer_containers=PROCESS_BUFFER_CONTAINERS,
+    scaledown_window=PROCESS_SCALEDOWN_WINDOW,
+    timeout=PROCESS_TIMEOUT,
+    retries=PROCESS_RETRIES,
+)
+@modal.concurrent(max_inputs=PROCESS_MAX_INPUTS, target_inputs=PROCESS_TARGET_INPUTS)
+async def process_transcript(
     template_id: str,
     project: str,
     job_min_no: str,
@@ -198,44 +563,46 @@ def process_transcript(
     date: str,
     time: str,
     location: str,
-    file_content: bytes,
     filename: str,
+    file_content: bytes | None = None,
+    upload_key: str | None = None,
+    job_key: str | None = None,
 ) -> Dict[str, Any]:
     """
     Core processing function that handles the transcript transformation.
     This runs in Modal's serverless environment.
-    """
-    import logging
-    logging.basicConfig(level=logging.INFO)
-    logger = logging.getLogger(__name__)
 
-    try:
-        logger.info(f"Starting transcript processing for project: {project}, file: {filename}")
+    The transcript arrives either inline as file_content or, for staged
+    uploads, as upload_key pointing at a blob on the shared volume.
 
-        # Load environment variables from .env file
-        load_dotenv()
-        logger.info("Environment variables loaded")
+    Inputs run concurrently as tasks on one event loop: everything reached
+    from here shares the module-level LLM clients, template registry and
+    render cache. Parsing and rendering run on worker threads. When the call
+    is cancelled (see _process_coalesced) the task is cancelled, which aborts
+    the in-flight LLM request.
 
-        # Import our modules
-        from llm_extractor import extract_meeting_model
-        from models import MeetingMeta, MeetingModel
-        from renderer import render_docx
-        from template_registry import get_template
-        from transcript_loader import load_transcript
+    With a job_key (and settings.checkpoint_dir set), each stage is
+    checkpointed on the volume, so a retry of the same input skips the stages
+    an earlier attempt finished. The staged upload is then kept after a
+    failure for the retry to read.
 
-        logger.info("Modules imported successfully")
+    template_id may list several comma-separated templates (/transform/multi):
+    one extraction serves them all and the result has one document each.
+    """
+    try:
+        logger.info(f"Starting transcript processing for project: {project}, file: {filename}")
 
-        # Get template
-        logger.info(f"Getting template: {template_id}")
-        template = get_template(template_id)
-        logger.info(f"Template loaded: {template.id}")
+        from config import settings
+        from models import MeetingMeta
+        from pipeline import run_pipeline_async, run_pipeline_multi_async
+        from template_registry import get_template, start_hot_reload
 
-        # Load transcript
-        logger.info(f"Loading transcript from {filename} ({len(file_content)} bytes)")
-        text = load_transcript(file_content, filename)
-        logger.info(f"Transcript loaded: {len(text)} characters")
+        # No-ops once running in this container
+        start_hot_reload()
+        # Blocking first sync: run it off the event loop
+        await asyncio.to_thread(_share_usage_ledger)
 
-        # Create metadata
+        templates = [get_template(name) for name in template_id.split(",")]
         meta = MeetingMeta(
             project=project,
             job_min_no=job_min_no,
@@ -244,36 +611,101 @@ def process_transcript(
             time=time,
             location=location,
         )
-        logger.info(f"Metadata created: {meta.project}")
-
-        # Extract meeting model using LLM
-        logger.info("Starting LLM extraction...")
-        meeting = extract_meeting_model(text, meta, template)
-        logger.info(f"LLM extraction completed. Attendees: {len(meeting.attendees)}, Sections: {len(meeting.sections)}")
-
-        # Render DOCX
-        logger.info("Rendering DOCX...")
-        docx_bytes = render_docx(template, meeting)
-        logger.info(f"DOCX rendered: {len(docx_bytes)} bytes")
-
-        # Convert to base64
-        docx_base64 = base64.b64encode(docx_bytes).decode("ascii")
-        logger.info(f"Base64 conversion completed: {len(docx_base64)} characters")
-
-        result = {
-            "minutes": meeting.model_dump(),
-            "docx_base64": docx_base64,
-            "status": "success"
-        }
 
+        checkpoints = None
+        if job_key is not None and settings.checkpoint_dir:
+            from checkpoints import JobCheckpoints
+
+            checkpoints = JobCheckpoints(settings.checkpoint_dir, job_key, commit=volume.commit)
+
+        def run(content: Any) -> Any:
+            if len(templates) > 1:
+                return run_pipeline_multi_async(content, filename, meta, templates, checkpoints=checkpoints)
+            return run_pipeline_async(content, filename, meta, templates[0], checkpoints=checkpoints)
+
+        if upload_key is not None:
+            # Fetch the staged upload from the volume. It is passed inline so
+            # the pipeline holds the only reference and can free it after decoding.
+            from blob_store import LocalBlobStore
+
+            store = LocalBlobStore(settings.upload_dir)
+            try:
+                result = await run(lambda: _read_upload(store, upload_key))
+            except Exception:
+                if checkpoints is None:
+                    store.delete(upload_key)
+                raise
+            except BaseException:
+                store.delete(upload_key)  # cancelled: there will be no retry
+                raise
+            store.delete(upload_key)
+        elif file_content is not None:
+            result = await run(file_content)
+        else:
+            raise ValueError("process_transcript needs file_content or upload_key")
+
+        if checkpoints is not None:
+            await asyncio.to_thread(checkpoints.clear)
+        if settings.results_dir:
+            await volume.commit.aio()  # make the stored result visible to /export
+            if settings.search_index_path:
+                await index_project.spawn.aio(project)
         logger.info("Process completed successfully")
         return result
 
     except Exception as e:
-        logging.error(f"Processing failed: {e}", exc_info=True)
+        logger.error(f"Processing failed: {e}", exc_info=True)
         raise
 
 
+@app.function(image=image, volumes={"/data": volume}, max_containers=1)
+def index_project(project: str) -> int:
+    """
+    Index the project's stored results that the search index does not have yet.
+
+    The index is one SQLite file on the volume, and volume commits are last
+    writer wins, so this single-container, one-input-at-a-time function is its
+    only writer. Catching up per project (rather than indexing one result)
+    also picks up results whose indexing call was lost.
+    """
+    from config import settings
+    from results_store import get_result_store
+    from search_index import SearchIndex
+
+    volume.reload()
+    index = SearchIndex(settings.search_index_path)
+    try:
+        added = index.sync_project(get_result_store(), project)
+    finally:
+        index.close()
+    volume.commit()
+    logger.info("Search index updated", extra={"project": project, "added": added})
+    return added
+
+
+@app.function(image=image, volumes={"/data": volume}, schedule=modal.Period(hours=1))
+def sweep_checkpoints() -> None:
+    """Remove checkpoints of jobs that never finished, and the uploads they kept, after their TTL."""
+    from checkpoints import sweep_expired
+    from config import settings
+
+    removed = {"uploads": sweep_expired(settings.upload_dir, settings.checkpoint_ttl_seconds)}
+    if settings.checkpoint_dir:
+        removed["checkpoints"] = sweep_expired(settings.checkpoint_dir, settings.checkpoint_ttl_seconds)
+    volume.commit()
+    logger.info("Swept expired checkpoints", extra=removed)
+
+
+async def _read_upload(store: Any, key: str) -> bytes:
+    """Read a staged upload, reloading the volume only when this container cannot see it yet."""
+    try:
+        return await asyncio.to_thread(store.read, key)
+    except FileNotFoundError:
+        async with _volume_reload_lock:
+            await volume.reload.aio()
+        return await asyncio.to_thread(store.read, key)
+
+
 # For local development/testing
 if __name__ == "__main__":
     # Run locally for testing
@@ -308,7 +740,7 @@ if __name__ == "__main__":
         request_id = str(uuid.uuid4())
         return TransformResponse(
             request_id=request_id,
-            minutes=result["minutes"],
+            minutes_json=result["minutes_json"],
             docx_base64=result["docx_base64"]
         )
 
@@ -321,9 +753,18 @@ if __name__ == "__main__":
 
 
 # Serve the FastAPI app with Modal
-@app.function(image=image)
+@app.function(image=image, volumes={"/data": volume})
+@modal.concurrent(max_inputs=WEB_MAX_INPUTS)
 @modal.asgi_app()
 def serve():
+    from blob_store import UploadLimitMiddleware
+    from template_registry import start_hot_reload
+
+    start_hot_reload()
+
+    # Oversized uploads get their 413 before the multipart body is spooled
+    web_app.add_middleware(UploadLimitMiddleware)
+
     # Add CORS middleware to handle preflight requests
     from starlette.middleware.cors import CORSMiddleware
 